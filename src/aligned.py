@@ -0,0 +1,136 @@
+"""
+Wspólny kalendarz i wspólne uniwersum aktywów dla kilku ramek jednej
+klasy aktywów: stóp zwrotu, sygnału, wag, benchmarków.
+
+Zamiast powtarzać w każdym `load_data`
+
+    common_cols = sorted(set(rets.columns) & set(skew.columns))
+    common_idx = rets.index.intersection(skew.index)
+    rets = rets.loc[common_idx] ...
+
+wyrównujemy raz przy wczytaniu: przecięcie dat i aktywów liczone jest
+jeden raz, każda ramka trafia (jedną kopią) do ciągłej tablicy (T, N)
+albo (T,) na osiach panelu, a dalej etapy dostają już tylko widoki —
+`panel["returns"]` (ndarray) albo `panel.frame("returns")` (DataFrame
+na tej samej pamięci).
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class AlignedPanel:
+    """
+    dates:  wspólny, posortowany kalendarz (T),
+    assets: wspólne, posortowane aktywa (N),
+    arrays: zarejestrowane tablice — (T, N) na aktywach albo (T,) dla serii
+            (portfel LS, benchmark).
+    date_pos / asset_pos: mapy etykieta -> pozycja w tablicach.
+    """
+    dates: pd.DatetimeIndex
+    assets: pd.Index
+    arrays: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.dates = pd.DatetimeIndex(self.dates, name="Date")
+        self.assets = pd.Index(self.assets)
+        self.date_pos: Dict[pd.Timestamp, int] = {d: i for i, d in enumerate(self.dates)}
+        self.asset_pos: Dict[str, int] = {a: j for j, a in enumerate(self.assets)}
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Mapping[str, pd.DataFrame],
+        series: Optional[Mapping[str, pd.Series]] = None,
+        period: Optional[Tuple[str, str]] = None,
+    ) -> "AlignedPanel":
+        """
+        Kalendarz = przecięcie dat wszystkich ramek i serii (przycięte do
+        `period`, obie granice włącznie), aktywa = przecięcie kolumn ramek.
+        """
+        series = series or {}
+        indexes = [f.index for f in frames.values()] + [s.index for s in series.values()]
+        dates = indexes[0]
+        for idx in indexes[1:]:
+            dates = dates.intersection(idx)
+        dates = pd.DatetimeIndex(dates).sort_values()
+        if period is not None:
+            start, end = pd.Timestamp(period[0]), pd.Timestamp(period[1])
+            dates = dates[(dates >= start) & (dates <= end)]
+
+        assets = None
+        for f in frames.values():
+            assets = f.columns if assets is None else assets.intersection(f.columns)
+        assets = pd.Index(sorted(assets)) if assets is not None else pd.Index([])
+
+        panel = cls(dates, assets)
+        for name, f in frames.items():
+            panel.add(name, f)
+        for name, s in series.items():
+            panel.add(name, s)
+        return panel
+
+    # -----------------------------------
+    # Rejestracja i widoki
+    # -----------------------------------
+
+    def add(self, name: str, data: Union[pd.DataFrame, pd.Series, np.ndarray]) -> np.ndarray:
+        """
+        Rejestruje dane pod nazwą `name`. Ramki i serie z własnym indeksem
+        są przenoszone na osie panelu pozycjami (brak etykiety -> NaN);
+        tablica musi mieć już kształt (T, N) albo (T,).
+        """
+        if isinstance(data, pd.DataFrame):
+            rows = data.index.get_indexer(self.dates)
+            cols = data.columns.get_indexer(self.assets)
+            arr = _take(data.to_numpy(dtype=float), rows, cols)
+        elif isinstance(data, pd.Series):
+            rows = data.index.get_indexer(self.dates)
+            arr = _take(data.to_numpy(dtype=float)[:, None], rows, None)[:, 0]
+        else:
+            arr = np.ascontiguousarray(data, dtype=float)
+            if arr.shape not in [(len(self.dates), len(self.assets)), (len(self.dates),)]:
+                raise ValueError(
+                    f"{name!r}: kształt {arr.shape} nie pasuje do panelu "
+                    f"({len(self.dates)}, {len(self.assets)})"
+                )
+        self.arrays[name] = arr
+        return arr
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.arrays
+
+    def frame(self, name: str) -> pd.DataFrame:
+        """DataFrame (daty x aktywa) na pamięci zarejestrowanej tablicy — bez kopii."""
+        return pd.DataFrame(self.arrays[name], index=self.dates, columns=self.assets, copy=False)
+
+    def series(self, name: str) -> pd.Series:
+        """Seria (T,) na pamięci zarejestrowanej tablicy — bez kopii."""
+        return pd.Series(self.arrays[name], index=self.dates, name=name, copy=False)
+
+    def between(self, start: str, end: str) -> "AlignedPanel":
+        """Podokres [start, end] — tablice to widoki (wycinek wierszy)."""
+        lo = self.dates.searchsorted(pd.Timestamp(start), side="left")
+        hi = self.dates.searchsorted(pd.Timestamp(end), side="right")
+        sub = AlignedPanel(self.dates[lo:hi], self.assets)
+        sub.arrays = {name: arr[lo:hi] for name, arr in self.arrays.items()}
+        return sub
+
+
+def _take(values: np.ndarray, rows: np.ndarray, cols: Optional[np.ndarray]) -> np.ndarray:
+    """values[rows][:, cols] jedną kopią do ciągłej tablicy; pozycje -1 -> NaN."""
+    if cols is None:
+        cols = np.arange(values.shape[1])
+    if (rows >= 0).all() and (cols >= 0).all():
+        return values[np.ix_(rows, cols)]
+
+    out = np.full((len(rows), len(cols)), np.nan)
+    r_ok, c_ok = rows >= 0, cols >= 0
+    out[np.ix_(r_ok, c_ok)] = values[np.ix_(rows[r_ok], cols[c_ok])]
+    return out
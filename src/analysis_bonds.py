@@ -2,6 +2,9 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from src import kernels
+from src.frequency import freq_path, periods_per_year
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data" / "processed"
 
@@ -13,18 +16,18 @@ def max_dd(series: pd.Series) -> float:
     """
     Maksymalne obsunięcie kapitału dla skumulowanych zwrotów.
     """
-    cum = (1 + series).cumprod()
-    peak = cum.cummax()
-    dd = (cum - peak) / peak
-    return dd.min()
+    return float(kernels.max_drawdown(series.to_numpy(dtype=float)))
 
 
-def main():
-    pf = pd.read_csv(PF_PATH, index_col=0, parse_dates=True)
+def main(freq: str = "M"):
+    """freq: "M" (domyślnie), "W" albo "D" — portfel z pliku o danej częstotliwości."""
+    ppy = periods_per_year(freq)
+    out_path = freq_path(OUT_PATH, freq)
+    pf = pd.read_csv(freq_path(PF_PATH, freq), index_col=0, parse_dates=True)
     ls = pf["LongShort"]
 
-    ann_mean = ls.mean() * 12
-    ann_std = ls.std() * np.sqrt(12)
+    ann_mean = ls.mean() * ppy
+    ann_std = ls.std() * np.sqrt(ppy)
     sharpe = ann_mean / ann_std if ann_std != 0 else np.nan
     t_stat = ann_mean / (ls.std() / np.sqrt(len(ls))) if ls.std() != 0 else np.nan
     mdd = max_dd(ls)
@@ -39,10 +42,10 @@ def main():
         }
     )
 
-    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    summary.to_csv(OUT_PATH, index=False)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    summary.to_csv(out_path, index=False)
 
-    print("Bond summary saved to:", OUT_PATH)
+    print("Bond summary saved to:", out_path)
     print(summary)
 
 
@@ -2,6 +2,9 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from src import kernels
+from src.frequency import freq_path, periods_per_year
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data" / "processed"
@@ -11,18 +14,18 @@ OUT_PATH = DATA_DIR / "analysis_fx_summary.csv"
 
 
 def max_drawdown(series: pd.Series) -> float:
-    cum = (1 + series).cumprod()
-    peak = cum.cummax()
-    dd = (cum - peak) / peak
-    return dd.min()
+    return float(kernels.max_drawdown(series.to_numpy(dtype=float)))
 
 
-def main():
-    pf = pd.read_csv(PF_PATH, index_col=0, parse_dates=True)
+def main(freq: str = "M"):
+    """freq: "M" (domyślnie), "W" albo "D" — portfel z pliku o danej częstotliwości."""
+    ppy = periods_per_year(freq)
+    out_path = freq_path(OUT_PATH, freq)
+    pf = pd.read_csv(freq_path(PF_PATH, freq), index_col=0, parse_dates=True)
     ret = pf["LongShort"]
 
-    ann_mean = ret.mean() * 12
-    ann_std = ret.std() * np.sqrt(12)
+    ann_mean = ret.mean() * ppy
+    ann_std = ret.std() * np.sqrt(ppy)
     sharpe = ann_mean / ann_std if ann_std != 0 else np.nan
     t_stat = ann_mean / (ret.std() / np.sqrt(len(ret))) if ret.std() != 0 else np.nan
     mdd = max_drawdown(ret)
@@ -37,8 +40,8 @@ def main():
         }
     )
 
-    df.to_csv(OUT_PATH, index=False)
-    print("FX summary saved to:", OUT_PATH)
+    df.to_csv(out_path, index=False)
+    print("FX summary saved to:", out_path)
     print(df)
 
 
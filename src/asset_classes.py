@@ -0,0 +1,216 @@
+"""
+Rejestr klas aktywów.
+
+Każda klasa to jeden wpis `AssetClassSpec`: tickery, źródło danych,
+typ stopy zwrotu, filtr min_obs, kierunek portfela Long–Short i nazwy
+plików w data/processed/. Dodanie piątej klasy = jeden wpis w
+`ASSET_CLASSES` (plus ewentualnie skrypt pobierający dane).
+
+Moduł nie importuje nic ciężkiego i nie ma efektów ubocznych.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DATA_RAW_DIR = PROJECT_ROOT / "data" / "raw"
+DATA_PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
+
+# wspólny okres próby (jak w skryptach bonds/commodities)
+SAMPLE_PERIOD: Tuple[str, str] = ("2005-01-01", "2025-01-01")
+
+
+# -----------------------------------
+# Tickery
+# -----------------------------------
+EQUITY_TICKERS: Dict[str, str] = {
+    "DE": "^GDAXI",      # DAX
+    "FR": "^FCHI",       # CAC40
+    "IT": "FTSEMIB.MI",  # FTSE MIB
+    "ES": "^IBEX",       # IBEX 35
+    "NL": "^AEX",        # AEX
+    "CH": "^SSMI",       # Swiss Market Index
+    "UK": "^FTSE",       # FTSE 100
+
+}
+
+# Uwaga: część tickerów warto potem przetestować jak wcześniej, ale ten zestaw
+# powinien działać w większości przypadków.
+FX_TICKERS: Dict[str, str] = {
+    "EUR": "EURUSD=X",  # euro / dolar
+    "GBP": "GBPUSD=X",  # funt / dolar
+    "CHF": "CHFUSD=X",  # frank / dolar
+    "NOK": "NOKUSD=X",  # korona norweska / dolar
+    "SEK": "SEKUSD=X",  # korona szwedzka / dolar
+    # CEE jako USD/PLN itd. (notacja 'PLN=X', 'CZK=X', 'HUF=X')
+    "PLN": "PLN=X",
+    "CZK": "CZK=X",
+    "HUF": "HUF=X",
+}
+
+# FRED: 10Y gov bond yields (Europa + UK, PL, Nordics)
+BOND_TICKERS: Dict[str, str] = {
+    "DE": "IRLTLT01DEM156N",
+    "FR": "IRLTLT01FRM156N",
+    "IT": "IRLTLT01ITM156N",
+    "ES": "IRLTLT01ESM156N",
+    "NL": "IRLTLT01NLM156N",
+    "CH": "IRLTLT01CHM156N",
+    "UK": "IRLTLT01GBM156N",
+    "PL": "IRLTLT01PLM156N",
+    "SE": "IRLTLT01SEM156N",
+    "NO": "IRLTLT01NOM156N",
+    "BE": "IRLTLT01BEM156N",
+    "AT": "IRLTLT01ATM156N",
+    "PT": "IRLTLT01PTM156N",
+    "DK": "IRLTLT01DKM156N",
+    "FI": "IRLTLT01FIM156N",
+    "IE": "IRLTLT01IEM156N",
+}
+
+CMDTY_TICKERS: Dict[str, str] = {
+    "CL": "CL=F",   # WTI Crude
+    "BZ": "BZ=F",   # Brent
+    "NG": "NG=F",   # Nat Gas
+    "GC": "GC=F",   # Gold
+    "SI": "SI=F",   # Silver
+    "HG": "HG=F",   # Copper
+    "ZC": "ZC=F",   # Corn
+    "ZW": "ZW=F",   # Wheat
+    "ZS": "ZS=F",   # Soybeans
+    "SB": "SB=F",   # Sugar
+}
+
+
+@dataclass(frozen=True)
+class AssetClassSpec:
+    """
+    Opis jednej klasy aktywów.
+
+    return_type: "simple" (P_t / P_{t-1} - 1), "log" (ln S_t - ln S_{t-1})
+                 albo "neg_dy" (r ≈ -Δy dla rentowności).
+    direction:   która strona sortowania po skośności idzie na long —
+                 "low" (najniższa skośność) albo "high" (najwyższa).
+    period:      przycięcie próby przy wczytywaniu (None = cały plik).
+    daily_prices_file: dzienne ceny w data/raw/ (None = brak, np. FRED
+                 daje tylko miesięczne rentowności).
+    """
+    name: str
+    tickers: Dict[str, str]
+    source: str
+    return_type: str
+    min_obs: int
+    direction: str
+    returns_file: str
+    skew_file: str
+    portfolio_file: str
+    summary_file: str
+    download_module: str
+    regression_module: Optional[str] = None
+    period: Optional[Tuple[str, str]] = None
+    min_assets: int = 4
+    daily_prices_file: Optional[str] = None
+
+    @property
+    def returns_path(self) -> Path:
+        return DATA_PROCESSED_DIR / self.returns_file
+
+    @property
+    def skew_path(self) -> Path:
+        return DATA_PROCESSED_DIR / self.skew_file
+
+    @property
+    def portfolio_path(self) -> Path:
+        return DATA_PROCESSED_DIR / self.portfolio_file
+
+    @property
+    def summary_path(self) -> Path:
+        return DATA_PROCESSED_DIR / self.summary_file
+
+    @property
+    def daily_prices_path(self) -> Optional[Path]:
+        if self.daily_prices_file is None:
+            return None
+        return DATA_RAW_DIR / self.daily_prices_file
+
+
+ASSET_CLASSES: Dict[str, AssetClassSpec] = {
+    "equity": AssetClassSpec(
+        name="equity",
+        tickers=EQUITY_TICKERS,
+        source="yfinance",
+        return_type="simple",
+        # wyrzuca FI (ma tylko ~130 obserwacji)
+        min_obs=180,
+        direction="low",
+        returns_file="equity_monthly_returns.csv",
+        skew_file="equity_skewness_12m.csv",
+        portfolio_file="portfolio_skewness_ls.csv",
+        summary_file="analysis_equity_summary.csv",
+        download_module="data_download",
+        daily_prices_file="equity_daily_prices.csv",
+        regression_module="regression_equity",
+    ),
+    "fx": AssetClassSpec(
+        name="fx",
+        tickers=FX_TICKERS,
+        source="yfinance",
+        return_type="log",
+        min_obs=120,
+        direction="low",
+        returns_file="fx_monthly_returns.csv",
+        skew_file="fx_skewness_12m.csv",
+        portfolio_file="portfolio_fx_skewness_ls.csv",
+        summary_file="analysis_fx_summary.csv",
+        download_module="data_download_fx",
+        daily_prices_file="fx_daily_prices.csv",
+    ),
+    "bonds": AssetClassSpec(
+        name="bonds",
+        tickers=BOND_TICKERS,
+        source="fred",
+        return_type="neg_dy",
+        min_obs=80,
+        # BONDS (Baltas 2019): long najwyższa skośność (kraje bezpieczne)
+        direction="high",
+        returns_file="bond_monthly_returns.csv",
+        skew_file="bond_skewness_12m.csv",
+        portfolio_file="portfolio_bonds_skewness_ls.csv",
+        summary_file="analysis_bonds_summary.csv",
+        download_module="data_download_bonds_fred",
+        regression_module="regression_bonds",
+        period=SAMPLE_PERIOD,
+    ),
+    "commodities": AssetClassSpec(
+        name="commodities",
+        tickers=CMDTY_TICKERS,
+        source="yfinance",
+        return_type="log",
+        min_obs=80,
+        direction="low",
+        returns_file="commodities_monthly_returns.csv",
+        skew_file="commodities_skewness_12m.csv",
+        portfolio_file="portfolio_commodities_skewness_ls.csv",
+        summary_file="analysis_commodities_summary.csv",
+        download_module="data_download_commodities",
+        daily_prices_file="commodities_daily_prices.csv",
+        period=SAMPLE_PERIOD,
+    ),
+}
+
+
+def get_spec(name: str) -> AssetClassSpec:
+    try:
+        return ASSET_CLASSES[name]
+    except KeyError:
+        raise ValueError(
+            f"Nieznana klasa aktywów: {name!r}. Dostępne: {list(ASSET_CLASSES)}"
+        ) from None
+
+
+def resolve(names: Optional[List[str]] = None) -> List[AssetClassSpec]:
+    """Lista specyfikacji w kolejności rejestru (None = wszystkie)."""
+    if not names:
+        return list(ASSET_CLASSES.values())
+    return [get_spec(n) for n in names]
@@ -0,0 +1,95 @@
+"""
+Atrybucja zwrotu portfela Long–Short do pojedynczych aktywów.
+
+Wkłady (waga × stopa zwrotu, osobno dla nogi long i short) powstają przy
+tym samym sortowaniu co portfel (`panel.skewness_portfolios(...,
+contributions=...)`); suma wkładów po aktywach w danym miesiącu daje
+zwrot nogi, a Long − Short — zwrot LongShort. Z nich liczymy:
+
+    cumulative — suma wkładów w całej próbie per aktywo (Long, Short,
+                 LongShort, udział w sumie |LongShort|, miesiące w nodze),
+    yearly     — wkład LongShort per rok i aktywo (kolumna Total = zwrot
+                 LongShort zsumowany w roku).
+
+Pliki: data/processed/portfolio_<...>_contrib.csv (wkłady LongShort,
+data × aktywo) oraz analysis_<klasa>_attribution.csv i
+analysis_<klasa>_attribution_yearly.csv.
+"""
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+import pandas as pd
+
+from src.asset_classes import DATA_PROCESSED_DIR, AssetClassSpec
+from src.frequency import tagged_path
+
+SHARE_EPS = 1e-12
+
+
+def long_short_contributions(contrib: pd.DataFrame) -> pd.DataFrame:
+    """Wkłady do LongShort (data × aktywo): long − short (poza nogami = 0)."""
+    return contrib["Long"].fillna(0.0) - contrib["Short"].fillna(0.0)
+
+
+def cumulative_attribution(contrib: pd.DataFrame) -> pd.DataFrame:
+    """
+    Suma wkładów w całej próbie (wiersz = aktywo). Miesiące w nodze
+    liczone z przynależności (wkład różny od NaN), więc aktywo z zerową
+    stopą zwrotu też się liczy. Share = LongShort / suma |LongShort|
+    (NaN, gdy wszystkie wkłady są zerowe).
+    """
+    long_part = contrib["Long"].sum()
+    short_part = contrib["Short"].sum()
+    ls = long_part - short_part
+    total = ls.abs().sum()
+    table = pd.DataFrame(
+        {
+            "Long": long_part,
+            "Short": short_part,
+            "LongShort": ls,
+            "Share": ls / total if total > SHARE_EPS else float("nan"),
+            "Months Long": contrib["Long"].notna().sum(),
+            "Months Short": contrib["Short"].notna().sum(),
+        }
+    )
+    table.index.name = "Asset"
+    return table.sort_values("LongShort", ascending=False)
+
+
+def yearly_attribution(contrib: pd.DataFrame) -> pd.DataFrame:
+    """Wkład LongShort zsumowany w latach (wiersz = rok, kolumna = aktywo + Total)."""
+    ls = long_short_contributions(contrib)
+    table = ls.groupby(ls.index.year).sum()
+    table.index.name = "Year"
+    table["Total"] = table.sum(axis=1)
+    return table
+
+
+def attribution_tables(contrib: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    return cumulative_attribution(contrib), yearly_attribution(contrib)
+
+
+def output_paths(spec: AssetClassSpec, tag: str = "") -> Tuple[Path, Path, Path]:
+    portfolio_path = tagged_path(spec.portfolio_path, tag)
+    return (
+        portfolio_path.with_name(f"{portfolio_path.stem}_contrib.csv"),
+        tagged_path(DATA_PROCESSED_DIR / f"analysis_{spec.name}_attribution.csv", tag),
+        tagged_path(DATA_PROCESSED_DIR / f"analysis_{spec.name}_attribution_yearly.csv", tag),
+    )
+
+
+def save_attribution(
+    contributions: Dict[str, pd.DataFrame],
+    specs: Sequence[AssetClassSpec],
+    tag: str = "",
+) -> None:
+    for spec in specs:
+        contrib = contributions[spec.name]
+        contrib_path, cum_path, yearly_path = output_paths(spec, tag)
+        contrib_path.parent.mkdir(parents=True, exist_ok=True)
+
+        cumulative, yearly = attribution_tables(contrib)
+        long_short_contributions(contrib).to_csv(contrib_path)
+        cumulative.to_csv(cum_path)
+        yearly.to_csv(yearly_path)
+        print(f"[{spec.name}] atrybucja -> {cum_path}, {yearly_path}")
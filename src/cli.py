@@ -0,0 +1,486 @@
+"""
+skew — jedno wejście do całego pipeline'u.
+
+    python -m src download [equity fx bonds commodities]
+    python -m src skew
+    python -m src portfolio fx bonds
+    python -m src analyze
+    python -m src regress
+    python -m src run --skip-download
+    python -m src realized --window 60 --as-signal
+    python -m src highfreq --freq W
+    python -m src analyze --freq W
+    python -m src report --pdf
+    python -m src holding --max-horizon 24 --max-lag 12
+    python -m src jackknife equity
+    python -m src subperiods --breaks 2008-01-01 2020-01-01 --window 36
+    python -m src pca --window 36 --signals fx
+    python -m src synthetic --assets 10000 --periods 240 --dist skewt
+
+Klasy aktywów pochodzą z rejestru `src.asset_classes`. Etapy skew,
+portfolio i analyze liczą wszystkie klasy naraz na wspólnej kostce
+(`src.panel`); `run` przechodzi przez nie w pamięci (`src.study`),
+zapisując wyniki, ale nie czytając ich z powrotem. Moduły etapów
+importujemy dopiero w momencie uruchomienia podkomendy, więc
+`skew`/`portfolio`/`analyze` nie ładują yfinance, fredapi ani
+statsmodels. Sam import tego modułu nie ma żadnych efektów ubocznych.
+"""
+import argparse
+import importlib
+import time
+from typing import List, Optional, Sequence
+
+from src.asset_classes import ASSET_CLASSES, resolve
+
+
+RUN_ORDER: List[str] = ["download", "skew", "portfolio", "analyze", "regress"]
+
+
+def _run_module(module_name: str, **kwargs) -> None:
+    module = importlib.import_module(f"src.{module_name}")
+    module.main(**kwargs)
+
+
+def run_stage(stage: str, asset_classes: Sequence[str], **params) -> None:
+    """
+    download/regress: skrypty per klasa (moduły z rejestru),
+    skew/portfolio/analyze: jedno przejście po kostce wszystkich klas.
+    `params` trafiają do funkcji etapu na kostce (np. window, estimator)
+    albo do `main` modułów regresji (signal).
+    """
+    t0 = time.perf_counter()
+    specs = resolve(list(asset_classes))
+
+    if stage == "download":
+        for spec in specs:
+            _run_module(spec.download_module)
+    elif stage == "regress":
+        for spec in specs:
+            if spec.regression_module is not None:
+                _run_module(spec.regression_module, **params)
+    else:
+        from src import panel
+
+        getattr(panel, f"{stage}_stage")([s.name for s in specs], **params)
+
+    print(f"[{stage}] {', '.join(s.name for s in specs)}: {time.perf_counter() - t0:.2f}s")
+
+
+def run_in_memory(
+    asset_classes: Sequence[str],
+    window: int = 12,
+    estimator: str = "moment",
+    workers: int = 1,
+    record: bool = False,
+) -> None:
+    """
+    skew -> portfolio -> analyze w jednym przejściu (`SkewnessStudy`):
+    wyniki są zapisywane, ale kolejny etap nie czyta ich z dysku.
+    record=True dopisuje przebieg do bazy wyników (`src.results_store`).
+    """
+    from src.study import SkewnessStudy
+
+    t0 = time.perf_counter()
+    study = SkewnessStudy(asset_classes, persist=True, workers=workers)
+    study.skewness(window, estimator).portfolio().stats()
+    if record:
+        from src.results_store import ResultsStore
+
+        with ResultsStore() as store:
+            run_ids = store.record_study(study)
+        print(f"[results] run_id {run_ids} -> {store.path}")
+    elapsed = time.perf_counter() - t0
+    print(f"[skew -> portfolio -> analyze] {', '.join(asset_classes)}: {elapsed:.2f}s")
+
+
+def _add_asset_classes_arg(parser: argparse.ArgumentParser) -> None:
+    # bez `choices`: argparse < 3.12 odrzuca pustą listę przy nargs="*"
+    parser.add_argument(
+        "asset_classes",
+        nargs="*",
+        metavar="ASSET_CLASS",
+        help=f"klasy aktywów: {', '.join(ASSET_CLASSES)} (domyślnie wszystkie)",
+    )
+
+
+def _add_signal_args(parser: argparse.ArgumentParser) -> None:
+    # nazwy sprawdza src.estimators — nie importujemy go tu, żeby --help był lekki
+    parser.add_argument(
+        "--window", type=int, default=12, help="okno rolling skośności (miesiące)"
+    )
+    parser.add_argument(
+        "--estimator",
+        default="moment",
+        help=(
+            "estymator skośności: moment, bowley, kelly, pearson, medcouple, "
+            "coskew, idio, ewm (dla ewm --window to half-life; domyślnie moment)"
+        ),
+    )
+
+
+def _add_freq_arg(parser: argparse.ArgumentParser, default: str) -> None:
+    parser.add_argument(
+        "--freq",
+        choices=["M", "W", "D"] if default == "M" else ["W", "D"],
+        default=default,
+        help=f"częstotliwość rebalansowania (domyślnie {default})",
+    )
+
+
+def _add_workers_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="liczba procesów dla sortowań i statystyk (pamięć współdzielona; domyślnie 1)",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="skew",
+        description="Cross-asset skewness: pobieranie danych, sygnały, portfele, statystyki.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for stage in RUN_ORDER:
+        p = sub.add_parser(stage, help=f"etap '{stage}'")
+        _add_asset_classes_arg(p)
+        if stage == "skew":
+            _add_signal_args(p)
+        if stage == "analyze":
+            _add_freq_arg(p, default="M")
+        if stage in ("portfolio", "analyze"):
+            _add_workers_arg(p)
+        if stage in ("portfolio", "analyze", "regress"):
+            p.add_argument(
+                "--signal",
+                default="",
+                help="znacznik pliku sygnału, np. w24, w12_bowley (domyślnie 12M moment)",
+            )
+
+    p = sub.add_parser("run", help="cały pipeline po kolei")
+    _add_asset_classes_arg(p)
+    _add_signal_args(p)
+    _add_workers_arg(p)
+    p.add_argument(
+        "--skip-download",
+        action="store_true",
+        help="nie pobieraj danych, licz na tym, co jest w data/",
+    )
+    p.add_argument(
+        "--record",
+        action="store_true",
+        help="dopisz przebieg (parametry, zwroty, statystyki) do data/results.sqlite",
+    )
+
+    p = sub.add_parser("report", help="raport HTML/PDF z wykresami (outputs/report/)")
+    _add_asset_classes_arg(p)
+    p.add_argument(
+        "--workers", type=int, default=None, help="procesy do rysowania (domyślnie: CPU)"
+    )
+    p.add_argument("--pdf", action="store_true", help="zapisz też report.pdf")
+    p.add_argument("--no-cache", action="store_true", help="rysuj wszystkie wykresy od nowa")
+
+    p = sub.add_parser("results", help="statystyki zapisanych przebiegów z data/results.sqlite")
+    _add_asset_classes_arg(p)
+    p.add_argument("--window", type=int, default=None, help="tylko przebiegi z tym oknem")
+    p.add_argument("--estimator", default=None, help="tylko przebiegi z tym estymatorem")
+
+    p = sub.add_parser("realized", help="realized skewness z dziennych cen (data/raw/)")
+    _add_asset_classes_arg(p)
+    p.add_argument(
+        "--window",
+        type=int,
+        default=None,
+        help="kroczące okno w dniach (np. 60, 252); domyślnie w obrębie miesiąca",
+    )
+    p.add_argument(
+        "--min-days", type=int, default=None, help="minimalna liczba dni w okresie/oknie"
+    )
+    p.add_argument(
+        "--as-signal",
+        action="store_true",
+        help="zapisz też jako sygnał dla `portfolio --signal realized[_<okno>d]`",
+    )
+
+    p = sub.add_parser(
+        "highfreq", help="sygnał z dziennych stóp zwrotu, rebalansowanie tygodniowe/dzienne"
+    )
+    _add_asset_classes_arg(p)
+    _add_freq_arg(p, default="W")
+    p.add_argument("--window", type=int, default=252, help="okno rolling skośności (dni sesyjne)")
+    p.add_argument("--estimator", default="moment", help="estymator skośności (jak w `skew`)")
+
+    p = sub.add_parser(
+        "holding", help="portfele nakładające się (holding period 1..H) i zanik sygnału"
+    )
+    _add_asset_classes_arg(p)
+    p.add_argument(
+        "--max-horizon", type=int, default=24, help="najdłuższy holding period (miesiące)"
+    )
+    p.add_argument(
+        "--max-lag", type=int, default=12, help="najdłuższe opóźnienie kohorty (miesiące)"
+    )
+
+    p = sub.add_parser("jackknife", help="wyniki bez jednego aktywa / bez jednego roku")
+    _add_asset_classes_arg(p)
+
+    p = sub.add_parser(
+        "subperiods", help="statystyki w podokresach, oknach rozszerzających i kroczących"
+    )
+    _add_asset_classes_arg(p)
+    _add_freq_arg(p, default="M")
+    p.add_argument(
+        "--breaks",
+        nargs="+",
+        default=["2008-01-01", "2020-01-01"],
+        help="daty podziału próby (przed / od każdej daty)",
+    )
+    p.add_argument("--window", type=int, default=36, help="okno kroczących statystyk (okresy)")
+
+    p = sub.add_parser("pca", help="krocząca korelacja i PCA premii skośności (udział PC1)")
+    _add_asset_classes_arg(p)
+    p.add_argument("--window", type=int, default=36, help="okno kroczące (miesiące)")
+    p.add_argument(
+        "--signals",
+        nargs="*",
+        default=[],
+        metavar="ASSET_CLASS",
+        help="klasy, dla których policzyć też PCA sygnałów skośności aktywów",
+    )
+
+    p = sub.add_parser(
+        "fama-macbeth", help="regresje Fama–MacBeth stóp zwrotu na opóźnionej skośności"
+    )
+    _add_asset_classes_arg(p)
+    p.add_argument(
+        "--controls",
+        nargs="*",
+        choices=["ret", "vol"],
+        default=[],
+        help="kontrole: ret (stopa zwrotu z t-1), vol (zmienność 12M do t-1)",
+    )
+    p.add_argument(
+        "--lags", type=int, default=None, help="opóźnienia Neweya–Westa (domyślnie reguła NW)"
+    )
+
+    p = sub.add_parser(
+        "futures", help="ciągłe serie surowców z historii pojedynczych kontraktów"
+    )
+    p.add_argument(
+        "--dir", default=None, help="katalog z plikami kontraktów (domyślnie data/raw/futures)"
+    )
+    p.add_argument(
+        "--rule", choices=["calendar", "volume"], default="calendar", help="reguła rolowania"
+    )
+    p.add_argument(
+        "--roll-days", type=int, default=15, help="dni kalendarzowe przed wygaśnięciem / dostawą"
+    )
+    p.add_argument(
+        "--as-inputs",
+        action="store_true",
+        help="zapisz serię ratio-adjusted jako dzienne ceny i miesięczne zwroty surowców",
+    )
+
+    p = sub.add_parser(
+        "fx-crosses", help="FX w jednej notacji (XXX/USD) i strategia z perspektywy innej waluty"
+    )
+    p.add_argument(
+        "--base", default="USD", help="waluta bazowa inwestora, np. EUR, CHF (domyślnie USD)"
+    )
+    p.add_argument(
+        "--run", action="store_true", help="policz skośność, portfel i statystyki w tej walucie"
+    )
+    _add_signal_args(p)
+
+    p = sub.add_parser(
+        "vintages", help="archiwum wersji rentowności FRED (point-in-time, delty)"
+    )
+    p.add_argument(
+        "--seed-alfred",
+        action="store_true",
+        help="wczytaj historię wersji z ALFRED (wymaga FRED_API_KEY)",
+    )
+    p.add_argument("--asof", default=None, help="zapisz panel rentowności znany w tym dniu")
+
+    p = sub.add_parser(
+        "serve", help="lokalny serwis HTTP: panele w pamięci, statystyki LS na żądanie"
+    )
+    _add_asset_classes_arg(p)
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument(
+        "--watch-interval",
+        type=float,
+        default=2.0,
+        help="co ile sekund sprawdzać zmiany plików wejściowych (0 = bez obserwacji)",
+    )
+
+    p = sub.add_parser(
+        "synthetic",
+        help="syntetyczny panel stóp zwrotu / cen o zadanej skośności (data/synthetic/)",
+    )
+    p.add_argument("--assets", type=int, default=1000, help="liczba aktywów")
+    p.add_argument("--periods", type=int, default=240, help="liczba okresów (miesięcy albo dni)")
+    p.add_argument(
+        "--freq", choices=["M", "D"], default="M", help="M: stopy zwrotu, D: dzienne ceny"
+    )
+    p.add_argument("--dist", choices=["jump", "skewt", "normal"], default="jump", help="rozkład")
+    p.add_argument("--missing", type=float, default=0.01, help="udział losowych braków")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", default=None, help="plik wynikowy (domyślnie data/synthetic/...)")
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "synthetic":
+        from src import synthetic
+
+        synthetic.main(
+            n_assets=args.assets,
+            n_periods=args.periods,
+            freq=args.freq,
+            distribution=args.dist,
+            missing=args.missing,
+            seed=args.seed,
+            out=args.out,
+        )
+        return
+
+    if args.command == "futures":
+        from src import continuous_futures
+
+        continuous_futures.main(
+            args.dir or continuous_futures.FUTURES_DIR,
+            rule=args.rule,
+            roll_days=args.roll_days,
+            as_inputs=args.as_inputs,
+        )
+        return
+
+    if args.command == "fx-crosses":
+        from src import fx_crosses
+
+        fx_crosses.main(args.base, run=args.run, window=args.window, estimator=args.estimator)
+        return
+
+    if args.command == "vintages":
+        from src import vintages
+
+        vintages.main(seed_alfred=args.seed_alfred, asof=args.asof)
+        return
+
+    unknown = [a for a in args.asset_classes if a not in ASSET_CLASSES]
+    if unknown:
+        parser.error(f"nieznane klasy aktywów: {unknown}")
+    asset_classes = args.asset_classes or list(ASSET_CLASSES)
+
+    if args.command == "realized":
+        from src import realized_skewness
+
+        realized_skewness.main(
+            asset_classes, window=args.window, min_days=args.min_days, as_signal=args.as_signal
+        )
+        return
+
+    if args.command == "report":
+        from src import report
+
+        report.main(asset_classes, workers=args.workers, pdf=args.pdf, use_cache=not args.no_cache)
+        return
+
+    if args.command == "results":
+        import pandas as pd
+
+        from src.results_store import ResultsStore
+
+        with ResultsStore() as store:
+            table = store.stats_table(
+                asset_class=asset_classes, window=args.window, estimator=args.estimator
+            )
+        with pd.option_context(
+            "display.width", 200, "display.max_columns", None, "display.max_rows", 200
+        ):
+            print(table)
+        return
+
+    if args.command == "highfreq":
+        from src import high_frequency
+
+        high_frequency.main(
+            asset_classes, freq=args.freq, window=args.window, estimator=args.estimator
+        )
+        return
+
+    if args.command == "holding":
+        from src import holding_periods
+
+        holding_periods.main(asset_classes, max_horizon=args.max_horizon, max_lag=args.max_lag)
+        return
+
+    if args.command == "jackknife":
+        from src import jackknife
+
+        jackknife.main(asset_classes)
+        return
+
+    if args.command == "subperiods":
+        from src import subperiods
+
+        subperiods.main(asset_classes, window=args.window, freq=args.freq, breaks=args.breaks)
+        return
+
+    if args.command == "pca":
+        from src import common_factor
+
+        common_factor.main(asset_classes, window=args.window, signals=args.signals)
+        return
+
+    if args.command == "fama-macbeth":
+        from src import fama_macbeth
+
+        fama_macbeth.main(asset_classes, controls=args.controls, lags=args.lags)
+        return
+
+    if args.command == "serve":
+        from src import service
+
+        service.main(
+            asset_classes, host=args.host, port=args.port, watch_interval=args.watch_interval
+        )
+        return
+
+    if args.command == "run":
+        if not args.skip_download:
+            run_stage("download", asset_classes)
+        run_in_memory(
+            asset_classes,
+            window=args.window,
+            estimator=args.estimator,
+            workers=args.workers,
+            record=args.record,
+        )
+        from src.frequency import signal_tag
+
+        run_stage("regress", asset_classes, signal=signal_tag(args.window, args.estimator))
+        return
+
+    params = {}
+    if args.command == "skew":
+        params = {"window": args.window, "estimator": args.estimator}
+    elif args.command == "portfolio":
+        params = {"workers": args.workers, "signal": args.signal}
+    elif args.command == "analyze":
+        params = {"freq": args.freq, "workers": args.workers, "signal": args.signal}
+    elif args.command == "regress":
+        params = {"signal": args.signal}
+    run_stage(args.command, asset_classes, **params)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Wspólny czynnik czy niezależne źródła? Krocząca korelacja i PCA premii
+skośności z czterech klas aktywów (serie LongShort), opcjonalnie także
+sygnałów skośności w obrębie klasy.
+
+Macierze korelacji w kroczącym oknie liczone są z sum w oknie
+(`kernels.rolling_corr` — przesunięcie okna dodaje jeden wiersz i odejmuje
+najstarszy), a pierwsza składowa główna iteracją potęgową startującą
+z wektora z poprzedniej daty (`kernels.leading_eigen`) zamiast
+`np.corrcoef` + `eigh` od zera w każdym miesiącu.
+
+Główna statystyka: udział wariancji wyjaśnianej przez PC1 (λ1 / K dla
+macierzy korelacji K x K). Wyniki:
+
+    data/processed/analysis_premia_pca.csv          — premie LS,
+    data/processed/analysis_<klasa>_signal_pca.csv  — sygnały klasy (--signals).
+"""
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src import kernels, panel
+from src.asset_classes import DATA_PROCESSED_DIR, resolve
+
+ROLLING_WINDOW = 36
+PREMIA_PCA_PATH = DATA_PROCESSED_DIR / "analysis_premia_pca.csv"
+
+
+def signal_pca_path(name: str) -> Path:
+    return DATA_PROCESSED_DIR / f"analysis_{name}_signal_pca.csv"
+
+
+def rolling_pca(frame: pd.DataFrame, window: int = ROLLING_WINDOW) -> pd.DataFrame:
+    """
+    Krocząca PCA kolumn `frame`: udział PC1 w wariancji, średnia korelacja
+    między parami i ładunki PC1 (wiersz = data końca okna; NaN, dopóki
+    wszystkie kolumny nie mają pełnego okna).
+    """
+    corr = kernels.rolling_corr(frame.to_numpy(dtype=float), window)
+    lam, vecs = kernels.leading_eigen(corr)
+
+    n_k = frame.shape[1]
+    off = ~np.eye(n_k, dtype=bool)
+    out = pd.DataFrame(
+        {
+            "PC1 Share": lam / n_k,
+            "Mean Corr": corr[:, off].mean(axis=1),
+        },
+        index=frame.index,
+    )
+    for k, col in enumerate(frame.columns):
+        out[f"PC1 {col}"] = vecs[:, k]
+    return out
+
+
+def premia_frame(names: Optional[List[str]] = None) -> pd.DataFrame:
+    """LongShort wszystkich klas na wspólnej osi dat (z plików portfeli)."""
+    specs = resolve(names)
+    return pd.concat(
+        [
+            pd.read_csv(s.portfolio_path, index_col=0, parse_dates=True)["LongShort"].rename(s.name)
+            for s in specs
+        ],
+        axis=1,
+        sort=True,
+    )
+
+
+def main(
+    names: Optional[List[str]] = None,
+    window: int = ROLLING_WINDOW,
+    signals: Sequence[str] = (),
+) -> None:
+    premia = rolling_pca(premia_frame(names), window=window)
+    PREMIA_PCA_PATH.parent.mkdir(parents=True, exist_ok=True)
+    premia.to_csv(PREMIA_PCA_PATH)
+    share = premia["PC1 Share"].dropna()
+    print(f"[premie] PCA {window}M -> {PREMIA_PCA_PATH}")
+    print(
+        f"    udział PC1: średnio {share.mean():.3f}, min {share.min():.3f}, "
+        f"max {share.max():.3f}, ostatni {share.iloc[-1]:.3f} ({share.index[-1]:%Y-%m})"
+    )
+
+    for spec in resolve(list(signals)) if signals else []:
+        skew = panel.read_spec_frame(spec.skew_path, spec)
+        table = rolling_pca(skew, window=window)
+        out_path = signal_pca_path(spec.name)
+        table.to_csv(out_path)
+        print(f"[{spec.name}] PCA sygnałów {window}M -> {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Ciągłe serie futures z historii pojedynczych kontraktów — zamiast
+tickerów front-month "=F" z Yahoo, które rolują skokowo (i dały ujemną
+cenę WTI w kwietniu 2020, na której psuje się pct_change().apply(np.log1p)).
+
+Wejście: pliki CSV w data/raw/futures/ (dowolnie pogrupowane):
+
+    Date, Contract, Close[, Volume][, Expiry]   — wiele kontraktów w pliku,
+    Date, Close[, Volume][, Expiry]             — jeden kontrakt, kod = nazwa pliku.
+
+Kod kontraktu: korzeń z CMDTY_TICKERS + kod miesiąca dostawy + rok,
+np. CLZ20, CLZ2020 albo CLZ24.NYM (sufiks giełdy jest pomijany).
+Zamiast Close może być Settle.
+
+Wszystkie kontrakty wszystkich korzeni trafiają do jednej tablicy
+(daty x kontrakty, posortowane po korzeniu i miesiącu dostawy), więc
+reguły rolowania i serie ciągłe liczymy wektorowo po datach — pętla
+jest tylko po korzeniach, nie po kontraktach:
+
+    rule="calendar" — trzymamy najbliższy kontrakt do `roll_days` dni
+                      kalendarzowych przed wygaśnięciem (Expiry, a bez
+                      niej — przed pierwszym dniem miesiąca dostawy),
+    rule="volume"   — kontrakt o największym wolumenie, bez powrotu do
+                      wcześniejszego i najpóźniej w dacie z reguły calendar.
+
+Kontrakt wybrany na zamknięciu dnia t jest trzymany do zamknięcia t+1.
+Rolowanie w dniu t ma lukę (nowy − stary) i iloraz (nowy / stary) obu
+cen z tego dnia. Wyniki (daty x korzenie):
+
+    backadj  — ceny z dodaną sumą późniejszych luk (ostatni kontrakt bez zmian),
+    ratioadj — ceny przemnożone przez iloczyn późniejszych ilorazów (zwroty
+               = zwroty trzymanego kontraktu, poziom zawsze > 0 przy cenach > 0),
+    roll_yield — annualizowane ln(F_bliższy / F_następny) * 12 / różnica
+               miesięcy dostawy (> 0 = backwardation),
+    active   — kod trzymanego kontraktu.
+
+Rolowanie przy cenie <= 0 nie zmienia skali ratioadj (iloraz = 1).
+Pliki: data/processed/commodities_continuous_<rodzaj>.csv; as_inputs=True
+zapisuje też ratioadj jako data/raw/commodities_daily_prices.csv
+i miesięczne log-zwroty jako commodities_monthly_returns.csv (wejścia
+reszty pipeline'u).
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+from src.asset_classes import CMDTY_TICKERS, DATA_PROCESSED_DIR, PROJECT_ROOT
+from src.frequency import month_end_rule
+
+FUTURES_DIR = PROJECT_ROOT / "data" / "raw" / "futures"
+DATA_RAW = PROJECT_ROOT / "data" / "raw"
+ROLL_RULES = ("calendar", "volume")
+ROLL_DAYS = 15
+MONTH_CODES = "FGHJKMNQUVXZ"
+OUTPUT_KINDS = ("backadj", "ratioadj", "roll_yield", "active")
+
+_CODE_PATTERN = (
+    r"^(?P<Root>" + "|".join(sorted(CMDTY_TICKERS, key=len, reverse=True)) + r")"
+    r"(?P<Month>[" + MONTH_CODES + r"])(?P<Year>\d{4}|\d{2})$"
+)
+
+
+@dataclass
+class ContractPanel:
+    """
+    dates:     (T,) wspólny kalendarz,
+    contracts: ramka (Root, Contract, Delivery, Expiry) w kolejności kolumn,
+    price:     (T, K) ceny (NaN = brak notowania),
+    volume:    (T, K) wolumen (NaN = brak danych).
+    """
+    dates: pd.DatetimeIndex
+    contracts: pd.DataFrame
+    price: np.ndarray
+    volume: np.ndarray
+
+    def columns(self, root: str) -> slice:
+        """Kolumny kontraktów korzenia (ciągły blok, posortowany po dostawie)."""
+        pos = np.flatnonzero(self.contracts["Root"].to_numpy() == root)
+        return slice(pos[0], pos[-1] + 1) if len(pos) else slice(0, 0)
+
+    @property
+    def roots(self) -> List[str]:
+        return list(dict.fromkeys(self.contracts["Root"]))
+
+
+def parse_contracts(codes: pd.Series) -> pd.DataFrame:
+    """Kody kontraktów -> Root i Delivery (pierwszy dzień miesiąca dostawy)."""
+    parts = codes.str.upper().str.split(".").str[0].str.extract(_CODE_PATTERN)
+    year = pd.to_numeric(parts["Year"])
+    year = year.where(year >= 100, 2000 + year)  # CLZ20 -> 2020
+    month = parts["Month"].map({c: i + 1 for i, c in enumerate(MONTH_CODES)})
+    delivery = pd.to_datetime(
+        pd.DataFrame({"year": year, "month": month, "day": 1}), errors="coerce"
+    )
+    return pd.DataFrame({"Root": parts["Root"], "Delivery": delivery}, index=codes.index)
+
+
+def read_contracts(directory: Union[str, Path] = FUTURES_DIR) -> pd.DataFrame:
+    """Wszystkie pliki kontraktów jako jedna ramka długa (Date, Contract, Close, Volume, Expiry)."""
+    frames = []
+    for path in sorted(Path(directory).glob("*.csv")):
+        df = pd.read_csv(path)
+        df = df.rename(columns={"Settle": "Close"})
+        if "Contract" not in df:
+            df["Contract"] = path.stem
+        for col in ("Volume", "Expiry"):
+            if col not in df:
+                df[col] = np.nan
+        frames.append(df[["Date", "Contract", "Close", "Volume", "Expiry"]])
+    if not frames:
+        raise FileNotFoundError(f"Brak plików kontraktów (*.csv) w {directory}")
+
+    data = pd.concat(frames, ignore_index=True)
+    data["Date"] = pd.to_datetime(data["Date"])
+    data["Expiry"] = pd.to_datetime(data["Expiry"])
+    data["Contract"] = data["Contract"].astype(str).str.upper().str.split(".").str[0]
+    return data
+
+
+def contract_panel(data: pd.DataFrame) -> ContractPanel:
+    """Jedna tablica (daty x kontrakty) dla wszystkich korzeni — pivot przez indeksowanie."""
+    parsed = parse_contracts(data["Contract"])
+    known = parsed["Root"].notna() & parsed["Delivery"].notna()
+    if not known.all():
+        skipped = sorted(data.loc[~known, "Contract"].unique())
+        print(f"[futures] pomijam kody spoza CMDTY_TICKERS / nieczytelne: {skipped[:10]}")
+    data = pd.concat([data[known], parsed[known]], axis=1)
+
+    contracts = (
+        data.groupby("Contract", sort=False)
+        .agg(Root=("Root", "first"), Delivery=("Delivery", "first"), Expiry=("Expiry", "max"))
+        .reset_index()
+    )
+    order = {r: i for i, r in enumerate(CMDTY_TICKERS)}
+    contracts["_root"] = contracts["Root"].map(order)
+    contracts = (
+        contracts.sort_values(["_root", "Delivery"]).drop(columns="_root").reset_index(drop=True)
+    )
+
+    dates = pd.DatetimeIndex(np.sort(data["Date"].unique()), name="Date")
+    rows = dates.get_indexer(data["Date"])
+    cols = pd.Index(contracts["Contract"]).get_indexer(data["Contract"])
+    price = np.full((len(dates), len(contracts)), np.nan)
+    volume = np.full(price.shape, np.nan)
+    price[rows, cols] = data["Close"].to_numpy(dtype=float)
+    volume[rows, cols] = data["Volume"].to_numpy(dtype=float)
+    info = contracts[["Root", "Contract", "Delivery", "Expiry"]]
+    return ContractPanel(dates, info, price, volume)
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    """Forward fill wzdłuż dat (T, K) bez pętli po kolumnach."""
+    idx = np.where(~np.isnan(values), np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return values[idx, np.arange(values.shape[1])]
+
+
+def roll_schedule(
+    cube: ContractPanel,
+    root: str,
+    rule: str = "calendar",
+    roll_days: int = ROLL_DAYS,
+) -> np.ndarray:
+    """Pozycja (w kolumnach korzenia) trzymanego kontraktu dla każdej daty; -1 = brak."""
+    if rule not in ROLL_RULES:
+        raise ValueError(f"Nieznana reguła rolowania: {rule!r}. Dostępne: {ROLL_RULES}")
+    info = cube.contracts.iloc[cube.columns(root)]
+    last = info["Expiry"].fillna(info["Delivery"]) - pd.Timedelta(days=roll_days)
+    roll_dates = np.maximum.accumulate(last.to_numpy(dtype="datetime64[ns]"))
+
+    # pierwszy kontrakt, którego data rolowania jest jeszcze przed nami
+    active = np.searchsorted(roll_dates, cube.dates.to_numpy(), side="right")
+    active = np.where(active < len(info), active, -1)
+
+    if rule == "volume":
+        vol = cube.volume[:, cube.columns(root)]
+        has = ~np.isnan(vol) & ~np.isnan(cube.price[:, cube.columns(root)])
+        by_volume = np.where(has.any(axis=1), np.where(has, vol, -np.inf).argmax(axis=1), -1)
+        by_volume = np.maximum.accumulate(by_volume)
+        # najpóźniej w dacie z reguły calendar
+        active = np.where(active >= 0, np.maximum(by_volume, active), -1)
+
+    # przed pierwszym notowaniem kontraktu nie ma czego trzymać
+    price = cube.price[:, cube.columns(root)]
+    listed = np.maximum.accumulate(~np.isnan(price), axis=0)
+    rows = np.arange(len(active))
+    ok = (active >= 0) & listed[rows, np.maximum(active, 0)]
+    return np.where(ok, active, -1)
+
+
+def continuous_series(
+    cube: ContractPanel,
+    root: str,
+    active: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """Serie ciągłe korzenia (T,) dla harmonogramu `active` z `roll_schedule`."""
+    cols = cube.columns(root)
+    price = _ffill(cube.price[:, cols])
+    n_t, n_k = price.shape
+    rows = np.arange(n_t)
+    held = active >= 0
+    a = np.maximum(active, 0)
+    a_prev = np.r_[a[:1], a[:-1]]
+    held_prev = np.r_[False, held[:-1]]
+
+    p_new = np.where(held, price[rows, a], np.nan)
+    p_old = np.where(held & held_prev, price[rows, a_prev], np.nan)
+    rolled = held & held_prev & (a != a_prev) & ~np.isnan(p_new) & ~np.isnan(p_old)
+
+    gap = np.where(rolled, p_new - p_old, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_ratio = np.where(rolled & (p_new > 0) & (p_old > 0), np.log(p_new / p_old), 0.0)
+    # korekta daty u = suma luk / ilorazów z rolowań po u
+    back = p_new + (gap.sum() - np.cumsum(gap))
+    ratio = p_new * np.exp(log_ratio.sum() - np.cumsum(log_ratio))
+
+    nxt = np.minimum(a + 1, n_k - 1)
+    delivery = (
+        cube.contracts["Delivery"].iloc[cols].to_numpy(dtype="datetime64[M]").astype(np.int64)
+    )
+    months = (delivery[nxt] - delivery[a]).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_next = price[rows, nxt]
+        roll_yield = np.where(
+            held & (a + 1 < n_k) & (p_new > 0) & (p_next > 0),
+            (np.log(p_new) - np.log(p_next)) * 12.0 / months,
+            np.nan,
+        )
+    return {"backadj": back, "ratioadj": ratio, "roll_yield": roll_yield}
+
+
+def build(
+    cube: ContractPanel,
+    rule: str = "calendar",
+    roll_days: int = ROLL_DAYS,
+) -> Dict[str, pd.DataFrame]:
+    """Ramki (daty x korzenie) dla każdego rodzaju z OUTPUT_KINDS."""
+    out: Dict[str, Dict[str, np.ndarray]] = {kind: {} for kind in OUTPUT_KINDS}
+    for root in cube.roots:
+        active = roll_schedule(cube, root, rule=rule, roll_days=roll_days)
+        series = continuous_series(cube, root, active)
+        for kind in ("backadj", "ratioadj", "roll_yield"):
+            out[kind][root] = series[kind]
+        codes = cube.contracts["Contract"].iloc[cube.columns(root)].to_numpy()
+        out["active"][root] = np.where(active >= 0, codes[np.maximum(active, 0)], None)
+
+    frames = {kind: pd.DataFrame(cols, index=cube.dates) for kind, cols in out.items()}
+    held = frames["active"].notna().any(axis=1)
+    return {kind: frame[held] for kind, frame in frames.items()}
+
+
+def monthly_log_returns(
+    prices: pd.DataFrame,
+    start: str = "2005-01-01",
+    end: str = "2025-01-01",
+) -> pd.DataFrame:
+    """Miesięczne log-zwroty jak w data_download_commodities (ceny <= 0 -> brak)."""
+    monthly = prices.resample(month_end_rule()).last()
+    monthly = monthly.where(monthly > 0)
+    rets = np.log(monthly).diff().dropna(how="all")
+    return rets.loc[start:end]
+
+
+def output_path(kind: str) -> Path:
+    return DATA_PROCESSED_DIR / f"commodities_continuous_{kind}.csv"
+
+
+def main(
+    directory: Union[str, Path] = FUTURES_DIR,
+    rule: str = "calendar",
+    roll_days: int = ROLL_DAYS,
+    as_inputs: bool = False,
+) -> None:
+    cube = contract_panel(read_contracts(directory))
+    frames = build(cube, rule=rule, roll_days=roll_days)
+    print(
+        f"[futures] {len(cube.contracts)} kontraktów, {len(cube.roots)} korzeni, "
+        f"{len(cube.dates)} dni; rolowanie: {rule} ({roll_days} dni)"
+    )
+
+    DATA_PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+    for kind, frame in frames.items():
+        frame.to_csv(output_path(kind))
+        print(f"[futures] {kind} -> {output_path(kind)}")
+
+    if as_inputs:
+        DATA_RAW.mkdir(parents=True, exist_ok=True)
+        prices = frames["ratioadj"]
+        raw_path = DATA_RAW / "commodities_daily_prices.csv"
+        prices.to_csv(raw_path)
+        rets = monthly_log_returns(prices)
+        ret_path = DATA_PROCESSED_DIR / "commodities_monthly_returns.csv"
+        rets.to_csv(ret_path)
+        print(f"[futures] wejścia pipeline'u: {raw_path}, {ret_path} {rets.shape}")
+
+
+if __name__ == "__main__":
+    main()
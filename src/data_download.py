@@ -2,7 +2,9 @@ from pathlib import Path
 from typing import Dict
 
 import pandas as pd
-import yfinance as yf
+
+from src.asset_classes import EQUITY_TICKERS
+from src.frequency import month_end_rule
 
 
 # -----------------------------------
@@ -12,24 +14,6 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_RAW_DIR = PROJECT_ROOT / "data" / "raw"
 DATA_PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
 
-DATA_RAW_DIR.mkdir(parents=True, exist_ok=True)
-DATA_PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-
-
-# -----------------------------------
-# Equity index tickers (Europe)
-# -----------------------------------
-EQUITY_TICKERS: Dict[str, str] = {
-    "DE": "^GDAXI",      # DAX
-    "FR": "^FCHI",       # CAC40
-    "IT": "FTSEMIB.MI",  # FTSE MIB
-    "ES": "^IBEX",       # IBEX 35
-    "NL": "^AEX",        # AEX
-    "CH": "^SSMI",       # Swiss Market Index
-    "UK": "^FTSE",       # FTSE 100
-
-}
-
 
 # -----------------------------------
 # Helpers
@@ -48,6 +32,9 @@ def download_prices_panel(
     if not tickers:
         raise ValueError("Ticker dictionary is empty.")
 
+    # yfinance is imported lazily - the compute stages never need it
+    import yfinance as yf
+
     print(f"Downloading EQUITY data for {len(tickers)} tickers from yfinance...")
     yf_data = yf.download(
         list(tickers.values()),
@@ -80,12 +67,15 @@ def compute_monthly_returns(prices: pd.DataFrame) -> pd.DataFrame:
     Monthly returns using end-of-month prices:
       R_t = P_t / P_{t-1} - 1
     """
-    monthly_last = prices.resample("M").last()
+    monthly_last = prices.resample(month_end_rule()).last()
     monthly_ret = monthly_last.pct_change().dropna(how="all")
     return monthly_ret
 
 
 def main(start: str = "2005-01-01", end: str = "2025-01-01") -> None:
+    DATA_RAW_DIR.mkdir(parents=True, exist_ok=True)
+    DATA_PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+
     # 1) Download daily prices
     equity_daily = download_prices_panel(EQUITY_TICKERS, start=start, end=end, interval="1d")
 
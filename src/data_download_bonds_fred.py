@@ -1,8 +1,10 @@
 from pathlib import Path
-from fredapi import Fred
 import pandas as pd
 import os
 
+from src.asset_classes import BOND_TICKERS, SAMPLE_PERIOD
+from src.frequency import month_end_rule
+
 # -----------------------------------------
 # Ścieżki projektu
 # -----------------------------------------
@@ -10,45 +12,36 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_RAW = PROJECT_ROOT / "data" / "raw"
 DATA_PROCESSED = PROJECT_ROOT / "data" / "processed"
 
-DATA_RAW.mkdir(parents=True, exist_ok=True)
-DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
 
-# -----------------------------------------
-# FRED: 10Y gov bond yields (Europa + UK, PL, Nordics)
-# -----------------------------------------
-BOND_TICKERS = {
-    "DE": "IRLTLT01DEM156N",
-    "FR": "IRLTLT01FRM156N",
-    "IT": "IRLTLT01ITM156N",
-    "ES": "IRLTLT01ESM156N",
-    "NL": "IRLTLT01NLM156N",
-    "CH": "IRLTLT01CHM156N",
-    "UK": "IRLTLT01GBM156N",
-    "PL": "IRLTLT01PLM156N",
-    "SE": "IRLTLT01SEM156N",
-    "NO": "IRLTLT01NOM156N",
-    "BE": "IRLTLT01BEM156N",
-    "AT": "IRLTLT01ATM156N",
-    "PT": "IRLTLT01PTM156N",
-    "DK": "IRLTLT01DKM156N",
-    "FI": "IRLTLT01FIM156N",
-    "IE": "IRLTLT01IEM156N",
-}
-
-
-def main():
+def main(
+    start: str = SAMPLE_PERIOD[0],
+    end: str = SAMPLE_PERIOD[1],
+    record_vintage: bool = True,
+):
     api_key = os.getenv("FRED_API_KEY")
     if api_key is None:
         raise ValueError("Brak zmiennej środowiskowej FRED_API_KEY")
 
+    # fredapi importujemy leniwie - potrzebny tylko przy pobieraniu
+    from fredapi import Fred
+
+    DATA_RAW.mkdir(parents=True, exist_ok=True)
+    DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
+
     fred = Fred(api_key=api_key)
 
+    # okno dat idzie do API (observation_start/end) — nie pobieramy całej
+    # historii; miesiąc wcześniej, żeby pierwsza zmiana w oknie miała poprzednika
+    fetch_start = (pd.Timestamp(start) - pd.DateOffset(months=1)).replace(day=1)
+
     df_list = []
-    print("\nPobieram dane 10Y obligacji z FRED...\n")
+    print(f"\nPobieram dane 10Y obligacji z FRED ({fetch_start.date()} – {end})...\n")
 
     for country, code in BOND_TICKERS.items():
         try:
-            s = fred.get_series(code)
+            s = fred.get_series(
+                code, observation_start=fetch_start.strftime("%Y-%m-%d"), observation_end=end
+            )
             s = s.rename(country)
             df_list.append(s)
             print(f"✔ Pobrano: {country}")
@@ -62,18 +55,26 @@ def main():
     # FRED podaje rentowności w %, zamieniamy na ułamki (np. 2.5% -> 0.025)
     yields = yields / 100.0
 
-    # Zapis surowych rentowności (pełna historia)
+    # Zapis surowych rentowności (pobrane okno)
     raw_path = DATA_RAW / "bond_yields_fred.csv"
     yields.to_csv(raw_path)
     print(f"\nZapisano dane surowe → {raw_path}")
 
+    # Snapshot do archiwum wersji (zapisywane są tylko nowe / zrewidowane wartości)
+    if record_vintage:
+        from src.vintages import VintageStore
+
+        with VintageStore() as store:
+            n = store.record(yields)
+        print(f"Archiwum wersji: {n} nowych / zrewidowanych wartości → {store.path}")
+
     # Miesięczne zmiany rentowności
-    monthly = yields.resample("M").last()
+    monthly = yields.resample(month_end_rule()).last()
     dy = monthly.diff()
     ret = -dy.dropna(how="all")  # przybliżenie zwrotu obligacji: r ≈ -Δy
 
     # Przycinamy okres do 2005–2025, żeby było spójne z FX i equity
-    ret = ret.loc["2005-01-01":"2025-01-01"]
+    ret = ret.loc[start:end]
 
     ret_path = DATA_PROCESSED / "bond_monthly_returns.csv"
     ret.to_csv(ret_path)
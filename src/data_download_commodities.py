@@ -1,29 +1,22 @@
 from pathlib import Path
+import numpy as np
 import pandas as pd
-import yfinance as yf
+
+from src.asset_classes import CMDTY_TICKERS
+from src.frequency import month_end_rule
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_RAW = PROJECT_ROOT / "data" / "raw"
 DATA_PROCESSED = PROJECT_ROOT / "data" / "processed"
 
-DATA_RAW.mkdir(parents=True, exist_ok=True)
-DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
 
-CMDTY_TICKERS = {
-    "CL": "CL=F",   # WTI Crude
-    "BZ": "BZ=F",   # Brent
-    "NG": "NG=F",   # Nat Gas
-    "GC": "GC=F",   # Gold
-    "SI": "SI=F",   # Silver
-    "HG": "HG=F",   # Copper
-    "ZC": "ZC=F",   # Corn
-    "ZW": "ZW=F",   # Wheat
-    "ZS": "ZS=F",   # Soybeans
-    "SB": "SB=F",   # Sugar
-}
+def main(start: str = "2005-01-01", end: str = "2025-01-01") -> None:
+    # yfinance importujemy leniwie - etapy obliczeniowe go nie potrzebują
+    import yfinance as yf
 
+    DATA_RAW.mkdir(parents=True, exist_ok=True)
+    DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
 
-def main(start: str = "2005-01-01", end: str = "2025-01-01") -> None:
     print("Pobieram dane futures na surowce z Yahoo Finance...")
 
     tickers = list(CMDTY_TICKERS.values())
@@ -46,7 +39,7 @@ def main(start: str = "2005-01-01", end: str = "2025-01-01") -> None:
     print(f"Zapisano surowe ceny: {raw_path}")
 
     # Miesięczne zwroty logarytmiczne
-    monthly = prices.resample("M").last()
+    monthly = prices.resample(month_end_rule()).last()
     rets = monthly.pct_change().apply(lambda x: np.log1p(x)).dropna(how="all")
 
     # Przycinamy okres (dla spójności z resztą)
@@ -59,5 +52,4 @@ def main(start: str = "2005-01-01", end: str = "2025-01-01") -> None:
 
 
 if __name__ == "__main__":
-    import numpy as np
     main()
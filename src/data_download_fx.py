@@ -3,7 +3,9 @@ from typing import Dict
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
+
+from src.asset_classes import FX_TICKERS
+from src.frequency import month_end_rule
 
 
 # -----------------------------------
@@ -13,27 +15,6 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_RAW_DIR = PROJECT_ROOT / "data" / "raw"
 DATA_PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
 
-DATA_RAW_DIR.mkdir(parents=True, exist_ok=True)
-DATA_PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-
-
-# -----------------------------------
-# Universe FX
-# -----------------------------------
-# Uwaga: część tickerów warto potem przetestować jak wcześniej, ale ten zestaw
-# powinien działać w większości przypadków.
-FX_TICKERS: Dict[str, str] = {
-    "EUR": "EURUSD=X",  # euro / dolar
-    "GBP": "GBPUSD=X",  # funt / dolar
-    "CHF": "CHFUSD=X",  # frank / dolar
-    "NOK": "NOKUSD=X",  # korona norweska / dolar
-    "SEK": "SEKUSD=X",  # korona szwedzka / dolar
-    # CEE jako USD/PLN itd. (notacja 'PLN=X', 'CZK=X', 'HUF=X')
-    "PLN": "PLN=X",
-    "CZK": "CZK=X",
-    "HUF": "HUF=X",
-}
-
 
 # -----------------------------------
 # Funkcje pomocnicze
@@ -51,6 +32,9 @@ def download_fx_panel(
       kolumny = kody walut (EUR, GBP, ...),
       wartości = 'Adj Close'.
     """
+    # yfinance importujemy dopiero tutaj - etapy obliczeniowe go nie potrzebują
+    import yfinance as yf
+
     print(f"Pobieram FX dla {len(tickers)} par walutowych z yfinance...")
 
     yf_data = yf.download(
@@ -80,13 +64,16 @@ def compute_monthly_fx_returns(prices: pd.DataFrame) -> pd.DataFrame:
       r_t = ln(S_t) - ln(S_{t-1}),
     gdzie S_t to kurs na koniec miesiąca.
     """
-    monthly_last = prices.resample("M").last()
+    monthly_last = prices.resample(month_end_rule()).last()
     log_prices = np.log(monthly_last)
     monthly_ret = log_prices.diff().dropna(how="all")
     return monthly_ret
 
 
 def main():
+    DATA_RAW_DIR.mkdir(parents=True, exist_ok=True)
+    DATA_PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+
     fx_raw = download_fx_panel(FX_TICKERS, start="2005-01-01", end="2025-01-01")
 
     raw_path = DATA_RAW_DIR / "fx_daily_prices.csv"
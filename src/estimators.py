@@ -0,0 +1,68 @@
+"""
+Rejestr estymatorów rolling skośności — wybór w jednym miejscu dla
+wszystkich etapów, które produkują sygnał (skrypty skewness*, kostka
+w `src.panel`, CLI `--estimator`).
+
+    moment     — próbkowa skośność (domyślna, jak dotąd),
+    bowley     — kwartylowa (Q3 + Q1 - 2 Q2) / (Q3 - Q1),
+    kelly      — to samo na decylach 10/90,
+    pearson    — 3 * (średnia - mediana) / odch. std.,
+    medcouple  — Brys, Hubert, Struyf (2004),
+    coskew     — systematyczna: co-skewness z rynkiem równoważonym (MKT_EW),
+    idio       — idiosynkratyczna: skośność reszt z rolling regresji na rynek,
+    ewm        — momenty ważone wykładniczo; `window` = half-life (okresy).
+
+Estymatory pozycyjne są mniej wrażliwe na pojedyncze skrajne miesiące
+(2008 w equity, zerwanie kursu CHF w 2015 w FX). Dla coskew/idio rynkiem
+jest średnia z aktywów tego samego panelu (klasy aktywów), liczona
+w każdym miesiącu z dostępnych obserwacji. Dla ewm nie ma okna — cała
+historia z wagami zanikającymi o połowę co `window` okresów, liczona
+rekurencyjnie (`kernels.EwmMoments`), więc half-life przeglądamy tak samo
+jak długość okna (--window, kolumna window w data/results.sqlite).
+"""
+from functools import partial
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from src import kernels
+
+
+ESTIMATORS: Dict[str, Callable[..., np.ndarray]] = {
+    "moment": kernels.rolling_skew,
+    **{
+        name: partial(kernels.rolling_quantile_skew, estimator=name)
+        for name in kernels.QUANTILE_ESTIMATORS
+    },
+    **{
+        name: partial(kernels.rolling_market_skew, kind=name)
+        for name in kernels.MARKET_ESTIMATORS
+    },
+    "ewm": lambda values, window: kernels.ewm_skew(values, halflife=window),
+}
+
+
+def rolling_skewness(
+    values: np.ndarray,
+    window: int = 12,
+    estimator: str = "moment",
+) -> np.ndarray:
+    """Rolling skośność (..., T, N) wybranym estymatorem."""
+    try:
+        func = ESTIMATORS[estimator]
+    except KeyError:
+        raise ValueError(
+            f"Nieznany estymator skośności: {estimator!r}. Dostępne: {list(ESTIMATORS)}"
+        ) from None
+    return func(values, window=window)
+
+
+def skewness_frame(
+    returns: pd.DataFrame,
+    window: int = 12,
+    estimator: str = "moment",
+) -> pd.DataFrame:
+    """To samo dla DataFrame (index = daty, kolumny = aktywa)."""
+    skew_arr = rolling_skewness(returns.to_numpy(dtype=float), window=window, estimator=estimator)
+    return pd.DataFrame(skew_arr, index=returns.index, columns=returns.columns)
@@ -0,0 +1,148 @@
+"""
+Regresje Fama–MacBeth: stopy zwrotu aktywów na opóźnionej skośności
+(opcjonalnie z kontrolami), zamiast samego sortowania na dwie nogi.
+
+Krok 1: w każdym miesiącu t regresja przekrojowa
+
+    r_{i,t} = a_t + b_t · skew_{i,t-1} [+ c_t · r_{i,t-1}] [+ d_t · vol_{i,t-1}] + e_{i,t}
+
+— wszystkie miesiące i klasy jednym wsadowym rozwiązaniem układów
+normalnych na tensorze (klasa, data, aktywo, regresor)
+(`kernels.cross_section_ols`); aktywo wchodzi do regresji w miesiącu,
+w którym ma stopę zwrotu i wszystkie regresory.
+Krok 2: średnie serii współczynników z błędami Neweya–Westa
+(`kernels.newey_west_mean`).
+
+Kontrole (CONTROLS): "ret" — stopa zwrotu z t-1, "vol" — odchylenie
+standardowe z tego samego okna co skośność, do t-1.
+
+Wyniki: data/processed/analysis_<klasa>_fama_macbeth.csv (wiersz =
+współczynnik, plus średnia liczba aktywów i R^2) oraz
+analysis_<klasa>_fama_macbeth_slopes.csv (serie współczynników).
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src import kernels, panel
+from src.asset_classes import DATA_PROCESSED_DIR, AssetClassSpec, resolve
+from src.panel import CrossAssetPanel
+
+CONTROLS = {"ret": "Lagged Return", "vol": "Volatility"}
+VOL_WINDOW = 12
+
+
+def rolling_volatility(values: np.ndarray, window: int = VOL_WINDOW) -> np.ndarray:
+    """Odchylenie standardowe w pełnym oknie (..., T, N) — jak pandas rolling(window).std()."""
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    with kernels._warnings_ignored():
+        x = np.where(valid, values - np.nanmean(values, axis=-2, keepdims=True), 0.0)
+    full = kernels.rolling_sum(valid.astype(float), window) == window
+    s1 = kernels.rolling_sum(x, window)
+    s2 = kernels.rolling_sum(x * x, window)
+    var = np.maximum(s2 - s1 * s1 / window, 0.0) / (window - 1)
+    return np.where(full, np.sqrt(var), np.nan)
+
+
+def regressors(
+    rets: CrossAssetPanel,
+    skew: CrossAssetPanel,
+    controls: Sequence[str] = (),
+    vol_window: int = VOL_WINDOW,
+) -> Tuple[List[str], np.ndarray]:
+    """Nazwy i tensor regresorów (C, T, N, K), wszystkie znane na koniec t-1."""
+    unknown = set(controls) - set(CONTROLS)
+    if unknown:
+        raise ValueError(f"Nieznane kontrole: {sorted(unknown)}. Dostępne: {list(CONTROLS)}")
+
+    names = ["Skewness"]
+    columns = [kernels.lag(skew.values, 1)]
+    for control in controls:
+        names.append(CONTROLS[control])
+        if control == "ret":
+            columns.append(kernels.lag(rets.values, 1))
+        else:
+            columns.append(kernels.lag(rolling_volatility(rets.values, vol_window), 1))
+    return names, np.stack(columns, axis=-1)
+
+
+def fama_macbeth(
+    rets: CrossAssetPanel,
+    skew: CrossAssetPanel,
+    specs: Sequence[AssetClassSpec],
+    controls: Sequence[str] = (),
+    lags: Optional[int] = None,
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, pd.DataFrame]]:
+    """
+    Tabele (wiersz = współczynnik: średnia, błąd NW, t-stat, miesiące)
+    i serie współczynników per klasa. lags=None: reguła Neweya–Westa.
+    """
+    names, x = regressors(rets, skew, controls)
+    min_obs = np.array([s.min_assets for s in specs])
+    coef, nobs, r2 = kernels.cross_section_ols(rets.values, x, min_obs=min_obs)
+
+    columns = ["Intercept"] + names
+    # (C, T, K) -> (C, K, T): średnie po datach
+    stats = kernels.newey_west_mean(np.moveaxis(coef, -1, -2), lags=lags)
+
+    tables, slopes = {}, {}
+    for c, spec in enumerate(specs):
+        rows = rets.date_mask[c]
+        table = pd.DataFrame(
+            {
+                "Coefficient": stats["Mean"][c],
+                "NW Std Error": stats["NW Std Error"][c],
+                "t-statistic": stats["t-statistic"][c],
+                "Months": stats["Observations"][c],
+            },
+            index=pd.Index(columns, name="Variable"),
+        )
+        fitted = ~np.isnan(coef[c, :, 0])
+        extra = pd.DataFrame(
+            {
+                "Coefficient": [nobs[c][fitted].mean(), np.nanmean(r2[c][fitted])],
+                "NW Std Error": np.nan,
+                "t-statistic": np.nan,
+                "Months": [fitted.sum()] * 2,
+            },
+            index=["Avg Assets", "Avg R-squared"],
+        )
+        tables[spec.name] = pd.concat([table, extra])
+
+        series = pd.DataFrame(coef[c], index=rets.dates, columns=columns)
+        series["Assets"] = nobs[c]
+        series["R-squared"] = r2[c]
+        slopes[spec.name] = series[rows]
+    return tables, slopes
+
+
+def output_paths(spec: AssetClassSpec) -> Tuple[Path, Path]:
+    return (
+        DATA_PROCESSED_DIR / f"analysis_{spec.name}_fama_macbeth.csv",
+        DATA_PROCESSED_DIR / f"analysis_{spec.name}_fama_macbeth_slopes.csv",
+    )
+
+
+def main(
+    names: Optional[List[str]] = None,
+    controls: Sequence[str] = (),
+    lags: Optional[int] = None,
+) -> None:
+    specs = resolve(names)
+    rets, skew = panel.load_portfolio_inputs([s.name for s in specs])
+    tables, slopes = fama_macbeth(rets, skew, specs, controls=controls, lags=lags)
+
+    for spec in specs:
+        table_path, slopes_path = output_paths(spec)
+        table_path.parent.mkdir(parents=True, exist_ok=True)
+        tables[spec.name].to_csv(table_path)
+        slopes[spec.name].to_csv(slopes_path)
+        print(f"[{spec.name}] Fama–MacBeth -> {table_path}")
+        print(tables[spec.name].round(4))
+
+
+if __name__ == "__main__":
+    main()
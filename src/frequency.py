@@ -0,0 +1,60 @@
+"""
+Częstotliwości rebalansowania i czynniki annualizacji.
+
+    M — miesięcznie (domyślnie, jak dotąd),
+    W — tygodniowo (koniec tygodnia pon–niedz.),
+    D — dziennie (dni sesyjne).
+
+Pliki wynikowe trybu W/D mają sufiks częstotliwości
+(np. portfolio_fx_skewness_ls_W.csv), pliki miesięczne — bez zmian.
+Podobnie sygnał inny niż domyślny (12M, moment) dostaje znacznik
+(np. equity_skewness_12m_w24.csv, portfolio_fx_skewness_ls_w12_bowley.csv),
+więc nie nadpisuje plików kanonicznych. Moduł nie importuje nic ciężkiego.
+"""
+from pathlib import Path
+from typing import Dict
+
+
+PERIODS_PER_YEAR: Dict[str, int] = {"M": 12, "W": 52, "D": 252}
+
+
+def periods_per_year(freq: str = "M") -> int:
+    try:
+        return PERIODS_PER_YEAR[freq]
+    except KeyError:
+        raise ValueError(
+            f"Nieobsługiwana częstotliwość: {freq!r}. Dostępne: {list(PERIODS_PER_YEAR)}"
+        ) from None
+
+
+def freq_path(path: Path, freq: str = "M") -> Path:
+    """Ścieżka pliku dla danej częstotliwości (M = oryginalna nazwa)."""
+    periods_per_year(freq)
+    if freq == "M":
+        return path
+    return path.with_name(f"{path.stem}_{freq}{path.suffix}")
+
+
+def signal_tag(window: int = 12, estimator: str = "moment") -> str:
+    """Znacznik plików sygnału: "" dla 12M moment, np. "w24" albo "w12_bowley"."""
+    if window == 12 and estimator == "moment":
+        return ""
+    return f"w{window}" if estimator == "moment" else f"w{window}_{estimator}"
+
+
+def tagged_path(path: Path, tag: str = "") -> Path:
+    """Ścieżka pliku dla sygnału `tag` ("" = oryginalna nazwa)."""
+    if not tag:
+        return path
+    return path.with_name(f"{path.stem}_{tag}{path.suffix}")
+
+
+def month_end_rule() -> str:
+    """Reguła resample dla końca miesiąca: "ME" (pandas >= 2.2), wcześniej "M"."""
+    import pandas as pd
+
+    try:
+        pd.tseries.frequencies.to_offset("ME")
+    except ValueError:
+        return "M"
+    return "ME"
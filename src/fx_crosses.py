@@ -0,0 +1,123 @@
+"""
+Jednolita notacja kursów FX i pełna kostka kursów krzyżowych.
+
+FX_TICKERS mieszają notacje: EURUSD=X, CHFUSD=X, ... to XXX/USD (ile
+dolarów za jednostkę waluty), a PLN=X, CZK=X, HUF=X to USD/XXX (ile
+waluty za dolara). Log-zwroty drugiej grupy mają odwrotny znak (i skośność),
+więc przed porównaniem walut sprowadzamy wszystkie nogi do XXX/USD:
+
+    r_i = ln(S_i,t / S_i,t-1)      dla XXXUSD=X,
+    r_i = -ln(S_i,t / S_i,t-1)     dla XXX=X / USDXXX=X.
+
+Dolar dochodzi jako waluta o zerowym zwrocie, a kurs krzyżowy i/j (ile
+waluty j za jednostkę i) ma log-zwrot r_ij = r_i - r_j — cała kostka
+(T, K, K) to jedno odejmowanie z broadcastingiem, bez nowych pobrań.
+Kolumna j kostki to stopy zwrotu walut z perspektywy inwestora liczącego
+w walucie j (np. EUR, CHF), na których można puścić całą strategię:
+
+    python -m src fx-crosses --base EUR --run
+
+Pliki: data/processed/fx_monthly_returns_<BAZA>.csv, a z --run także
+portfolio_fx_<BAZA>_skewness_ls.csv i analysis_fx_<BAZA>_summary.csv
+(sygnał inny niż 12M moment — ze znacznikiem, np. ..._ls_w24.csv).
+"""
+from pathlib import Path
+from typing import List, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.asset_classes import FX_TICKERS, get_spec
+from src.frequency import tagged_path
+
+QUOTE_CURRENCY = "USD"
+
+
+def quote_signs(tickers: Mapping[str, str] = FX_TICKERS) -> pd.Series:
+    """+1 dla notacji XXX/USD (XXXUSD=X), -1 dla USD/XXX (XXX=X, USDXXX=X)."""
+    signs = {}
+    for ccy, ticker in tickers.items():
+        symbol = ticker.upper().removesuffix("=X")
+        if symbol == f"{ccy}{QUOTE_CURRENCY}":
+            signs[ccy] = 1.0
+        elif symbol in (ccy, f"{QUOTE_CURRENCY}{ccy}"):
+            signs[ccy] = -1.0
+        else:
+            raise ValueError(
+                f"Nie rozpoznaję notacji {ticker!r} dla {ccy} "
+                f"(oczekiwano {ccy}USD=X albo {ccy}=X)."
+            )
+    return pd.Series(signs)
+
+
+def normalize_returns(rets: pd.DataFrame, tickers: Mapping[str, str] = FX_TICKERS) -> pd.DataFrame:
+    """Log-zwroty wszystkich walut w notacji XXX/USD (wzrost = umocnienie waluty wobec dolara)."""
+    signs = quote_signs({c: t for c, t in tickers.items() if c in rets.columns})
+    return rets * signs.reindex(rets.columns).fillna(1.0)
+
+
+def cross_rate_cube(rets: pd.DataFrame) -> Tuple[np.ndarray, List[str]]:
+    """
+    Log-zwroty wszystkich kursów krzyżowych (T, K, K), K = waluty + USD:
+    cube[t, i, j] = r_i - r_j (kurs i/j). `rets` w notacji XXX/USD.
+    """
+    currencies = list(rets.columns) + [QUOTE_CURRENCY]
+    values = np.concatenate([rets.to_numpy(dtype=float), np.zeros((len(rets), 1))], axis=1)
+    return values[:, :, None] - values[:, None, :], currencies
+
+
+def perspective_returns(rets: pd.DataFrame, base: str) -> pd.DataFrame:
+    """Stopy zwrotu pozostałych walut (łącznie z USD) z perspektywy waluty `base`."""
+    cube, currencies = cross_rate_cube(rets)
+    if base not in currencies:
+        raise ValueError(f"Nieznana waluta bazowa: {base!r}. Dostępne: {currencies}")
+    j = currencies.index(base)
+    others = [k for k, c in enumerate(currencies) if c != base]
+    return pd.DataFrame(
+        cube[:, others, j], index=rets.index, columns=[currencies[k] for k in others]
+    )
+
+
+def output_paths(base: str) -> Tuple[Path, Path, Path]:
+    spec = get_spec("fx")
+    tag = base.upper()
+    return (
+        spec.returns_path.with_name(f"{spec.returns_path.stem}_{tag}.csv"),
+        spec.portfolio_path.with_name(spec.portfolio_path.name.replace("fx_", f"fx_{tag}_", 1)),
+        spec.summary_path.with_name(spec.summary_path.name.replace("fx_", f"fx_{tag}_", 1)),
+    )
+
+
+def main(
+    base: str = QUOTE_CURRENCY,
+    run: bool = False,
+    window: int = 12,
+    estimator: str = "moment",
+) -> None:
+    spec = get_spec("fx")
+    raw = pd.read_csv(spec.returns_path, index_col=0, parse_dates=True)
+    normalized = normalize_returns(raw)
+    flipped = [c for c, s in quote_signs({c: FX_TICKERS[c] for c in raw.columns}).items() if s < 0]
+    print(f"[fx] notacja XXX/USD (odwrócone: {', '.join(flipped) or 'brak'})")
+
+    base = base.upper()
+    rets = normalized if base == QUOTE_CURRENCY else perspective_returns(normalized, base)
+    ret_path, pf_path, summary_path = output_paths(base)
+    ret_path.parent.mkdir(parents=True, exist_ok=True)
+    rets.to_csv(ret_path)
+    print(f"[fx] stopy zwrotu z perspektywy {base} -> {ret_path} {rets.shape}")
+
+    if run:
+        from src.study import SkewnessStudy
+
+        study = SkewnessStudy("fx").returns({"fx": rets}).skewness(window, estimator).stats()
+        pf_path = tagged_path(pf_path, study.tag)
+        summary_path = tagged_path(summary_path, study.tag)
+        study.portfolios["fx"].to_csv(pf_path)
+        study.summary["fx"].to_csv(summary_path, index=False)
+        print(f"[fx] strategia w {base} -> {pf_path}, {summary_path}")
+        print(study.summary["fx"].round(4))
+
+
+if __name__ == "__main__":
+    main()
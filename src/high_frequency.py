@@ -0,0 +1,123 @@
+"""
+Tryb wysokiej częstotliwości: sygnał z dziennych stóp zwrotu (kroczące
+okno 252 dni) i rebalansowanie co tydzień (W) albo codziennie (D).
+
+Dzienne ceny pochodzą z data/raw/ (zapisują je skrypty data_download*);
+klasy bez dziennych cen (obligacje z FRED) są pomijane. Portfele i
+statystyki liczą te same funkcje co w trybie miesięcznym
+(`panel.skewness_portfolios`, `panel.portfolio_stats`) — zmienia się tylko
+częstotliwość osi dat i czynnik annualizacji. Wyniki trafiają do plików
+z sufiksem częstotliwości, np. portfolio_fx_skewness_ls_W.csv.
+
+Przy D wierszy jest ok. 20× więcej niż przy M, więc wszystko idzie przez
+wektorowe (i dzielone na bloki) jądra z `src.kernels`, bez pętli po datach.
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src import estimators, panel
+from src.asset_classes import AssetClassSpec, resolve
+from src.frequency import periods_per_year
+from src.realized_skewness import sample_period_end
+
+# ile dni sesyjnych bez notowania przenosimy ostatnią cenę (święta lokalne)
+FFILL_LIMIT = 5
+
+
+def read_daily_prices(spec: AssetClassSpec) -> pd.DataFrame:
+    """Dzienne ceny klasy na wspólnym kalendarzu, po przycięciu okresu."""
+    prices = panel.read_spec_frame(spec.daily_prices_path, spec).sort_index()
+    return prices.ffill(limit=FFILL_LIMIT)
+
+
+def period_returns(prices: pd.DataFrame, return_type: str = "simple") -> pd.DataFrame:
+    """Stopy zwrotu między kolejnymi wierszami: "simple" albo "log" (ceny <= 0 -> NaN)."""
+    values = prices.to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if return_type == "simple":
+            rets = values[1:] / values[:-1] - 1.0
+        elif return_type == "log":
+            log_p = np.where(values > 0, np.log(values), np.nan)
+            rets = log_p[1:] - log_p[:-1]
+        else:
+            raise ValueError(f"Tryb W/D nie obsługuje stóp typu {return_type!r}.")
+    return pd.DataFrame(rets, index=prices.index[1:], columns=prices.columns)
+
+
+def class_inputs(
+    spec: AssetClassSpec,
+    freq: str = "W",
+    window: int = 252,
+    estimator: str = "moment",
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Stopy zwrotu i sygnał jednej klasy na osi `freq`.
+    Sygnał: rolling skośność dziennych stóp zwrotu, próbkowana na koniec okresu.
+    """
+    prices = read_daily_prices(spec)
+    daily = period_returns(prices, spec.return_type)
+    skew = estimators.skewness_frame(daily, window=window, estimator=estimator)
+
+    if freq == "D":
+        rets = daily
+    else:
+        rets = period_returns(sample_period_end(prices, freq), spec.return_type)
+        skew = sample_period_end(skew, freq).loc[rets.index]
+
+    # filtr min_obs z trybu miesięcznego przeskalowany do liczby okresów
+    min_obs = spec.min_obs * periods_per_year(freq) // 12
+    good_cols = [c for c in rets.columns if rets[c].notna().sum() >= min_obs]
+    rets = rets[good_cols].dropna(how="all")
+    return rets, skew.loc[rets.index, good_cols]
+
+
+def load_inputs(
+    names: Optional[List[str]] = None,
+    freq: str = "W",
+    window: int = 252,
+    estimator: str = "moment",
+):
+    """Kostki (C, T, N) stóp zwrotu i sygnału dla klas z dziennymi cenami."""
+    specs = []
+    rets_frames, skew_frames = [], []
+    for spec in resolve(names):
+        path = spec.daily_prices_path
+        if path is None or not path.exists():
+            print(f"[{spec.name}] brak dziennych cen ({path}) — pomijam")
+            continue
+        rets, skew = class_inputs(spec, freq=freq, window=window, estimator=estimator)
+        specs.append(spec)
+        rets_frames.append(rets)
+        skew_frames.append(skew)
+
+    if not specs:
+        return specs, None, None
+    class_names = [s.name for s in specs]
+    rets_panel = panel.stack_frames(class_names, rets_frames)
+    skew_panel = rets_panel.like(panel.stack_frames(class_names, skew_frames).values)
+    return specs, rets_panel, skew_panel
+
+
+def main(
+    names: Optional[List[str]] = None,
+    freq: str = "W",
+    window: int = 252,
+    estimator: str = "moment",
+) -> None:
+    if freq not in ("W", "D"):
+        raise ValueError(f"Tryb wysokiej częstotliwości: freq 'W' albo 'D', nie {freq!r}.")
+
+    specs, rets, skew = load_inputs(names, freq=freq, window=window, estimator=estimator)
+    if not specs:
+        return
+
+    print(f"[{freq}] sygnał: {window}d {estimator}")
+    portfolios = panel.skewness_portfolios(rets, skew, specs)
+    panel.save_portfolios(portfolios, specs, freq=freq)
+    panel.save_summaries(panel.portfolio_stats(portfolios, freq=freq), specs, freq=freq)
+
+
+if __name__ == "__main__":
+    main()
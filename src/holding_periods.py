@@ -0,0 +1,131 @@
+"""
+Portfele nakładające się (Jegadeesh–Titman) i zanik sygnału skośności.
+
+Holding period H: co miesiąc formujemy nową kohortę Long–Short (to samo
+sortowanie co w etapie portfolio, sygnał z t-1), a w miesiącu t trzymamy
+po 1/H każdej z kohort uformowanych w t, t-1, ..., t-H+1. H=1 to zwykły
+portfel z portfolio_*_skewness_ls.csv.
+
+Zanik sygnału: zwrot LS w miesiącu t z kohorty uformowanej k-1 miesięcy
+wcześniej (lag k=1 to znowu zwykły portfel) — jak szybko informacja
+w skośności wygasa.
+
+Sortowanie robimy raz dla całej kostki (C, T, N); wszystkie horyzonty
+i opóźnienia liczone są z tych samych tablic wag — sumy w oknach H przez
+sumy skumulowane po datach (`kernels.holding_period_returns`), opóźnienia
+przez przesunięte indeksowanie (`kernels.lagged_weight_returns`).
+
+Wyniki: data/processed/analysis_<klasa>_holding_periods.csv (wiersz = H)
+i analysis_<klasa>_signal_decay.csv (wiersz = lag).
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src import kernels, panel
+from src.asset_classes import DATA_PROCESSED_DIR, AssetClassSpec, resolve
+from src.panel import CrossAssetPanel
+
+MAX_HORIZON = 24
+MAX_LAG = 12
+
+
+def cohort_weights(
+    rets: CrossAssetPanel,
+    skew: CrossAssetPanel,
+    specs: Sequence[AssetClassSpec],
+) -> np.ndarray:
+    """
+    Wagi kohort (2, C, T, N): [0] noga long, [1] noga short, wiersz t =
+    portfel uformowany na sygnale z t-1 — jak w `panel.skewness_portfolios`.
+    """
+    signal = kernels.lag(skew.values, 1)
+    min_assets = np.array([s.min_assets for s in specs])[:, None, None]
+    bottom, top = kernels.long_short_weights(signal, rets.values, min_assets=min_assets, direction="low")
+
+    high = np.array([s.direction == "high" for s in specs])[:, None, None]
+    return np.stack([np.where(high, top, bottom), np.where(high, bottom, top)])
+
+
+def _leg_stats(legs: np.ndarray) -> Dict[str, np.ndarray]:
+    """legs (2, C, K, T) -> statystyki LS (C, K)."""
+    return kernels.performance_stats(legs[0] - legs[1])
+
+
+def _tables(
+    stats: Dict[str, np.ndarray],
+    legs: np.ndarray,
+    specs: Sequence[AssetClassSpec],
+    index: pd.Index,
+) -> Dict[str, pd.DataFrame]:
+    out = {}
+    for c, spec in enumerate(specs):
+        table = pd.DataFrame({k: v[c] for k, v in stats.items()}, index=index)
+        table.insert(0, "Months", (~np.isnan(legs[0, c] - legs[1, c])).sum(axis=-1))
+        out[spec.name] = table
+    return out
+
+
+def holding_period_table(
+    rets: CrossAssetPanel,
+    skew: CrossAssetPanel,
+    specs: Sequence[AssetClassSpec],
+    max_horizon: int = MAX_HORIZON,
+    weights: Optional[np.ndarray] = None,
+) -> Dict[str, pd.DataFrame]:
+    """Statystyki portfeli LS dla H = 1..max_horizon (wiersz = H) per klasa."""
+    if weights is None:
+        weights = cohort_weights(rets, skew, specs)
+    horizons = np.arange(1, max_horizon + 1)
+    legs = kernels.holding_period_returns(weights, rets.values, horizons)
+    return _tables(_leg_stats(legs), legs, specs, pd.Index(horizons, name="Holding Period"))
+
+
+def signal_decay_table(
+    rets: CrossAssetPanel,
+    skew: CrossAssetPanel,
+    specs: Sequence[AssetClassSpec],
+    max_lag: int = MAX_LAG,
+    weights: Optional[np.ndarray] = None,
+) -> Dict[str, pd.DataFrame]:
+    """Statystyki LS z kohorty uformowanej k-1 miesięcy wcześniej, k = 1..max_lag."""
+    if weights is None:
+        weights = cohort_weights(rets, skew, specs)
+    lags = np.arange(1, max_lag + 1)
+    legs = kernels.lagged_weight_returns(weights, rets.values, lags)
+    return _tables(_leg_stats(legs), legs, specs, pd.Index(lags, name="Lag"))
+
+
+def output_paths(spec: AssetClassSpec) -> Tuple[Path, Path]:
+    return (
+        DATA_PROCESSED_DIR / f"analysis_{spec.name}_holding_periods.csv",
+        DATA_PROCESSED_DIR / f"analysis_{spec.name}_signal_decay.csv",
+    )
+
+
+def main(
+    names: Optional[List[str]] = None,
+    max_horizon: int = MAX_HORIZON,
+    max_lag: int = MAX_LAG,
+) -> None:
+    specs = resolve(names)
+    rets, skew = panel.load_portfolio_inputs([s.name for s in specs])
+
+    weights = cohort_weights(rets, skew, specs)
+    holding = holding_period_table(rets, skew, specs, max_horizon=max_horizon, weights=weights)
+    decay = signal_decay_table(rets, skew, specs, max_lag=max_lag, weights=weights)
+
+    for spec in specs:
+        hp_path, decay_path = output_paths(spec)
+        hp_path.parent.mkdir(parents=True, exist_ok=True)
+        holding[spec.name].to_csv(hp_path)
+        decay[spec.name].to_csv(decay_path)
+        print(f"[{spec.name}] holding periods 1..{max_horizon} -> {hp_path}")
+        print(f"[{spec.name}] zanik sygnału 1..{max_lag} -> {decay_path}")
+        print(holding[spec.name][["Annualized Mean", "Sharpe", "t-stat Mean"]].round(3))
+
+
+if __name__ == "__main__":
+    main()
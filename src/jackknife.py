@@ -0,0 +1,127 @@
+"""
+Odporność wyniku na pojedynczy rynek i pojedynczy rok (jackknife).
+
+Przy 7 indeksach akcji, 8 walutach, ~16 rynkach obligacji i 10 surowcach
+jeden rynek może ciągnąć cały wynik. Liczymy portfel Long–Short i jego
+statystyki:
+
+    bez jednego aktywa — sygnał wykluczonego aktywa maskowany (NaN) w osobnej
+                         partii; stos (C, N, T, N) sortowany jednym wywołaniem
+                         `kernels.long_short_returns` zamiast N przebiegów,
+    bez jednego roku   — portfel jest ten sam (sortowanie jest przekrojowe),
+                         maskujemy tylko miesiące roku w statystykach (C, Y, T).
+
+Wyniki: data/processed/analysis_<klasa>_jackknife_assets.csv i
+analysis_<klasa>_jackknife_years.csv (pierwszy wiersz "none" = pełna próba).
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src import kernels, panel
+from src.asset_classes import DATA_PROCESSED_DIR, AssetClassSpec, resolve
+from src.panel import CrossAssetPanel
+
+FULL_SAMPLE = "none"
+
+
+def _long_short(
+    signal: np.ndarray,
+    rets: np.ndarray,
+    specs: Sequence[AssetClassSpec],
+    lead: int,
+) -> np.ndarray:
+    """LongShort dla klas na osi 0 i `lead` dodatkowych osi partii przed (T, N)."""
+    min_assets = np.array([s.min_assets for s in specs]).reshape((-1,) + (1,) * (lead + 2))
+    bottom, top, _ = kernels.long_short_returns(signal, rets, min_assets=min_assets, direction="low")
+    high = np.array([s.direction == "high" for s in specs]).reshape((-1,) + (1,) * (lead + 1))
+    return np.where(high, top - bottom, bottom - top)
+
+
+def leave_one_asset_out(
+    rets: CrossAssetPanel,
+    skew: CrossAssetPanel,
+    specs: Sequence[AssetClassSpec],
+) -> Dict[str, pd.DataFrame]:
+    """Statystyki LS z każdym aktywem wykluczonym z sortowania (wiersz = aktywo)."""
+    signal = kernels.lag(skew.values, 1)
+    full = _long_short(signal, rets.values, specs, lead=0)                       # (C, T)
+    batched = _long_short(
+        kernels.leave_one_out(signal), rets.values[:, None], specs, lead=1
+    )                                                                            # (C, N, T)
+
+    ls = np.concatenate([full[:, None], batched], axis=1)
+    ls = np.where(rets.date_mask[:, None], ls, np.nan)
+    stats = kernels.performance_stats(ls)
+
+    out = {}
+    for c, spec in enumerate(specs):
+        rows = 1 + len(rets.assets[c])
+        out[spec.name] = pd.DataFrame(
+            {k: v[c, :rows] for k, v in stats.items()},
+            index=pd.Index([FULL_SAMPLE] + list(rets.assets[c]), name="Excluded"),
+        )
+    return out
+
+
+def leave_one_year_out(
+    rets: CrossAssetPanel,
+    skew: CrossAssetPanel,
+    specs: Sequence[AssetClassSpec],
+) -> Dict[str, pd.DataFrame]:
+    """Statystyki LS bez miesięcy jednego roku (wiersz = rok)."""
+    signal = kernels.lag(skew.values, 1)
+    ls = _long_short(signal, rets.values, specs, lead=0)
+    ls = np.where(rets.date_mask, ls, np.nan)                                    # (C, T)
+
+    years = np.unique(rets.dates.year)
+    drop = rets.dates.year.to_numpy()[None, :] == years[:, None]                 # (Y, T)
+    batched = np.where(drop, np.nan, ls[:, None, :])                             # (C, Y, T)
+    stats = kernels.performance_stats(np.concatenate([ls[:, None], batched], axis=1))
+
+    out = {}
+    for c, spec in enumerate(specs):
+        # tylko lata, w których klasa ma jakikolwiek zwrot portfela
+        has = np.r_[True, (drop & ~np.isnan(ls[c])).any(axis=1)]
+        out[spec.name] = pd.DataFrame(
+            {k: v[c][has] for k, v in stats.items()},
+            index=pd.Index([FULL_SAMPLE] + [str(y) for y in years[has[1:]]], name="Excluded"),
+        )
+    return out
+
+
+def output_paths(spec: AssetClassSpec) -> Tuple[Path, Path]:
+    return (
+        DATA_PROCESSED_DIR / f"analysis_{spec.name}_jackknife_assets.csv",
+        DATA_PROCESSED_DIR / f"analysis_{spec.name}_jackknife_years.csv",
+    )
+
+
+def main(names: Optional[List[str]] = None) -> None:
+    specs = resolve(names)
+    rets, skew = panel.load_portfolio_inputs([s.name for s in specs])
+
+    by_asset = leave_one_asset_out(rets, skew, specs)
+    by_year = leave_one_year_out(rets, skew, specs)
+
+    for spec in specs:
+        assets_path, years_path = output_paths(spec)
+        assets_path.parent.mkdir(parents=True, exist_ok=True)
+        by_asset[spec.name].to_csv(assets_path)
+        by_year[spec.name].to_csv(years_path)
+        print(f"[{spec.name}] jackknife aktywa -> {assets_path}")
+        print(f"[{spec.name}] jackknife lata -> {years_path}")
+
+        for label, table in (("aktywo", by_asset[spec.name]), ("rok", by_year[spec.name])):
+            sharpe = table["Sharpe"].drop(FULL_SAMPLE)
+            print(
+                f"    Sharpe bez jednego ({label}): {sharpe.min():.3f} ({sharpe.idxmin()})"
+                f" .. {sharpe.max():.3f} ({sharpe.idxmax()}),"
+                f" pełna próba {table.loc[FULL_SAMPLE, 'Sharpe']:.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,887 @@
+"""
+Jądra numeryczne wspólne dla wszystkich klas aktywów.
+
+Wszystkie funkcje działają na surowych tablicach NumPy o kształcie
+(..., T, N) — daty na przedostatniej osi, aktywa na ostatniej — więc tak
+samo obsługują pojedynczy panel (T, N), jak i kostkę (klasa, T, N).
+Brak danych = NaN.
+
+Jeśli zainstalowana jest numba, rolling skewness, sortowanie i drawdown
+idą przez skompilowane pętle z `src.kernels_numba` (równolegle po
+kolumnach). Bez numby — automatycznie czysty NumPy. Wybór można wymusić
+zmienną środowiskową SKEW_KERNELS=numpy|numba (domyślnie auto).
+Numbę ładujemy leniwie, przy pierwszym wywołaniu jądra.
+"""
+import math
+import os
+import warnings
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+BACKEND = os.environ.get("SKEW_KERNELS", "auto")
+
+# górny limit pamięci na tablice tymczasowe w ścieżkach NumPy (bajty)
+CHUNK_BYTES = 64 * 2 ** 20
+
+_numba_module = None
+
+
+def _numba():
+    """Moduł z jądrami numby albo None (brak numby / wymuszony NumPy)."""
+    global _numba_module
+    if BACKEND == "numpy":
+        return None
+    if _numba_module is None:
+        try:
+            from src import kernels_numba
+            _numba_module = kernels_numba
+        except ImportError:
+            if BACKEND == "numba":
+                raise
+            _numba_module = False
+    return _numba_module or None
+
+
+@contextmanager
+def _warnings_ignored() -> Iterator[None]:
+    """Wycisza RuntimeWarning z nanmean dla pustych wycinków (same NaN)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        yield
+
+
+def rolling_skew(values: np.ndarray, window: int = 12) -> np.ndarray:
+    """
+    Rolling skośność próbkowa (skorygowana, jak scipy.stats.skew(bias=False)).
+
+    Okno musi być pełne (min_periods = window, jak w pandas.rolling),
+    stała seria w oknie daje NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    nb = _numba()
+    if nb is not None and window >= 3:
+        flat = np.ascontiguousarray(values.reshape((-1,) + values.shape[-2:]))
+        return nb.rolling_skew_3d(flat, window).reshape(values.shape)
+
+    out = np.full(values.shape, np.nan)
+    n_dates = values.shape[-2]
+    if n_dates < window or window < 3:
+        return out
+
+    # okna (..., rows, N, w) liczymy blokami dat, żeby tablice tymczasowe
+    # nie przekraczały ~CHUNK_BYTES (ważne dla okien 252-dniowych)
+    per_row = max(1, values[..., 0, :].size * window * 8)
+    rows = max(1, CHUNK_BYTES // per_row)
+    for start in range(window - 1, n_dates, rows):
+        stop = min(start + rows, n_dates)
+        block = values[..., start - window + 1:stop, :]
+        out[..., start:stop, :] = _skew_of_windows(
+            sliding_window_view(block, window, axis=-2), window
+        )
+    return out
+
+
+def _skew_of_windows(win: np.ndarray, window: int) -> np.ndarray:
+    """Skośność skorygowana dla widoku okien (..., rows, N, w)."""
+    mean = win.mean(axis=-1, keepdims=True)
+    dev = win - mean
+    m2 = (dev ** 2).mean(axis=-1)
+    m3 = (dev ** 3).mean(axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g1 = m3 / m2 ** 1.5
+    # ten sam próg "zerowej wariancji" co w scipy
+    zero = m2 <= (np.finfo(float).eps * mean[..., 0]) ** 2
+    g1 = np.where(zero, np.nan, g1)
+
+    n = float(window)
+    return g1 * np.sqrt(n * (n - 1.0)) / (n - 2.0)
+
+
+def long_short_weights(
+    signal: np.ndarray,
+    rets: np.ndarray,
+    min_assets: Union[int, np.ndarray] = 4,
+    direction: str = "low",
+    groups: int = 2,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Wagi nogi long i short dla sortowania po sygnale (wiersz = data).
+
+    W każdym wierszu bierzemy aktywa z sygnałem i stopą zwrotu, dzielimy
+    je na połowy (k = n // 2) i dajemy 1/k każdemu aktywu w nodze.
+    groups > 2: nogi to skrajne grupy (k = n // groups, np. 3 = tercyle).
+    direction="low": long = najniższy sygnał (equity, FX, surowce),
+    direction="high": long = najwyższy sygnał (obligacje).
+    Wiersze z mniej niż `min_assets` aktywami mają same zera
+    (`min_assets` może być tablicą, np. (C, 1, 1) — osobno dla każdej klasy).
+    """
+    if direction not in ("low", "high"):
+        raise ValueError(f"Nieznany kierunek: {direction!r} (oczekiwano 'low' albo 'high').")
+    if groups < 2:
+        raise ValueError(f"groups musi być >= 2, nie {groups!r}.")
+
+    signal = np.asarray(signal, dtype=float)
+    rets = np.asarray(rets, dtype=float)
+
+    nb = _numba()
+    if nb is not None:
+        shape = np.broadcast_shapes(signal.shape, rets.shape)
+        n_assets = shape[-1]
+        rows = np.broadcast_to(np.asarray(min_assets), shape[:-1] + (1,))
+        w_long, w_short = nb.long_short_weights_2d(
+            np.ascontiguousarray(np.broadcast_to(signal, shape).reshape(-1, n_assets)),
+            np.ascontiguousarray(np.broadcast_to(rets, shape).reshape(-1, n_assets)),
+            np.ascontiguousarray(rows.reshape(-1), dtype=np.int64),
+            direction == "low",
+            groups,
+        )
+        return w_long.reshape(shape), w_short.reshape(shape)
+
+    valid = ~np.isnan(signal) & ~np.isnan(rets)
+    n = valid.sum(axis=-1, keepdims=True)
+    k = n // groups
+
+    # nieważne aktywa lądują na końcu sortowania
+    keyed = np.where(valid, signal, np.inf)
+    order = np.argsort(keyed, axis=-1, kind="stable")
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.arange(order.shape[-1]), axis=-1)
+
+    bottom = rank < k
+    top = (rank >= n - k) & (rank < n)
+
+    use = (n >= min_assets) & (k > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = np.where(use, 1.0 / k, 0.0)
+
+    if direction == "low":
+        long_sel, short_sel = bottom, top
+    else:
+        long_sel, short_sel = top, bottom
+
+    return long_sel * w, short_sel * w
+
+
+def long_short_returns(
+    signal: np.ndarray,
+    rets: np.ndarray,
+    min_assets: Union[int, np.ndarray] = 4,
+    direction: str = "low",
+    contributions: Optional[np.ndarray] = None,
+    groups: int = 2,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Zwroty Long, Short i LongShort (kształt (..., T)).
+
+    Sygnał NIE jest tu opóźniany — wołający podaje już sygnał z t-1.
+    Wiersze pominięte (za mało aktywów) mają NaN.
+    contributions: opcjonalna tablica (2, ..., T, N) wypełniana po drodze
+    wkładami aktywów waga × stopa zwrotu ([0] noga long, [1] short);
+    aktywa spoza nogi i wiersze pominięte mają NaN, więc nansum po
+    aktywach daje zwrot nogi, a notna — przynależność do nogi.
+    groups: liczba grup sortowania (jak w `long_short_weights`).
+    """
+    shape = np.broadcast_shapes(np.shape(signal), np.shape(rets))
+    signal = np.broadcast_to(np.asarray(signal, dtype=float), shape)
+    rets = np.broadcast_to(np.asarray(rets, dtype=float), shape)
+    min_assets = np.broadcast_to(np.asarray(min_assets), shape[:-1] + (1,))
+
+    long_ret = np.full(shape[:-1], np.nan)
+    short_ret = np.full(shape[:-1], np.nan)
+
+    # wiersze (daty) są niezależne — przy dużych panelach liczymy blokami
+    per_row = max(1, int(np.prod(shape[:-2] + shape[-1:])) * 8 * 8)
+    rows = max(1, CHUNK_BYTES // per_row)
+    for start in range(0, shape[-2], rows):
+        sl = (Ellipsis, slice(start, start + rows), slice(None))
+        w_long, w_short = long_short_weights(
+            signal[sl], rets[sl], min_assets[sl], direction, groups
+        )
+        r = np.nan_to_num(rets[sl])
+        used = w_long.any(axis=-1)
+        long_ret[sl[:-1]] = np.where(used, (w_long * r).sum(axis=-1), np.nan)
+        short_ret[sl[:-1]] = np.where(used, (w_short * r).sum(axis=-1), np.nan)
+        if contributions is not None:
+            contributions[(0,) + sl] = np.where(w_long > 0, w_long * r, np.nan)
+            contributions[(1,) + sl] = np.where(w_short > 0, w_short * r, np.nan)
+
+    return long_ret, short_ret, long_ret - short_ret
+
+
+def leave_one_out(values: np.ndarray) -> np.ndarray:
+    """
+    Stos masek "bez jednego aktywa": (..., T, N) -> (..., N, T, N), gdzie
+    w partii j kolumna j jest NaN. Sortowanie na takim stosie liczy
+    wszystkie warianty jackknife jednym wywołaniem.
+    """
+    values = np.asarray(values, dtype=float)
+    drop = np.eye(values.shape[-1], dtype=bool)[:, None, :]
+    return np.where(drop, np.nan, values[..., None, :, :])
+
+
+def holding_period_returns(
+    weights: np.ndarray,
+    rets: np.ndarray,
+    horizons: Sequence[int],
+) -> np.ndarray:
+    """
+    Portfele nakładające się (Jegadeesh–Titman): w dacie t trzymamy
+    średnią wag kohort uformowanych w t, t-1, ..., t-H+1 (kohorta z
+    wiersza t = wagi z `long_short_weights`, czyli H=1 to zwykły portfel).
+
+    Sumy wag w oknie H liczymy z jednej sumy skumulowanej po datach dla
+    wszystkich horyzontów naraz — sortowanie jest robione tylko raz.
+    weights, rets: (..., T, N) -> zwroty (..., len(horizons), T);
+    NaN, gdy nie ma wszystkich H kohort albo brak stóp zwrotu w dacie.
+    """
+    weights = np.asarray(weights, dtype=float)
+    rets = np.asarray(rets, dtype=float)
+    horizons = np.asarray(horizons, dtype=np.int64)
+    n_t = weights.shape[-2]
+
+    cum_w = np.cumsum(weights, axis=-2)
+    cum_w = np.concatenate([np.zeros_like(cum_w[..., :1, :]), cum_w], axis=-2)
+    cum_f = np.cumsum(weights.any(axis=-1), axis=-1)
+    cum_f = np.concatenate([np.zeros_like(cum_f[..., :1]), cum_f], axis=-1)
+
+    hi = np.arange(1, n_t + 1)
+    lo = hi[None, :] - horizons[:, None]             # (H, T)
+    full = lo >= 0
+    lo = np.maximum(lo, 0)
+
+    r = np.nan_to_num(rets)
+    # (S_t - S_{t-H}) · r_t = S_t · r_t - S_{t-H} · r_t
+    top = np.einsum("...tn,...tn->...t", cum_w[..., hi, :], r)
+    bottom = np.einsum("...htn,...tn->...ht", cum_w[..., lo, :], r)
+    n_cohorts = cum_f[..., hi][..., None, :] - cum_f[..., lo]
+
+    has_ret = ~np.isnan(rets).all(axis=-1)[..., None, :]
+    ok = full & (n_cohorts == horizons[:, None]) & has_ret
+    return np.where(ok, (top[..., None, :] - bottom) / horizons[:, None], np.nan)
+
+
+def lagged_weight_returns(
+    weights: np.ndarray,
+    rets: np.ndarray,
+    lags: Sequence[int],
+) -> np.ndarray:
+    """
+    Zanik sygnału: zwrot w t z wag uformowanych k-1 okresów wcześniej
+    (lag 1 = zwykły portfel, sygnał z t-1). Jedna tablica wag, przesunięta
+    indeksowaniem dla wszystkich opóźnień naraz.
+    weights, rets: (..., T, N) -> (..., len(lags), T).
+    """
+    weights = np.asarray(weights, dtype=float)
+    rets = np.asarray(rets, dtype=float)
+    lags = np.asarray(lags, dtype=np.int64)
+    n_t = weights.shape[-2]
+
+    src = np.arange(n_t)[None, :] - (lags[:, None] - 1)    # (K, T)
+    ok = src >= 0
+    src = np.maximum(src, 0)
+
+    out = np.einsum("...ktn,...tn->...kt", weights[..., src, :], np.nan_to_num(rets))
+    formed = weights.any(axis=-1)[..., src]
+    has_ret = ~np.isnan(rets).all(axis=-1)[..., None, :]
+    return np.where(ok & formed & has_ret, out, np.nan)
+
+
+def lag(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Odpowiednik DataFrame.shift(periods) wzdłuż osi dat (..., T, N)."""
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if periods == 0:
+        out[...] = values
+    elif periods > 0:
+        out[..., periods:, :] = values[..., :-periods, :]
+    else:
+        out[..., :periods, :] = values[..., -periods:, :]
+    return out
+
+
+def drawdowns(rets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Maksymalne obsunięcie skumulowanych zwrotów (1 + r).cumprod() oraz
+    najdłuższy okres (w liczbie obserwacji) pod poprzednim szczytem,
+    wzdłuż ostatniej osi. NaN = brak pozycji w danym okresie.
+    """
+    rets = np.asarray(rets, dtype=float)
+    if rets.shape[-1] == 0:
+        return np.full(rets.shape[:-1], np.nan), np.zeros(rets.shape[:-1], dtype=np.int64)
+
+    nb = _numba()
+    if nb is not None:
+        flat = np.ascontiguousarray(rets.reshape(-1, rets.shape[-1]))
+        mdd, duration = nb.drawdown_2d(flat)
+        return mdd.reshape(rets.shape[:-1]), duration.reshape(rets.shape[:-1])
+
+    cum = np.cumprod(1.0 + np.nan_to_num(rets), axis=-1)
+    # szczyt liczymy od pierwszej obserwacji — wiodące NaN (seria zaczyna
+    # się później niż kalendarz) nie tworzą sztucznego szczytu 1.0
+    started = np.logical_or.accumulate(~np.isnan(rets), axis=-1)
+    peak = np.maximum.accumulate(np.where(started, cum, 0.0), axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = np.where(started, (cum - peak) / peak, 0.0)
+
+    # długość serii "pod szczytem": pozycja minus ostatni moment na szczycie
+    pos = np.arange(rets.shape[-1])
+    last_peak = np.maximum.accumulate(np.where(cum < peak, -1, pos), axis=-1)
+    duration = np.where(cum < peak, pos - last_peak, 0).max(axis=-1)
+
+    return dd.min(axis=-1), duration
+
+
+def max_drawdown(rets: np.ndarray) -> np.ndarray:
+    """Maksymalne obsunięcie (patrz `drawdowns`); NaN dla serii bez obserwacji."""
+    rets = np.asarray(rets, dtype=float)
+    return np.where((~np.isnan(rets)).any(axis=-1), drawdowns(rets)[0], np.nan)
+
+
+STAT_NAMES = ("Annualized Mean", "Annualized Std", "Sharpe", "t-stat Mean", "Max Drawdown")
+
+
+def performance_stats(rets: np.ndarray, periods_per_year: int = 12) -> Dict[str, np.ndarray]:
+    """
+    Statystyki jak w analysis_*.py, liczone wzdłuż ostatniej osi z
+    pominięciem NaN: średnia i odchylenie annualizowane, Sharpe,
+    t-stat średniej oraz maksymalne obsunięcie.
+    """
+    rets = np.asarray(rets, dtype=float)
+    valid = ~np.isnan(rets)
+    n = valid.sum(axis=-1)
+    x = np.where(valid, rets, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = x.sum(axis=-1) / n
+        dev = np.where(valid, rets - mean[..., None], 0.0)
+        std = np.where(n > 1, np.sqrt((dev ** 2).sum(axis=-1) / (n - 1)), np.nan)
+
+        ann_mean = mean * periods_per_year
+        ann_std = std * np.sqrt(periods_per_year)
+        sharpe = np.where(ann_std != 0, ann_mean / ann_std, np.nan)
+        # ta sama definicja t-statystyki co w analysis_*.py
+        t_stat = np.where(std != 0, ann_mean / (std / np.sqrt(n)), np.nan)
+
+    return dict(zip(STAT_NAMES, (ann_mean, ann_std, sharpe, t_stat, max_drawdown(rets))))
+
+
+INTERVAL_STAT_NAMES = ("Observations",) + STAT_NAMES[:4]
+
+
+def interval_stats(
+    rets: np.ndarray,
+    starts: np.ndarray,
+    stops: np.ndarray,
+    periods_per_year: int = 12,
+) -> Dict[str, np.ndarray]:
+    """
+    Statystyki jak w `performance_stats` (bez obsunięcia) dla dowolnych
+    przedziałów [start, stop) po ostatniej osi: (..., T) -> (..., K).
+
+    Z sum skumulowanych zwrotów, kwadratów i liczby obserwacji — każdy
+    przedział kosztuje O(1) niezależnie od długości, więc tysiące
+    podokresów / okien kroczących i rozszerzających to jeden przebieg.
+    Przed sumowaniem odejmujemy średnią z całej serii (mniejsze znoszenie
+    się składników w wariancji z sumy kwadratów).
+    """
+    rets = np.asarray(rets, dtype=float)
+    starts = np.asarray(starts, dtype=np.int64)
+    stops = np.asarray(stops, dtype=np.int64)
+    valid = ~np.isnan(rets)
+
+    with _warnings_ignored():
+        center = np.nan_to_num(np.nanmean(rets, axis=-1, keepdims=True))
+    x = np.where(valid, rets - center, 0.0)
+
+    def prefix(a: np.ndarray) -> np.ndarray:
+        c = np.cumsum(a, axis=-1)
+        return np.concatenate([np.zeros_like(c[..., :1]), c], axis=-1)
+
+    p1, p2, pn = prefix(x), prefix(x * x), prefix(valid.astype(np.int64))
+    s1 = p1[..., stops] - p1[..., starts]
+    s2 = p2[..., stops] - p2[..., starts]
+    n = pn[..., stops] - pn[..., starts]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(n > 0, center + s1 / n, np.nan)
+        var = np.maximum(s2 - s1 * s1 / n, 0.0) / (n - 1)
+        std = np.where(n > 1, np.sqrt(var), np.nan)
+
+        ann_mean = mean * periods_per_year
+        ann_std = std * np.sqrt(periods_per_year)
+        sharpe = np.where(ann_std != 0, ann_mean / ann_std, np.nan)
+        # ta sama definicja t-statystyki co w analysis_*.py
+        t_stat = np.where(std != 0, ann_mean / (std / np.sqrt(n)), np.nan)
+
+    return dict(zip(INTERVAL_STAT_NAMES, (n, ann_mean, ann_std, sharpe, t_stat)))
+
+
+def cross_section_ols(
+    y: np.ndarray,
+    x: np.ndarray,
+    min_obs: Union[int, np.ndarray] = 0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Regresje przekrojowe y = a + x b dla każdej daty naraz (krok 1
+    Fama–MacBeth): y (..., T, N), x (..., T, N, K) -> współczynniki
+    (..., T, K + 1) [stała, b_1..b_K], liczba obserwacji (..., T) i R^2 (..., T).
+
+    Aktywo wchodzi do regresji w dacie t, gdy ma y i wszystkie regresory.
+    Macierze X'X i X'y wszystkich dat liczymy jednym einsum na tablicy
+    z wyzerowanymi brakami, a układy rozwiązujemy jednym wsadowym
+    `np.linalg.solve` — blokami dat, żeby tensor (..., dni, N, K + 1)
+    mieścił się w ~CHUNK_BYTES. NaN, gdy obserwacji jest mniej niż
+    max(min_obs, K + 2) albo regresory są współliniowe (min_obs: liczba
+    albo tablica o kształcie (...), np. osobno dla każdej klasy).
+    """
+    y = np.asarray(y, dtype=float)
+    x = np.asarray(x, dtype=float)
+    n_k = x.shape[-1] + 1
+    n_t = y.shape[-2]
+
+    coef = np.full(y.shape[:-1] + (n_k,), np.nan)
+    nobs = np.zeros(y.shape[:-1], dtype=np.int64)
+    r2 = np.full(y.shape[:-1], np.nan)
+
+    per_row = max(1, y[..., 0, :].size * n_k * 8 * 3)
+    rows = max(1, CHUNK_BYTES // per_row)
+    for start in range(0, n_t, rows):
+        sl = np.s_[..., start:min(start + rows, n_t), :]
+        yb, xb = y[sl], x[sl + (slice(None),)]
+        valid = ~np.isnan(yb) & ~np.isnan(xb).any(axis=-1)
+
+        design = np.concatenate([np.ones(xb.shape[:-1] + (1,)), xb], axis=-1)
+        design = np.where(valid[..., None], design, 0.0)
+        yv = np.where(valid, yb, 0.0)
+
+        xtx = np.einsum("...nk,...nl->...kl", design, design)
+        xty = np.einsum("...nk,...n->...k", design, yv)
+        n = valid.sum(axis=-1)
+
+        ok = n >= np.maximum(np.asarray(min_obs)[..., None], n_k + 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ok &= np.linalg.cond(np.where(ok[..., None, None], xtx, np.eye(n_k))) < 1e12
+        xtx = np.where(ok[..., None, None], xtx, np.eye(n_k))
+        b = np.linalg.solve(xtx, xty[..., None])[..., 0]
+
+        resid = np.where(valid, yv - np.einsum("...nk,...k->...n", design, b), 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            y_mean = yv.sum(axis=-1, keepdims=True) / n[..., None]
+            ss_tot = (np.where(valid, yv - y_mean, 0.0) ** 2).sum(axis=-1)
+            fit = 1.0 - (resid ** 2).sum(axis=-1) / ss_tot
+
+        coef[sl] = np.where(ok[..., None], b, np.nan)
+        nobs[..., start:start + rows] = n
+        r2[..., start:start + rows] = np.where(ok & (ss_tot > 0), fit, np.nan)
+    return coef, nobs, r2
+
+
+def newey_west_lags(n: np.ndarray) -> np.ndarray:
+    """Reguła Neweya–Westa (1994): floor(4 (n / 100)^(2/9))."""
+    return np.floor(4.0 * (np.asarray(n, dtype=float) / 100.0) ** (2.0 / 9.0)).astype(np.int64)
+
+
+def newey_west_mean(
+    series: np.ndarray,
+    lags: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Średnia serii wzdłuż ostatniej osi (..., T) z błędem standardowym
+    Neweya–Westa (wagi Bartletta) — krok 2 Fama–MacBeth. Braki pomijamy
+    (odchylenie = 0 w autokowariancjach, dzielimy przez liczbę obserwacji).
+    lags=None: `newey_west_lags` osobno dla każdej serii.
+    Zwraca "Mean", "NW Std Error", "t-statistic", "Observations", "Lags".
+    """
+    series = np.asarray(series, dtype=float)
+    valid = ~np.isnan(series)
+    n = valid.sum(axis=-1)
+    n_lags = newey_west_lags(n) if lags is None else np.full(n.shape, lags, dtype=np.int64)
+    max_lag = int(n_lags.max(initial=0))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(valid, series, 0.0).sum(axis=-1) / n
+        d = np.where(valid, series - mean[..., None], 0.0)
+        var = (d * d).sum(axis=-1) / n
+        for l in range(1, min(max_lag, series.shape[-1] - 1) + 1):
+            gamma = (d[..., l:] * d[..., :-l]).sum(axis=-1) / n
+            weight = np.where(l <= n_lags, 1.0 - l / (n_lags + 1.0), 0.0)
+            var = var + 2.0 * weight * gamma
+
+        se = np.where(n > 1, np.sqrt(np.maximum(var, 0.0) / n), np.nan)
+        t_stat = np.where(se > 0, mean / se, np.nan)
+    return {
+        "Mean": mean,
+        "NW Std Error": se,
+        "t-statistic": t_stat,
+        "Observations": n,
+        "Lags": n_lags,
+    }
+
+
+# -----------------------------------
+# Odporne estymatory skośności (statystyki pozycyjne)
+# -----------------------------------
+
+QUANTILE_ESTIMATORS = ("bowley", "kelly", "pearson", "medcouple")
+
+
+def _quantile_sorted(s: np.ndarray, p: float) -> np.ndarray:
+    """Kwantyl (interpolacja liniowa, jak np.quantile) z posortowanych wierszy."""
+    h = p * (s.shape[-1] - 1)
+    lo = int(np.floor(h))
+    hi = min(lo + 1, s.shape[-1] - 1)
+    return s[..., lo] + (s[..., hi] - s[..., lo]) * (h - lo)
+
+
+def _medcouple_sorted(s: np.ndarray) -> np.ndarray:
+    """Medcouple (Brys, Hubert, Struyf 2004) dla posortowanych wierszy (B, w)."""
+    w = s.shape[-1]
+    med = _quantile_sorted(s, 0.5)
+    z = s - med[:, None]
+
+    zi = z[:, :, None]  # "plus": z_i >= 0
+    zj = z[:, None, :]  # "minus": z_j <= 0
+    pair = (zi >= 0) & (zj <= 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = (zi + zj) / (zi - zj)
+
+    # remisy na medianie: znak zależy od pozycji w bloku zer
+    zero = z == 0
+    n_zero = zero.sum(axis=1)
+    first_zero = np.argmax(zero, axis=1)
+    pos = np.arange(w)
+    ii = (pos[None, :, None] - first_zero[:, None, None])
+    jj = (pos[None, None, :] - first_zero[:, None, None])
+    tie = zero[:, :, None] & zero[:, None, :]
+    h = np.where(tie, np.sign(n_zero[:, None, None] - 1 - ii - jj), h)
+
+    h = np.where(pair, h, np.nan)
+    return np.nanmedian(h.reshape(h.shape[0], -1), axis=1)
+
+
+def _order_skew_from_sorted(s: np.ndarray, estimator: str) -> np.ndarray:
+    """Estymator skośności z posortowanego okna (B, w)."""
+    if estimator == "bowley":
+        q1, q2, q3 = (_quantile_sorted(s, p) for p in (0.25, 0.5, 0.75))
+        num, den = q3 + q1 - 2.0 * q2, q3 - q1
+    elif estimator == "kelly":
+        q1, q2, q3 = (_quantile_sorted(s, p) for p in (0.10, 0.5, 0.90))
+        num, den = q3 + q1 - 2.0 * q2, q3 - q1
+    elif estimator == "pearson":
+        num = 3.0 * (s.mean(axis=-1) - _quantile_sorted(s, 0.5))
+        den = s.std(axis=-1, ddof=1)
+    else:
+        return _medcouple_sorted(s)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num / den, np.nan)
+
+
+def rolling_quantile_skew(
+    values: np.ndarray,
+    window: int = 12,
+    estimator: str = "bowley",
+) -> np.ndarray:
+    """
+    Odporna rolling skośność z przesuwanego, posortowanego okna.
+
+    estimator: "bowley" (kwartyle), "kelly" (decyle 10/90),
+               "pearson" (3 * (średnia - mediana) / odch. std.),
+               "medcouple".
+    Okno jest utrzymywane jako posortowany bufor, bez ponownego sortowania
+    w każdym kroku. Z Numbą: wyszukiwanie binarne wartości wychodzącej
+    i wchodzącej + przesunięcie odcinka bufora między nimi, w miejscu.
+    Bez Numby: wszystkie kolumny naraz, ale bufor (B, w) jest w każdym
+    kroku budowany od nowa (porównania i take_along_axis) — O(w) na
+    kolumnę i krok zamiast O(w log w) sortowania. Okno musi być pełne,
+    jak w `rolling_skew`.
+    """
+    if estimator not in QUANTILE_ESTIMATORS:
+        raise ValueError(f"Nieznany estymator: {estimator!r}. Dostępne: {QUANTILE_ESTIMATORS}")
+
+    values = np.asarray(values, dtype=float)
+    if values.shape[-2] < window or window < 3:
+        return np.full(values.shape, np.nan)
+
+    nb = _numba()
+    if nb is not None:
+        flat = np.ascontiguousarray(values.reshape((-1,) + values.shape[-2:]))
+        code = QUANTILE_ESTIMATORS.index(estimator)
+        return nb.rolling_order_skew_3d(flat, window, code).reshape(values.shape)
+
+    # NumPy: ten sam posortowany bufor, krok po kroku w czasie, wektorowo po
+    # kolumnach — przebudowa (B, w) w każdym kroku, bez wstawiania w miejscu
+    n_t = values.shape[-2]
+    cols = np.moveaxis(values, -2, 0).reshape(n_t, -1)  # (T, B)
+    keys = np.where(np.isnan(cols), np.inf, cols)
+    n_cols = cols.shape[1]
+    rows = np.arange(n_cols)
+    pos_w = np.arange(window)
+
+    out = np.full(cols.shape, np.nan)
+    buf = np.sort(keys[:window].T, axis=1)  # (B, w) — jedyne pełne sortowanie
+    n_nan = np.isnan(cols[:window]).sum(axis=0)
+
+    for t in range(window - 1, n_t):
+        if t >= window:
+            x_out, x_in = keys[t - window], keys[t]
+            # usunięcie: pozycja wychodzącej wartości
+            p_out = np.argmax(buf == x_out[:, None], axis=1)
+            take = pos_w[:-1] + (pos_w[:-1] >= p_out[:, None])
+            rest = np.take_along_axis(buf, take, axis=1)
+            # wstawienie: pozycja nowej wartości w pozostałych w - 1
+            p_in = (rest < x_in[:, None]).sum(axis=1)
+            src = pos_w - (pos_w > p_in[:, None])
+            buf = np.take_along_axis(rest, np.minimum(src, window - 2), axis=1)
+            buf[rows, p_in] = x_in
+            n_nan += np.isnan(cols[t]).astype(int) - np.isnan(cols[t - window]).astype(int)
+
+        full = n_nan == 0
+        if full.any():
+            out[t, full] = _order_skew_from_sorted(buf[full], estimator)
+
+    return np.moveaxis(out.reshape((n_t,) + values.shape[:-2] + values.shape[-1:]), 0, -2)
+
+
+# -----------------------------------
+# Skośność względem rynku (co-skewness, idiosynkratyczna)
+# -----------------------------------
+
+MARKET_ESTIMATORS = ("coskew", "idio")
+
+
+def rolling_sum(a: np.ndarray, window: int) -> np.ndarray:
+    """Suma w oknie wzdłuż osi dat (..., T, N) z sum skumulowanych."""
+    out = np.full(a.shape, np.nan)
+    if a.shape[-2] < window:
+        return out
+    c = np.cumsum(a, axis=-2)
+    out[..., window - 1, :] = c[..., window - 1, :]
+    out[..., window:, :] = c[..., window:, :] - c[..., :-window, :]
+    return out
+
+
+def rolling_corr(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Kroczące macierze korelacji kolumn x (T, K) -> (T, K, K). Wszystkie
+    pary naraz z sum w oknie na tablicy (T, K*K) — przesunięcie okna to
+    dodanie nowego wiersza i odjęcie najstarszego, bez liczenia korelacji
+    od zera. Para musi mieć pełne okno (jak pandas rolling(window).corr()),
+    inaczej NaN.
+    """
+    x = np.asarray(x, dtype=float)
+    n_t, n_k = x.shape
+    valid = ~np.isnan(x)
+    pair = (valid[:, :, None] & valid[:, None, :]).reshape(n_t, -1)
+    xi = np.where(pair, np.repeat(np.nan_to_num(x), n_k, axis=1), 0.0)
+    xj = np.where(pair, np.tile(np.nan_to_num(x), (1, n_k)), 0.0)
+
+    n = rolling_sum(pair.astype(float), window)
+    sx, sy = rolling_sum(xi, window), rolling_sum(xj, window)
+    sxx, syy = rolling_sum(xi * xi, window), rolling_sum(xj * xj, window)
+    sxy = rolling_sum(xi * xj, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sy / n
+        corr = cov / np.sqrt((sxx - sx ** 2 / n) * (syy - sy ** 2 / n))
+    corr = np.where(n == window, np.clip(corr, -1.0, 1.0), np.nan)
+    return corr.reshape(n_t, n_k, n_k)
+
+
+def leading_eigen(
+    mats: np.ndarray,
+    tol: float = 1e-12,
+    max_iter: int = 500,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Największa wartość własna i wektor własny dla ciągu macierzy
+    symetrycznych (T, K, K). Iteracja potęgowa startuje z wektora
+    z poprzedniej daty — kolejne okna różnią się o jeden wiersz, więc
+    zwykle wystarcza kilka kroków. Macierze z NaN -> NaN. Przesunięcie
+    o dolne ograniczenie Gerszgorina zapewnia dodatnie widmo (korelacje
+    z par niepełnych obserwacji nie muszą być PSD).
+    Wektor znormalizowany tak, by suma ładunków była dodatnia.
+    """
+    mats = np.asarray(mats, dtype=float)
+    n_t, n_k, _ = mats.shape
+    lam = np.full(n_t, np.nan)
+    vecs = np.full((n_t, n_k), np.nan)
+    eye = np.eye(n_k)
+    v = np.full(n_k, 1.0 / np.sqrt(n_k))
+
+    for t in range(n_t):
+        a = mats[t]
+        if np.isnan(a).any():
+            continue
+        off = np.abs(a).sum(axis=1) - np.abs(np.diag(a))
+        shift = max(0.0, -(np.diag(a) - off).min())
+        b = a + shift * eye
+
+        for _ in range(max_iter):
+            w = b @ v
+            norm = np.linalg.norm(w)
+            if norm == 0.0:
+                break
+            w /= norm
+            done = np.abs(w - v).max() < tol
+            v = w
+            if done:
+                break
+        if v.sum() < 0:
+            v = -v
+        lam[t] = v @ a @ v
+        vecs[t] = v
+    return lam, vecs
+
+
+def rolling_market_skew(
+    values: np.ndarray,
+    window: int = 12,
+    kind: str = "coskew",
+    market: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Rolling skośność względem rynku równoważonego (jak MKT_EW w
+    regression_equity.py — średnia z dostępnych aktywów w danym miesiącu).
+
+    kind="coskew": standaryzowana co-skewness (Harvey, Siddique 2000)
+                   E[e_i e_m^2] / (sqrt(E[e_i^2]) E[e_m^2]),
+    kind="idio":   skośność reszt z regresji r_i = a + b r_m w tym samym
+                   oknie (z tą samą korektą na obciążenie co `rolling_skew`).
+
+    Wszystko liczone z rolling sum iloczynów (x^a m^b) dla całego panelu
+    naraz — bez regresji w każdym oknie. Okno musi być pełne.
+    """
+    if kind not in MARKET_ESTIMATORS:
+        raise ValueError(f"Nieznany rodzaj: {kind!r}. Dostępne: {MARKET_ESTIMATORS}")
+
+    values = np.asarray(values, dtype=float)
+    with np.errstate(invalid="ignore"), _warnings_ignored():
+        if market is None:
+            market = np.nanmean(values, axis=-1)
+        market = np.asarray(market, dtype=float)[..., None]
+
+        # przesunięcie o średnią nie zmienia momentów centralnych,
+        # a ogranicza błędy zaokrągleń w sumach skumulowanych
+        x = values - np.nanmean(values, axis=-2, keepdims=True)
+        m = market - np.nanmean(market, axis=-2, keepdims=True)
+
+    valid = ~np.isnan(x) & ~np.isnan(m)
+    x = np.where(valid, x, 0.0)
+    m = np.where(valid, m, 0.0)
+
+    n = float(window)
+    full = rolling_sum(valid.astype(float), window) == n
+
+    def e(a: np.ndarray) -> np.ndarray:
+        return rolling_sum(a, window) / n
+
+    ex, em = e(x), e(m)
+    exx, emm, exm = e(x * x), e(m * m), e(x * m)
+    exxx, exxm, exmm, emmm = e(x ** 3), e(x * x * m), e(x * m * m), e(m ** 3)
+
+    # momenty centralne (populacyjne) w oknie
+    var_x = exx - ex ** 2
+    var_m = emm - em ** 2
+    cov = exm - ex * em
+    c_mmm = emmm - 3 * em * emm + 2 * em ** 3
+    c_xmm = exmm - 2 * em * exm - ex * emm + 2 * ex * em ** 2
+    c_xxm = exxm - 2 * ex * exm - em * exx + 2 * em * ex ** 2
+    c_xxx = exxx - 3 * ex * exx + 2 * ex ** 3
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = cov / var_m
+        e2 = var_x - beta * cov  # wariancja reszt
+        tiny = (np.finfo(float).eps * 1e3) * np.maximum(var_x, 0)
+        ok = full & (var_m > 0) & (e2 > tiny)
+
+        if kind == "coskew":
+            out = (c_xmm - beta * c_mmm) / (np.sqrt(e2) * var_m)
+        else:
+            e3 = c_xxx - 3 * beta * c_xxm + 3 * beta ** 2 * c_xmm - beta ** 3 * c_mmm
+            out = e3 / e2 ** 1.5 * np.sqrt(n * (n - 1.0)) / (n - 2.0)
+
+    return np.where(ok, out, np.nan)
+
+
+class EwmMoments:
+    """
+    Stan wykładniczo ważonych momentów (waga, średnia, M2, M3) dla wektora
+    aktywów — aktualizacja o jeden okres w O(N), bez przechowywania historii.
+
+    Waga obserwacji sprzed k okresów to 0.5 ** (k / halflife). Okres bez
+    obserwacji postarza stan (jak pandas `ewm(..., ignore_na=False)`),
+    ale go nie zmienia. Nowa obserwacja jest łączona ze stanem wzorami
+    dla sum ważonych (Pébay 2008) — na momentach centralnych, bez
+    odejmowania dużych sum surowych potęg.
+    """
+
+    def __init__(self, halflife: float, shape: Union[int, Tuple[int, ...]]):
+        if halflife <= 0:
+            raise ValueError(f"halflife musi być dodatni, nie {halflife!r}.")
+        self.decay = 0.5 ** (1.0 / halflife)
+        self.weight = np.zeros(shape)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.m3 = np.zeros(shape)
+        self.count = np.zeros(shape, dtype=np.int64)
+
+    def update(self, x: np.ndarray) -> None:
+        x = np.asarray(x, dtype=float)
+        seen = ~np.isnan(x)
+        self.weight *= self.decay
+        self.m2 *= self.decay
+        self.m3 *= self.decay
+
+        old_w, old_m2 = self.weight, self.m2
+        new_w = old_w + seen
+        delta = np.where(seen, x - self.mean, 0.0)
+        share = np.divide(delta, new_w, out=np.zeros_like(delta), where=new_w > 0)
+
+        # punkt o wadze 1 dołączony do zbioru o wadze old_w
+        self.m3 = self.m3 + delta * share * (old_w - 1.0) * old_w * share - 3.0 * share * old_m2
+        self.m2 = old_m2 + delta * share * old_w
+        self.mean = self.mean + share
+        self.weight = new_w
+        self.count += seen
+
+    def skew(self, min_periods: int = 3) -> np.ndarray:
+        """Skośność ważona (populacyjna) m3 / m2^1.5; NaN przed `min_periods` obserwacji."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = self.m2 / self.weight
+            out = (self.m3 / self.weight) / var ** 1.5
+        tiny = (np.finfo(float).eps * 1e3) * self.mean ** 2
+        ok = (self.count >= max(min_periods, 3)) & (var > tiny)
+        return np.where(ok, out, np.nan)
+
+
+def ewm_skew(
+    values: np.ndarray,
+    halflife: float = 6.0,
+    min_periods: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Skośność z wykładniczo ważonych momentów (połowiczny zanik wagi po
+    `halflife` okresach), jeden przebieg po datach dla całego panelu
+    (..., T, N) — pamięć O(N) niezależnie od długości historii.
+
+    Pierwsza wartość po `min_periods` obserwacjach aktywa (domyślnie
+    2 × halflife, czyli 12 miesięcy dla halflife = 6, jak okno `rolling_skew`).
+    Kolejny okres to jedno `EwmMoments.update` — tak można dokładać nowe
+    dane bez przeliczania historii.
+    """
+    values = np.asarray(values, dtype=float)
+    if min_periods is None:
+        min_periods = int(math.ceil(2 * halflife))
+
+    state = EwmMoments(halflife, values.shape[:-2] + values.shape[-1:])
+    out = np.empty(values.shape)
+    for t in range(values.shape[-2]):
+        state.update(values[..., t, :])
+        out[..., t, :] = state.skew(min_periods)
+    return out
@@ -0,0 +1,243 @@
+"""
+Wersje jąder z `src.kernels` kompilowane Numbą.
+
+Import tego modułu wymaga numby — `src.kernels` łapie ImportError i
+wtedy zostaje przy czystym NumPy. Pętle idą równolegle (prange) po
+kolumnach / wierszach i nie tworzą dużych tablic tymczasowych.
+"""
+import numpy as np
+from numba import njit, prange
+
+
+_EPS = np.finfo(np.float64).eps
+
+
+@njit(parallel=True, cache=True)
+def rolling_skew_3d(values, window):
+    """values: (B, T, N) -> rolling skośność (B, T, N), pełne okno."""
+    n_b, n_t, n_n = values.shape
+    out = np.full(values.shape, np.nan)
+    n = float(window)
+    corr = np.sqrt(n * (n - 1.0)) / (n - 2.0)
+
+    for col in prange(n_b * n_n):
+        b = col // n_n
+        j = col % n_n
+
+        # liczba NaN w bieżącym oknie — przesuwana w O(1)
+        n_nan = 0
+        for t in range(n_t):
+            if np.isnan(values[b, t, j]):
+                n_nan += 1
+            if t >= window and np.isnan(values[b, t - window, j]):
+                n_nan -= 1
+            if t < window - 1 or n_nan > 0:
+                continue
+
+            s = 0.0
+            for i in range(t - window + 1, t + 1):
+                s += values[b, i, j]
+            mean = s / n
+
+            m2 = 0.0
+            m3 = 0.0
+            for i in range(t - window + 1, t + 1):
+                d = values[b, i, j] - mean
+                m2 += d * d
+                m3 += d * d * d
+            m2 /= n
+            m3 /= n
+
+            if m2 <= (_EPS * mean) ** 2:
+                continue
+            out[b, t, j] = m3 / m2 ** 1.5 * corr
+    return out
+
+
+@njit(parallel=True, cache=True)
+def long_short_weights_2d(signal, rets, min_assets, long_low, groups=2):
+    """
+    signal, rets: (R, N), min_assets: (R,) -> wagi long i short (R, N).
+    Sortowanie tylko po ważnych aktywach danego wiersza, nogi = skrajne
+    grupy z `groups` (2 = połowy).
+    """
+    n_r, n_n = signal.shape
+    w_long = np.zeros((n_r, n_n))
+    w_short = np.zeros((n_r, n_n))
+
+    for r in prange(n_r):
+        idx = np.empty(n_n, dtype=np.int64)
+        n = 0
+        for j in range(n_n):
+            if not np.isnan(signal[r, j]) and not np.isnan(rets[r, j]):
+                idx[n] = j
+                n += 1
+
+        k = n // groups
+        if n < min_assets[r] or k == 0:
+            continue
+
+        idx = idx[:n]
+        order = idx[np.argsort(signal[r, idx], kind="mergesort")]
+        w = 1.0 / k
+        for i in range(k):
+            if long_low:
+                w_long[r, order[i]] = w
+                w_short[r, order[n - k + i]] = w
+            else:
+                w_short[r, order[i]] = w
+                w_long[r, order[n - k + i]] = w
+    return w_long, w_short
+
+
+@njit(parallel=True, cache=True)
+def drawdown_2d(rets):
+    """
+    rets: (R, T) -> (max drawdown, najdłuższy czas pod szczytem w okresach).
+    NaN = brak pozycji (kapitał bez zmian).
+    """
+    n_r, n_t = rets.shape
+    mdd = np.full(n_r, np.nan)
+    duration = np.zeros(n_r, dtype=np.int64)
+
+    for r in prange(n_r):
+        if n_t == 0:
+            continue
+        cum = 1.0
+        peak = 1.0
+        worst = 0.0
+        under = 0
+        longest = 0
+        first = True
+        for t in range(n_t):
+            x = rets[r, t]
+            if np.isnan(x) and first:
+                # wiodące NaN: szczyt liczymy od pierwszej obserwacji
+                continue
+            if not np.isnan(x):
+                cum *= 1.0 + x
+            if first or cum > peak:
+                peak = cum
+                first = False
+            dd = (cum - peak) / peak
+            if dd < worst:
+                worst = dd
+            if cum < peak:
+                under += 1
+                if under > longest:
+                    longest = under
+            else:
+                under = 0
+        mdd[r] = worst
+        duration[r] = longest
+    return mdd, duration
+
+
+@njit(cache=True)
+def _quantile_sorted(s, p):
+    h = p * (s.shape[0] - 1)
+    lo = int(np.floor(h))
+    hi = min(lo + 1, s.shape[0] - 1)
+    return s[lo] + (s[hi] - s[lo]) * (h - lo)
+
+
+@njit(cache=True)
+def _medcouple_sorted(s):
+    w = s.shape[0]
+    med = _quantile_sorted(s, 0.5)
+    first_zero = -1
+    n_zero = 0
+    for i in range(w):
+        if s[i] == med:
+            if first_zero < 0:
+                first_zero = i
+            n_zero += 1
+
+    h = np.empty(w * w)
+    m = 0
+    for i in range(w):
+        zi = s[i] - med
+        if zi < 0:
+            continue
+        for j in range(w):
+            zj = s[j] - med
+            if zj > 0:
+                continue
+            if zi == 0 and zj == 0:
+                h[m] = np.sign(n_zero - 1 - (i - first_zero) - (j - first_zero))
+            else:
+                h[m] = (zi + zj) / (zi - zj)
+            m += 1
+    return np.median(h[:m])
+
+
+@njit(cache=True)
+def _order_skew(s, code):
+    # kolejność kodów jak w kernels.QUANTILE_ESTIMATORS
+    if code == 0 or code == 1:
+        lo_p = 0.25 if code == 0 else 0.10
+        q1 = _quantile_sorted(s, lo_p)
+        q2 = _quantile_sorted(s, 0.5)
+        q3 = _quantile_sorted(s, 1.0 - lo_p)
+        den = q3 - q1
+        return (q3 + q1 - 2.0 * q2) / den if den > 0 else np.nan
+    if code == 2:
+        n = s.shape[0]
+        mean = s.mean()
+        ss = 0.0
+        for i in range(n):
+            ss += (s[i] - mean) ** 2
+        sd = np.sqrt(ss / (n - 1))
+        return 3.0 * (mean - _quantile_sorted(s, 0.5)) / sd if sd > 0 else np.nan
+    return _medcouple_sorted(s)
+
+
+@njit(parallel=True, cache=True)
+def rolling_order_skew_3d(values, window, code):
+    """
+    values: (B, T, N) -> odporna rolling skośność z posortowanego bufora.
+    Wyszukiwanie binarne O(log w) + przesunięcie bufora przy wstawieniu.
+    NaN trzymamy w buforze jako +inf (zawsze na końcu).
+    """
+    n_b, n_t, n_n = values.shape
+    out = np.full(values.shape, np.nan)
+
+    for col in prange(n_b * n_n):
+        b = col // n_n
+        j = col % n_n
+
+        buf = np.empty(window)
+        n_nan = 0
+        for i in range(window):
+            x = values[b, i, j]
+            buf[i] = np.inf if np.isnan(x) else x
+            if np.isnan(x):
+                n_nan += 1
+        buf.sort()
+
+        for t in range(window - 1, n_t):
+            if t >= window:
+                x_out = values[b, t - window, j]
+                x_in = values[b, t, j]
+                k_out = np.inf if np.isnan(x_out) else x_out
+                k_in = np.inf if np.isnan(x_in) else x_in
+                if np.isnan(x_out):
+                    n_nan -= 1
+                if np.isnan(x_in):
+                    n_nan += 1
+
+                p_out = np.searchsorted(buf, k_out)
+                p_in = np.searchsorted(buf, k_in)
+                # przesuwamy tylko odcinek między starą a nową pozycją
+                if p_in > p_out:
+                    p_in -= 1
+                    for i in range(p_out, p_in):
+                        buf[i] = buf[i + 1]
+                else:
+                    for i in range(p_out, p_in, -1):
+                        buf[i] = buf[i - 1]
+                buf[p_in] = k_in
+
+            if n_nan == 0:
+                out[b, t, j] = _order_skew(buf, code)
+    return out
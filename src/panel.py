@@ -0,0 +1,350 @@
+"""
+Wspólna kostka (klasa aktywów, data, aktywo) dla wszystkich klas naraz.
+
+Wszystkie klasy z rejestru (`src.asset_classes`) są wczytywane do jednej
+tablicy (C, T, N) na wspólnym kalendarzu miesięcznym, dopełnionej NaN do
+największej liczby aktywów. Rolling skewness, sortowania i statystyki
+liczą się jednym wywołaniem jądra z `src.kernels` dla całej kostki,
+a wyniki są zapisywane do tych samych plików co w skryptach per klasa.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src import attribution, estimators, kernels, storage
+from src.aligned import AlignedPanel
+from src.asset_classes import AssetClassSpec, resolve
+from src.frequency import freq_path, periods_per_year, signal_tag, tagged_path
+
+
+@dataclass
+class CrossAssetPanel:
+    """
+    values:     (C, T, N) — NaN tam, gdzie brak obserwacji albo dopełnienie,
+    asset_mask: (C, N)    — czy slot aktywa istnieje w danej klasie,
+    date_mask:  (C, T)    — czy data należy do kalendarza danej klasy.
+    """
+    names: List[str]
+    dates: pd.DatetimeIndex
+    assets: List[List[str]]
+    values: np.ndarray
+    asset_mask: np.ndarray
+    date_mask: np.ndarray
+
+    @property
+    def mask(self) -> np.ndarray:
+        """Pełna maska (C, T, N): slot istnieje i wartość jest obserwowana."""
+        return (
+            self.date_mask[:, :, None]
+            & self.asset_mask[:, None, :]
+            & ~np.isnan(self.values)
+        )
+
+    def index_of(self, name: str) -> int:
+        return self.names.index(name)
+
+    def like(self, values: np.ndarray) -> "CrossAssetPanel":
+        """Nowy panel na tych samych osiach (np. sygnał obok stóp zwrotu)."""
+        return CrossAssetPanel(
+            self.names, self.dates, self.assets, values, self.asset_mask, self.date_mask
+        )
+
+    def to_frame(self, name: Union[str, int], values: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Wycina jedną klasę jako DataFrame (bez dopełnienia)."""
+        c = name if isinstance(name, int) else self.index_of(name)
+        arr = self.values if values is None else values
+        n_assets = len(self.assets[c])
+        rows = self.date_mask[c]
+        return pd.DataFrame(
+            arr[c][rows, :n_assets],
+            index=pd.DatetimeIndex(self.dates[rows], name="Date"),
+            columns=self.assets[c],
+        )
+
+
+# -----------------------------------
+# Wczytywanie
+# -----------------------------------
+
+def clean_returns(rets: pd.DataFrame, spec: AssetClassSpec) -> pd.DataFrame:
+    """Sortowanie dat, przycięcie okresu i filtr min_obs ze specyfikacji."""
+    rets = rets.sort_index()
+    if spec.period is not None:
+        rets = rets.loc[spec.period[0]:spec.period[1]]
+    good_cols = [c for c in rets.columns if rets[c].notna().sum() >= spec.min_obs]
+    return rets[good_cols]
+
+
+def read_spec_frame(
+    path, spec: AssetClassSpec, assets: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """Plik klasy z okresem ze specyfikacji i podzbiorem aktywów czytanymi już przy odczycie."""
+    start, end = spec.period if spec.period is not None else (None, None)
+    return storage.read_frame(path, start, end, columns=assets)
+
+
+def read_returns(spec: AssetClassSpec, assets: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Miesięczne stopy zwrotu klasy, po przycięciu okresu i filtrze min_obs."""
+    return clean_returns(read_spec_frame(spec.returns_path, spec, assets), spec)
+
+
+def stack_frames(names: Sequence[str], frames: Sequence[pd.DataFrame]) -> CrossAssetPanel:
+    """Układa ramki (T_c, N_c) w kostkę (C, T, N) na wspólnym kalendarzu."""
+    dates = pd.DatetimeIndex(sorted(set().union(*[f.index for f in frames])))
+    n_max = max((f.shape[1] for f in frames), default=0)
+
+    values = np.full((len(frames), len(dates), n_max), np.nan)
+    asset_mask = np.zeros((len(frames), n_max), dtype=bool)
+    date_mask = np.zeros((len(frames), len(dates)), dtype=bool)
+
+    for c, f in enumerate(frames):
+        rows = dates.get_indexer(f.index)
+        values[c, rows, :f.shape[1]] = f.to_numpy(dtype=float)
+        asset_mask[c, :f.shape[1]] = True
+        date_mask[c, rows] = True
+
+    return CrossAssetPanel(
+        list(names), dates, [list(f.columns) for f in frames], values, asset_mask, date_mask
+    )
+
+
+def load_returns_panel(
+    names: Optional[List[str]] = None,
+    assets: Optional[Mapping[str, Sequence[str]]] = None,
+) -> CrossAssetPanel:
+    """assets: opcjonalnie {klasa: lista aktywów} — reszta kolumn nie jest parsowana."""
+    specs = resolve(names)
+    assets = assets or {}
+    return stack_frames(
+        [s.name for s in specs], [read_returns(s, assets.get(s.name)) for s in specs]
+    )
+
+
+def load_portfolio_inputs(
+    names: Optional[List[str]] = None,
+    assets: Optional[Mapping[str, Sequence[str]]] = None,
+    signal: str = "",
+):
+    """
+    Stopy zwrotu i skośność 12M dla wszystkich klas, wyrównane jak w
+    `portfolios*.load_data` (wspólne kraje i daty), na jednych osiach.
+    signal: znacznik pliku sygnału (`frequency.signal_tag`, np. "w24",
+    "realized"); "" = kanoniczny *_skewness_12m.csv.
+    """
+    specs = resolve(names)
+    assets = assets or {}
+    rets_frames, skew_frames = [], []
+    for spec in specs:
+        subset = assets.get(spec.name)
+        data = AlignedPanel.from_frames(
+            {
+                "returns": read_spec_frame(spec.returns_path, spec, subset),
+                "skew": read_spec_frame(tagged_path(spec.skew_path, signal), spec, subset),
+            },
+            period=spec.period,
+        )
+        rets_frames.append(data.frame("returns"))
+        skew_frames.append(data.frame("skew"))
+
+    names = [s.name for s in specs]
+    rets_panel = stack_frames(names, rets_frames)
+    skew_panel = rets_panel.like(stack_frames(names, skew_frames).values)
+    return rets_panel, skew_panel
+
+
+# -----------------------------------
+# Obliczenia na całej kostce
+# -----------------------------------
+
+def rolling_skewness(
+    panel: CrossAssetPanel,
+    window: int = 12,
+    estimator: str = "moment",
+) -> CrossAssetPanel:
+    return panel.like(estimators.rolling_skewness(panel.values, window=window, estimator=estimator))
+
+
+def skewness_portfolios(
+    rets: CrossAssetPanel,
+    skew: CrossAssetPanel,
+    specs: Sequence[AssetClassSpec],
+    workers: int = 1,
+    contributions: Optional[Dict[str, pd.DataFrame]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Portfele Long–Short dla wszystkich klas: sygnał z t-1 i jedno
+    sortowanie dla całej kostki. Kierunek (long low/high) i min_assets
+    brane ze specyfikacji — dla "high" nogi są po prostu zamienione.
+    workers > 1: wiersze kostki liczone na puli procesów (`src.parallel`).
+    contributions: jeśli podany słownik, trafiają do niego wkłady aktywów
+    (waga × stopa zwrotu) z tego samego sortowania — ramka na klasę,
+    kolumny (noga "Long"/"Short", aktywo), wiersze jak w portfelu,
+    NaN = aktywo poza nogą.
+    """
+    signal = kernels.lag(skew.values, 1)
+    min_assets = np.array([s.min_assets for s in specs])[:, None, None]
+    contrib = None if contributions is None else np.full((2,) + rets.values.shape, np.nan)
+    if workers > 1:
+        from src import parallel
+
+        bottom_ret, top_ret, _ = parallel.long_short_returns(
+            signal, rets.values, min_assets=min_assets, direction="low", processes=workers,
+            contributions=contrib,
+        )
+    else:
+        bottom_ret, top_ret, _ = kernels.long_short_returns(
+            signal, rets.values, min_assets=min_assets, direction="low", contributions=contrib
+        )
+
+    out: Dict[str, pd.DataFrame] = {}
+    for c, spec in enumerate(specs):
+        long_ret, short_ret = bottom_ret[c], top_ret[c]
+        legs = (0, 1)
+        if spec.direction == "high":
+            long_ret, short_ret = short_ret, long_ret
+            legs = (1, 0)
+
+        keep = rets.date_mask[c] & ~np.isnan(long_ret)
+        out[spec.name] = pd.DataFrame(
+            {
+                "Long": long_ret[keep],
+                "Short": short_ret[keep],
+                "LongShort": long_ret[keep] - short_ret[keep],
+            },
+            index=pd.DatetimeIndex(rets.dates[keep], name="Date"),
+        )
+        if contributions is not None:
+            n_assets = len(rets.assets[c])
+            contributions[spec.name] = pd.DataFrame(
+                np.concatenate([contrib[leg, c][keep, :n_assets] for leg in legs], axis=1),
+                index=out[spec.name].index,
+                columns=pd.MultiIndex.from_product([["Long", "Short"], rets.assets[c]]),
+            )
+    return out
+
+
+def portfolio_stats(
+    portfolios: Dict[str, pd.DataFrame],
+    freq: str = "M",
+    workers: int = 1,
+) -> Dict[str, pd.DataFrame]:
+    """Statystyki portfeli LS wszystkich klas jednym wywołaniem jądra."""
+    ls = pd.concat(
+        [pf["LongShort"].rename(name) for name, pf in portfolios.items()], axis=1, sort=True
+    )
+
+    # (C, T) — jedno wywołanie dla wszystkich klas
+    if workers > 1:
+        from src import parallel
+
+        stats = parallel.performance_stats(
+            ls.to_numpy().T, periods_per_year=periods_per_year(freq), processes=workers
+        )
+    else:
+        stats = kernels.performance_stats(ls.to_numpy().T, periods_per_year=periods_per_year(freq))
+    return {
+        name: pd.DataFrame({k: [v[c]] for k, v in stats.items()})
+        for c, name in enumerate(portfolios)
+    }
+
+
+# -----------------------------------
+# Zapis wyników
+# -----------------------------------
+
+def save_skewness(
+    skew: CrossAssetPanel,
+    specs: Sequence[AssetClassSpec],
+    label: str = "",
+    tag: str = "",
+) -> None:
+    for spec in specs:
+        df = skew.to_frame(spec.name)
+        out_path = tagged_path(spec.skew_path, tag)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(out_path)
+        print(f"[{spec.name}] skośność {label}-> {out_path} {df.shape}")
+
+
+def save_portfolios(
+    portfolios: Dict[str, pd.DataFrame],
+    specs: Sequence[AssetClassSpec],
+    freq: str = "M",
+    tag: str = "",
+) -> None:
+    for spec in specs:
+        pf = portfolios[spec.name]
+        out_path = freq_path(tagged_path(spec.portfolio_path, tag), freq)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        pf.to_csv(out_path)
+        print(f"[{spec.name}] portfel LS -> {out_path} {pf.shape}")
+
+
+def save_summaries(
+    summaries: Dict[str, pd.DataFrame],
+    specs: Sequence[AssetClassSpec],
+    freq: str = "M",
+    tag: str = "",
+) -> None:
+    for spec in specs:
+        summary = summaries[spec.name]
+        out_path = freq_path(tagged_path(spec.summary_path, tag), freq)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        summary.to_csv(out_path, index=False)
+        print(f"[{spec.name}] statystyki -> {out_path}")
+        print(summary)
+
+
+# -----------------------------------
+# Etapy pipeline'u (wołane z CLI)
+# -----------------------------------
+
+def skew_stage(
+    names: Optional[List[str]] = None,
+    window: int = 12,
+    estimator: str = "moment",
+) -> None:
+    specs = resolve(names)
+    rets = load_returns_panel([s.name for s in specs])
+    skew = rolling_skewness(rets, window=window, estimator=estimator)
+    save_skewness(
+        skew, specs, label=f"{window}M ({estimator}) ", tag=signal_tag(window, estimator)
+    )
+
+
+def portfolio_stage(
+    names: Optional[List[str]] = None,
+    workers: int = 1,
+    signal: str = "",
+) -> None:
+    """Portfele LS z pliku sygnału `signal` ("" = 12M moment; wyniki z tym samym znacznikiem)."""
+    specs = resolve(names)
+    rets, skew = load_portfolio_inputs([s.name for s in specs], signal=signal)
+    contributions: Dict[str, pd.DataFrame] = {}
+    portfolios = skewness_portfolios(rets, skew, specs, workers=workers, contributions=contributions)
+    save_portfolios(portfolios, specs, tag=signal)
+    attribution.save_attribution(contributions, specs, tag=signal)
+
+
+def analyze_stage(
+    names: Optional[List[str]] = None,
+    freq: str = "M",
+    workers: int = 1,
+    signal: str = "",
+) -> None:
+    """
+    Statystyki portfeli LS; freq wybiera pliki (sufiks _W/_D) i annualizację,
+    signal — znacznik sygnału (jak w `portfolio_stage`).
+    """
+    specs = resolve(names)
+    portfolios = {
+        s.name: pd.read_csv(
+            freq_path(tagged_path(s.portfolio_path, signal), freq), index_col=0, parse_dates=True
+        )
+        for s in specs
+    }
+    save_summaries(
+        portfolio_stats(portfolios, freq=freq, workers=workers), specs, freq=freq, tag=signal
+    )
@@ -0,0 +1,259 @@
+"""
+Wykonanie na puli procesów nad panelami we współdzielonej pamięci.
+
+Przy przeglądach parametrów, bootstrapach i przebiegach per klasa koszt
+pickle'owania całego panelu do każdego procesu zjada zysk z równoległości.
+Tu tablice wejściowe (stopy zwrotu, sygnał, maski) są kopiowane raz do
+`multiprocessing.shared_memory`, procesy podpinają je tylko do odczytu
+(po nazwie bloku, bez kopiowania), dostają zadania jako zakresy indeksów
+[start, stop) po pierwszej osi i zapisują wyniki bezpośrednio do
+prealokowanych tablic wyjściowych, też we współdzielonej pamięci.
+
+Pula procesów jest jedna na cały proces główny (`get_pool`, tworzona
+przy pierwszym użyciu i zamykana przy wyjściu), więc etapy portfolio
+i analyze w jednym przebiegu CLI nie płacą dwa razy za start procesów
+(spawn). Małe panele (mniej niż MIN_PARALLEL_SIZE komórek, np. statystyki
+kilku serii) liczymy w tym procesie — start puli kosztuje więcej niż
+samo liczenie.
+
+    with SharedPanel({"rets": rets}, {"sharpe": ((R,), float)}, processes=4) as sp:
+        sp.run(partial(task, ...), n_items=R)
+        sharpe = sp.result("sharpe")
+
+Funkcja zadania musi być zdefiniowana na poziomie modułu i mieć sygnaturę
+task(arrays, start, stop, ...). Na tym stoją wersje równoległe sortowania
+(`long_short_returns`) i statystyk (`performance_stats`), z których
+korzystają etapy portfolio/analyze (`panel`, `--workers` w CLI).
+
+Procesy startują metodą spawn, więc skrypt wołający musi mieć
+`if __name__ == "__main__":`.
+"""
+import atexit
+import multiprocessing as mp
+import os
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src import kernels
+
+# (nazwa bloku, kształt, dtype, czy do zapisu)
+ArraySpec = Tuple[str, Tuple[int, ...], str, bool]
+
+# poniżej tylu komórek (wiersze x kolumny) wersje równoległe liczą w tym procesie
+MIN_PARALLEL_SIZE = 100_000
+
+_POOLS: Dict[int, "mp.pool.Pool"] = {}
+
+
+def index_ranges(n_items: int, n_chunks: int) -> List[Tuple[int, int]]:
+    """Podział [0, n_items) na co najwyżej n_chunks ciągłych zakresów."""
+    n_chunks = max(1, min(n_chunks, n_items))
+    bounds = np.linspace(0, n_items, n_chunks + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def _init_worker(numba_threads: int) -> None:
+    # każdy proces z puli liczy na jednym wątku numby (bez nadsubskrypcji)
+    os.environ.setdefault("NUMBA_NUM_THREADS", str(numba_threads))
+
+
+def get_pool(processes: int) -> "mp.pool.Pool":
+    """Wspólna pula `processes` procesów (spawn) — jedna na cały proces główny."""
+    pool = _POOLS.get(processes)
+    if pool is None:
+        if not _POOLS:
+            atexit.register(shutdown_pools)
+        # spawn: procesy bez odziedziczonych wątków numby/BLAS rodzica
+        ctx = mp.get_context("spawn")
+        pool = _POOLS[processes] = ctx.Pool(processes, initializer=_init_worker, initargs=(1,))
+    return pool
+
+
+def shutdown_pools() -> None:
+    """Zamyka wspólne pule (wołane też automatycznie przy wyjściu)."""
+    while _POOLS:
+        _, pool = _POOLS.popitem()
+        pool.terminate()
+        pool.join()
+
+
+def _attach(specs: Mapping[str, ArraySpec], handles: List[SharedMemory]) -> Dict[str, np.ndarray]:
+    """Widoki na bloki pamięci panelu (uchwyty trafiają do `handles`)."""
+    arrays = {}
+    for name, (shm_name, shape, dtype, writable) in specs.items():
+        shm = SharedMemory(name=shm_name)
+        handles.append(shm)
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        arr.flags.writeable = writable
+        arrays[name] = arr
+    return arrays
+
+
+def _call(specs: Mapping[str, ArraySpec], task: Callable, bounds: Tuple[int, int]) -> None:
+    """Zadanie w procesie puli: bloki panelu podpięte na czas jednego zakresu."""
+    handles: List[SharedMemory] = []
+    try:
+        task(_attach(specs, handles), *bounds)
+    finally:
+        for shm in handles:
+            try:
+                shm.close()
+            except BufferError:  # widok żyje jeszcze w śladzie wyjątku
+                pass
+
+
+class SharedPanel:
+    """
+    inputs:  {nazwa: tablica} — kopiowane raz do pamięci współdzielonej,
+             w procesach tylko do odczytu,
+    outputs: {nazwa: (kształt, dtype)} — prealokowane (NaN dla float),
+             zapisywane przez procesy w swoich zakresach indeksów.
+
+    Zadania idą na wspólną pulę z `get_pool` — blok `with` zwalnia tylko
+    pamięć współdzieloną, procesy zostają dla kolejnych paneli.
+    """
+
+    def __init__(
+        self,
+        inputs: Mapping[str, np.ndarray],
+        outputs: Mapping[str, Tuple[Sequence[int], Union[str, type]]],
+        processes: Optional[int] = None,
+    ):
+        self._inputs = inputs
+        self._outputs = outputs
+        self.processes = processes or os.cpu_count() or 1
+        self.arrays: Dict[str, np.ndarray] = {}
+        self._specs: Dict[str, ArraySpec] = {}
+        self._blocks: List[SharedMemory] = []
+
+    def __enter__(self) -> "SharedPanel":
+        for name, arr in self._inputs.items():
+            arr = np.asarray(arr)
+            self._allocate(name, arr.shape, arr.dtype, writable=False)[...] = arr
+        for name, (shape, dtype) in self._outputs.items():
+            out = self._allocate(name, tuple(shape), np.dtype(dtype), writable=True)
+            out[...] = np.nan if out.dtype.kind == "f" else 0
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.arrays.clear()
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks.clear()
+
+    def _allocate(
+        self,
+        name: str,
+        shape: Tuple[int, ...],
+        dtype: np.dtype,
+        writable: bool,
+    ) -> np.ndarray:
+        shm = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+        self._blocks.append(shm)
+        self._specs[name] = (shm.name, shape, dtype.str, writable)
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        self.arrays[name] = arr
+        return arr
+
+    def run(self, task: Callable, n_items: int, chunks: Optional[int] = None) -> None:
+        """Wykonuje task(arrays, start, stop) na zakresach [0, n_items)."""
+        ranges = index_ranges(n_items, chunks or 4 * self.processes)
+        if self.processes == 1:
+            for bounds in ranges:
+                task(self.arrays, *bounds)
+            return
+
+        get_pool(self.processes).map(partial(_call, self._specs, task), ranges)
+
+    def result(self, name: str) -> np.ndarray:
+        """Kopia tablicy wyjściowej (pamięć współdzielona znika po `with`)."""
+        return self.arrays[name].copy()
+
+
+# -----------------------------------
+# Zadania (poziom modułu — muszą się pickle'ować)
+# -----------------------------------
+
+def _long_short_task(arrays: Dict[str, np.ndarray], start: int, stop: int, direction: str) -> None:
+    contrib = arrays["contrib"][:, start:stop] if "contrib" in arrays else None
+    long_ret, short_ret, _ = kernels.long_short_returns(
+        arrays["signal"][start:stop],
+        arrays["rets"][start:stop],
+        min_assets=arrays["min_assets"][start:stop],
+        direction=direction,
+        contributions=contrib,
+    )
+    arrays["long"][start:stop] = long_ret
+    arrays["short"][start:stop] = short_ret
+
+
+def _stats_task(
+    arrays: Dict[str, np.ndarray],
+    start: int,
+    stop: int,
+    periods_per_year: int,
+) -> None:
+    stats = kernels.performance_stats(arrays["rets"][start:stop], periods_per_year=periods_per_year)
+    for key, value in stats.items():
+        arrays[key][start:stop] = value
+
+
+# -----------------------------------
+# Wersje równoległe jąder
+# -----------------------------------
+
+def long_short_returns(
+    signal: np.ndarray,
+    rets: np.ndarray,
+    min_assets: Union[int, np.ndarray] = 4,
+    direction: str = "low",
+    processes: Optional[int] = None,
+    contributions: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Jak `kernels.long_short_returns`, z wierszami (klasa, data) rozdzielonymi na procesy."""
+    shape = np.broadcast_shapes(np.shape(signal), np.shape(rets))
+    n_assets = shape[-1]
+    rows = int(np.prod(shape[:-1]))
+    inputs = {
+        "signal": np.broadcast_to(np.asarray(signal, dtype=float), shape).reshape(rows, n_assets),
+        "rets": np.broadcast_to(np.asarray(rets, dtype=float), shape).reshape(rows, n_assets),
+        "min_assets": np.broadcast_to(np.asarray(min_assets), shape[:-1] + (1,)).reshape(rows, 1),
+    }
+    if rows * n_assets < MIN_PARALLEL_SIZE:
+        return kernels.long_short_returns(
+            signal, rets, min_assets=min_assets, direction=direction, contributions=contributions
+        )
+    outputs = {"long": ((rows,), float), "short": ((rows,), float)}
+    if contributions is not None:
+        outputs["contrib"] = ((2, rows, n_assets), float)
+
+    with SharedPanel(inputs, outputs, processes=processes) as sp:
+        sp.run(partial(_long_short_task, direction=direction), n_items=rows)
+        long_ret = sp.result("long").reshape(shape[:-1])
+        short_ret = sp.result("short").reshape(shape[:-1])
+        if contributions is not None:
+            contributions[...] = sp.arrays["contrib"].reshape((2,) + shape)
+    return long_ret, short_ret, long_ret - short_ret
+
+
+def performance_stats(
+    rets: np.ndarray,
+    periods_per_year: int = 12,
+    processes: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Jak `kernels.performance_stats`, z seriami (..., T) rozdzielonymi na procesy."""
+    rets = np.asarray(rets, dtype=float)
+    lead = rets.shape[:-1]
+    rows = int(np.prod(lead))
+    if rets.size < MIN_PARALLEL_SIZE:
+        return kernels.performance_stats(rets, periods_per_year=periods_per_year)
+    outputs = {key: ((rows,), float) for key in kernels.STAT_NAMES}
+
+    inputs = {"rets": rets.reshape(rows, rets.shape[-1])}
+    with SharedPanel(inputs, outputs, processes=processes) as sp:
+        sp.run(partial(_stats_task, periods_per_year=periods_per_year), n_items=rows)
+        return {key: sp.result(key).reshape(lead) for key in kernels.STAT_NAMES}
@@ -1,9 +1,12 @@
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Tuple
 
 import numpy as np
 import pandas as pd
 
+from src import kernels
+from src.aligned import AlignedPanel
+
 
 # -----------------------------------
 # Ścieżki
@@ -27,21 +30,16 @@ def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
       - 12M rolling skewness,
     i zostawia tylko wspólne daty i wspólne indeksy.
     """
-    rets = pd.read_csv(RET_PATH, index_col=0, parse_dates=True)
-    skew = pd.read_csv(SKEW_PATH, index_col=0, parse_dates=True)
-
-    # wspólne kolumny (kraje)
-    common_cols = sorted(set(rets.columns) & set(skew.columns))
-    rets = rets[common_cols]
-    skew = skew[common_cols]
-
-    # wspólne daty
-    common_idx = rets.index.intersection(skew.index)
-    rets = rets.loc[common_idx].sort_index()
-    skew = skew.loc[common_idx].sort_index()
+    data = AlignedPanel.from_frames(
+        {
+            "returns": pd.read_csv(RET_PATH, index_col=0, parse_dates=True),
+            "skew": pd.read_csv(SKEW_PATH, index_col=0, parse_dates=True),
+        }
+    )
+    rets, skew = data.frame("returns"), data.frame("skew")
 
-    print("Używane indeksy:", common_cols)
-    print("Liczba miesięcy (po dopasowaniu):", len(common_idx))
+    print("Używane indeksy:", list(data.assets))
+    print("Liczba miesięcy (po dopasowaniu):", len(data.dates))
 
     return rets, skew
 
@@ -61,52 +59,20 @@ def build_skewness_portfolios(
     """
 
     # używamy skośności z poprzedniego miesiąca jako sygnału
-    skew_signal = skew.shift(1)
-
-    long_ret_list: List[float] = []
-    short_ret_list: List[float] = []
-    ls_ret_list: List[float] = []
-    dates: List[pd.Timestamp] = []
-
-    for date in rets.index:
-        signal_row = skew_signal.loc[date]
-        ret_row = rets.loc[date]
+    skew_signal = skew.shift(1).reindex(index=rets.index, columns=rets.columns)
 
-        # bierzemy tylko indeksy, dla których mamy sygnał i stopę zwrotu
-        valid = signal_row.dropna().index.intersection(ret_row.dropna().index)
-        if len(valid) < min_assets:
-            # za mało aktywów, pomijamy miesiąc
-            continue
-
-        sig = signal_row[valid]
-        r = ret_row[valid]
-
-        # sortowanie po skośności (ascending: najbardziej negatywna → najbardziej pozytywna)
-        sig_sorted = sig.sort_values()
-        n = len(sig_sorted)
-        k = n // 2  # połowa do long, połowa do short
-        if k == 0:
-            continue
-
-        long_idx = sig_sorted.index[:k]
-        short_idx = sig_sorted.index[-k:]
-
-        long_ret = r[long_idx].mean()
-        short_ret = r[short_idx].mean()
-        ls_ret = long_ret - short_ret
-
-        dates.append(date)
-        long_ret_list.append(long_ret)
-        short_ret_list.append(short_ret)
-        ls_ret_list.append(ls_ret)
+    long_ret, short_ret, ls_ret = kernels.long_short_returns(
+        skew_signal.to_numpy(dtype=float),
+        rets.to_numpy(dtype=float),
+        min_assets=min_assets,
+        direction="low",
+    )
+    # miesiące z za małą liczbą aktywów są pomijane
+    keep = ~np.isnan(ls_ret)
 
     portfolio = pd.DataFrame(
-        {
-            "Long": long_ret_list,
-            "Short": short_ret_list,
-            "LongShort": ls_ret_list,
-        },
-        index=pd.DatetimeIndex(dates, name="Date"),
+        {"Long": long_ret[keep], "Short": short_ret[keep], "LongShort": ls_ret[keep]},
+        index=pd.DatetimeIndex(rets.index[keep], name="Date"),
     ).sort_index()
 
     return portfolio
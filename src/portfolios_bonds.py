@@ -1,8 +1,14 @@
 from pathlib import Path
-from typing import Tuple, List
+from typing import Tuple
 
+import numpy as np
 import pandas as pd
 
+from src import kernels
+from src.aligned import AlignedPanel
+from src.asset_classes import SAMPLE_PERIOD
+from src.storage import read_frame
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data" / "processed"
 
@@ -17,23 +23,17 @@ def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
     i wyrównuje je po wspólnych datach i krajach.
     Przycinamy okres do 2005–2025.
     """
-    rets = pd.read_csv(RET_PATH, index_col=0, parse_dates=True)
-    skew = pd.read_csv(SKEW_PATH, index_col=0, parse_dates=True)
-
-    # okres 2005–2025
-    rets = rets.loc["2005-01-01":"2025-01-01"]
-    skew = skew.loc["2005-01-01":"2025-01-01"]
-
-    common_cols = sorted(set(rets.columns) & set(skew.columns))
-    rets = rets[common_cols]
-    skew = skew[common_cols]
-
-    common_idx = rets.index.intersection(skew.index)
-    rets = rets.loc[common_idx].sort_index()
-    skew = skew.loc[common_idx].sort_index()
-
-    print("Kraje w portfelu bonds:", common_cols)
-    print("Liczba miesięcy:", len(common_idx))
+    data = AlignedPanel.from_frames(
+        {
+            "returns": read_frame(RET_PATH, *SAMPLE_PERIOD),
+            "skew": read_frame(SKEW_PATH, *SAMPLE_PERIOD),
+        },
+        period=SAMPLE_PERIOD,
+    )
+    rets, skew = data.frame("returns"), data.frame("skew")
+
+    print("Kraje w portfelu bonds:", list(data.assets))
+    print("Liczba miesięcy:", len(data.dates))
 
     return rets, skew
 
@@ -56,45 +56,20 @@ def build_skewness_portfolio(
       3. dzielimy na dwie połowy: top vs bottom,
       4. obliczamy zwrot Long, Short i LongShort.
     """
-    skew_signal = skew.shift(1)
-
-    dates: List[pd.Timestamp] = []
-    long_list: List[float] = []
-    short_list: List[float] = []
-    ls_list: List[float] = []
-
-    for date in rets.index:
-        sig_row = skew_signal.loc[date]
-        ret_row = rets.loc[date]
-
-        valid = sig_row.dropna().index.intersection(ret_row.dropna().index)
-        if len(valid) < min_assets:
-            continue
-
-        sig = sig_row[valid].sort_values()
-        r = ret_row[valid]
-
-        n = len(sig)
-        k = n // 2
-        if k == 0:
-            continue
-
-        # BONDS: long highest skewness, short lowest skewness
-        short_idx = sig.index[:k]     # najniższa skośność (kraje ryzykowne)
-        long_idx = sig.index[-k:]     # najwyższa skośność (bezpieczne)
-
-        long_ret = r[long_idx].mean()
-        short_ret = r[short_idx].mean()
-        ls_ret = long_ret - short_ret
+    skew_signal = skew.shift(1).reindex(index=rets.index, columns=rets.columns)
 
-        dates.append(date)
-        long_list.append(long_ret)
-        short_list.append(short_ret)
-        ls_list.append(ls_ret)
+    long_ret, short_ret, ls_ret = kernels.long_short_returns(
+        skew_signal.to_numpy(dtype=float),
+        rets.to_numpy(dtype=float),
+        min_assets=min_assets,
+        direction="high",  # BONDS: long najwyższa skośność
+    )
+    # miesiące z za małą liczbą aktywów są pomijane
+    keep = ~np.isnan(ls_ret)
 
     pf = pd.DataFrame(
-        {"Long": long_list, "Short": short_list, "LongShort": ls_list},
-        index=pd.DatetimeIndex(dates, name="Date"),
+        {"Long": long_ret[keep], "Short": short_ret[keep], "LongShort": ls_ret[keep]},
+        index=pd.DatetimeIndex(rets.index[keep], name="Date"),
     ).sort_index()
 
     return pf
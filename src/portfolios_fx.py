@@ -1,8 +1,12 @@
 from pathlib import Path
-from typing import List, Tuple
+from typing import Tuple
 
+import numpy as np
 import pandas as pd
 
+from src import kernels
+from src.aligned import AlignedPanel
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
@@ -13,19 +17,16 @@ PORTFOLIO_PATH = DATA_PROCESSED_DIR / "portfolio_fx_skewness_ls.csv"
 
 
 def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
-    rets = pd.read_csv(RET_PATH, index_col=0, parse_dates=True)
-    skew = pd.read_csv(SKEW_PATH, index_col=0, parse_dates=True)
-
-    common_cols = sorted(set(rets.columns) & set(skew.columns))
-    rets = rets[common_cols]
-    skew = skew[common_cols]
-
-    common_idx = rets.index.intersection(skew.index)
-    rets = rets.loc[common_idx].sort_index()
-    skew = skew.loc[common_idx].sort_index()
+    data = AlignedPanel.from_frames(
+        {
+            "returns": pd.read_csv(RET_PATH, index_col=0, parse_dates=True),
+            "skew": pd.read_csv(SKEW_PATH, index_col=0, parse_dates=True),
+        }
+    )
+    rets, skew = data.frame("returns"), data.frame("skew")
 
-    print("Waluty:", common_cols)
-    print("Miesiące:", len(common_idx))
+    print("Waluty:", list(data.assets))
+    print("Miesiące:", len(data.dates))
 
     return rets, skew
 
@@ -35,44 +36,20 @@ def build_skewness_portfolios(
     skew: pd.DataFrame,
     min_assets: int = 4,
 ) -> pd.DataFrame:
-    skew_signal = skew.shift(1)
-
-    long_list: List[float] = []
-    short_list: List[float] = []
-    ls_list: List[float] = []
-    dates: List[pd.Timestamp] = []
-
-    for date in rets.index:
-        sig_row = skew_signal.loc[date]
-        ret_row = rets.loc[date]
-
-        valid = sig_row.dropna().index.intersection(ret_row.dropna().index)
-        if len(valid) < min_assets:
-            continue
-
-        sig = sig_row[valid].sort_values()
-        r = ret_row[valid]
-
-        n = len(sig)
-        k = n // 2
-        if k == 0:
-            continue
-
-        long_idx = sig.index[:k]
-        short_idx = sig.index[-k:]
-
-        long_ret = r[long_idx].mean()
-        short_ret = r[short_idx].mean()
-        ls_ret = long_ret - short_ret
+    skew_signal = skew.shift(1).reindex(index=rets.index, columns=rets.columns)
 
-        dates.append(date)
-        long_list.append(long_ret)
-        short_list.append(short_ret)
-        ls_list.append(ls_ret)
+    long_ret, short_ret, ls_ret = kernels.long_short_returns(
+        skew_signal.to_numpy(dtype=float),
+        rets.to_numpy(dtype=float),
+        min_assets=min_assets,
+        direction="low",
+    )
+    # miesiące z za małą liczbą aktywów są pomijane
+    keep = ~np.isnan(ls_ret)
 
     pf = pd.DataFrame(
-        {"Long": long_list, "Short": short_list, "LongShort": ls_list},
-        index=pd.DatetimeIndex(dates, name="Date"),
+        {"Long": long_ret[keep], "Short": short_ret[keep], "LongShort": ls_ret[keep]},
+        index=pd.DatetimeIndex(rets.index[keep], name="Date"),
     ).sort_index()
 
     return pf
@@ -0,0 +1,170 @@
+"""
+Realized skewness z dziennych cen (Amaya, Christoffersen, Jacobs, Vasquez 2015):
+
+    RSK_t = sqrt(N_t) * sum(r_d^3) / (sum(r_d^2))^(3/2),
+
+gdzie r_d to dzienne log-zwroty w miesiącu t (albo w kroczącym oknie
+60/252 dni). Dzienne ceny są już zapisywane przez skrypty data_download*
+w data/raw/ — tu ich nie wyrzucamy po resample("M").last().
+
+Granice miesięcy wyznaczamy raz (np.searchsorted po indeksie dat),
+a sumy r, r^2, r^3 liczymy jednym np.add.reduceat dla wszystkich tickerów
+naraz — bez groupby.apply.
+"""
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.asset_classes import DATA_PROCESSED_DIR, AssetClassSpec, resolve
+from src.frequency import tagged_path
+from src.kernels import rolling_sum
+
+
+def daily_log_returns(prices: pd.DataFrame) -> pd.DataFrame:
+    """Dzienne log-zwroty; ceny <= 0 (np. WTI 04/2020) traktujemy jako brak."""
+    prices = prices.sort_index()
+    values = prices.to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_p = np.where(values > 0, np.log(values), np.nan)
+    rets = np.full(values.shape, np.nan)
+    rets[1:] = log_p[1:] - log_p[:-1]
+    return pd.DataFrame(rets, index=prices.index, columns=prices.columns)
+
+
+def period_bounds(dates: pd.DatetimeIndex, freq: str = "M") -> Tuple[np.ndarray, pd.DatetimeIndex]:
+    """
+    Początki okresów (pozycje w `dates`) i etykiety okresów.
+
+    freq="M": etykieta = ostatni dzień miesiąca (jak resample("M")),
+    freq="W": etykieta = niedziela kończąca tydzień (jak resample("W")).
+    `dates` musi być posortowane.
+    """
+    days = dates.values.astype("datetime64[D]")
+    if freq == "M":
+        periods = days.astype("datetime64[M]")
+        labels = (np.unique(periods) + 1).astype("datetime64[D]") - 1
+    elif freq == "W":
+        # tygodnie pon–niedz.; 1970-01-01 był czwartkiem
+        periods = (days.astype(np.int64) + 3) // 7
+        labels = (np.unique(periods) * 7 + 3).astype("datetime64[D]")
+    else:
+        raise ValueError(f"Nieobsługiwana częstotliwość: {freq!r} (oczekiwano 'M' albo 'W').")
+
+    starts = np.searchsorted(periods, np.unique(periods), side="left")
+    return starts, pd.DatetimeIndex(labels, name="Date")
+
+
+def realized_moments(rets: np.ndarray, starts: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Liczba obserwacji i sumy r, r^2, r^3 w okresach (reduceat po wierszach)."""
+    valid = ~np.isnan(rets)
+    r = np.where(valid, rets, 0.0)
+    n = np.add.reduceat(valid.astype(np.int64), starts, axis=0)
+    s2 = np.add.reduceat(r * r, starts, axis=0)
+    s3 = np.add.reduceat(r * r * r, starts, axis=0)
+    return n, s2, s3
+
+
+def _rsk(n: np.ndarray, s2: np.ndarray, s3: np.ndarray, min_days: int) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsk = np.sqrt(n) * s3 / s2 ** 1.5
+    return np.where((n >= min_days) & (s2 > 0), rsk, np.nan)
+
+
+def realized_skewness(
+    prices: pd.DataFrame,
+    freq: str = "M",
+    min_days: int = 15,
+) -> pd.DataFrame:
+    """Realized skewness z dziennych log-zwrotów w obrębie każdego miesiąca (tygodnia)."""
+    rets = daily_log_returns(prices)
+    starts, labels = period_bounds(rets.index, freq=freq)
+    n, s2, s3 = realized_moments(rets.to_numpy(), starts)
+    return pd.DataFrame(_rsk(n, s2, s3, min_days), index=labels, columns=prices.columns)
+
+
+def rolling_realized_skewness(
+    prices: pd.DataFrame,
+    window: int = 60,
+    min_days: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Realized skewness w kroczącym oknie `window` dni sesyjnych (np. 60 albo 252).
+    Sumy w oknie z sum skumulowanych; wynik dzienny.
+    """
+    if min_days is None:
+        min_days = int(0.8 * window)
+
+    rets = daily_log_returns(prices).to_numpy()
+    valid = ~np.isnan(rets)
+    r = np.where(valid, rets, 0.0)
+
+    n = rolling_sum(valid.astype(float), window)
+    s2 = rolling_sum(r * r, window)
+    s3 = rolling_sum(r * r * r, window)
+    return pd.DataFrame(_rsk(n, s2, s3, min_days), index=prices.index, columns=prices.columns)
+
+
+def sample_period_end(daily: pd.DataFrame, freq: str = "M") -> pd.DataFrame:
+    """Ostatnia obserwacja dzienna w każdym okresie, z etykietą końca okresu."""
+    starts, labels = period_bounds(daily.index, freq=freq)
+    ends = np.append(starts[1:], len(daily)) - 1
+    return pd.DataFrame(daily.to_numpy()[ends], index=labels, columns=daily.columns)
+
+
+def realized_skew_path(spec: AssetClassSpec, window: Optional[int] = None) -> Path:
+    suffix = "" if window is None else f"_{window}d"
+    return DATA_PROCESSED_DIR / f"{spec.name}_realized_skewness{suffix}.csv"
+
+
+def signal_tag(window: Optional[int] = None) -> str:
+    """Znacznik pliku sygnału (`portfolio --signal`): "realized" albo np. "realized_60d"."""
+    return "realized" if window is None else f"realized_{window}d"
+
+
+def main(
+    names: Optional[List[str]] = None,
+    window: Optional[int] = None,
+    min_days: Optional[int] = None,
+    as_signal: bool = False,
+) -> None:
+    """
+    Liczy realized skewness dla klas z dziennymi cenami w data/raw/.
+
+    window=None: w obrębie miesiąca; window=60/252: kroczące okno dzienne
+    próbkowane na koniec miesiąca. Ceny jak w `high_frequency` (okres
+    klasy, ffill krótkich luk). as_signal=True zapisuje wynik także jako
+    sygnał ze znacznikiem (np. equity_skewness_12m_realized_60d.csv), z
+    którego `portfolio --signal realized_60d` zbuduje portfele Long–Short
+    — kanoniczny plik skośności 12M zostaje bez zmian.
+    """
+    # import w funkcji: high_frequency importuje ten moduł
+    from src.high_frequency import read_daily_prices
+
+    for spec in resolve(names):
+        path = spec.daily_prices_path
+        if path is None or not path.exists():
+            print(f"[{spec.name}] brak dziennych cen ({path}) — pomijam")
+            continue
+
+        prices = read_daily_prices(spec)
+        if window is None:
+            rsk = realized_skewness(prices, min_days=min_days or 15)
+        else:
+            rsk = sample_period_end(rolling_realized_skewness(prices, window, min_days))
+
+        out_path = realized_skew_path(spec, window)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        rsk.to_csv(out_path)
+        print(f"[{spec.name}] realized skewness -> {out_path} {rsk.shape}")
+
+        if as_signal:
+            tag = signal_tag(window)
+            signal_path = tagged_path(spec.skew_path, tag)
+            rsk.to_csv(signal_path)
+            print(f"[{spec.name}] sygnał -> {signal_path} (portfolio --signal {tag})")
+
+
+if __name__ == "__main__":
+    main()
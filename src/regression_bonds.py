@@ -1,9 +1,18 @@
 # src/regression_bonds.py
 
 from pathlib import Path
+from typing import TYPE_CHECKING
+
 import numpy as np
 import pandas as pd
-import statsmodels.api as sm
+
+from src.aligned import AlignedPanel
+from src.asset_classes import SAMPLE_PERIOD
+from src.frequency import tagged_path
+from src.storage import read_frame
+
+if TYPE_CHECKING:
+    import statsmodels.api as sm
 
 # ─── Ścieżki ──────────────────────────────────────────────
 
@@ -15,7 +24,7 @@ BOND_PF_PATH = DATA_DIR / "portfolio_bonds_skewness_ls.csv"
 OUT_TABLE_PATH = DATA_DIR / "regression_bonds_clean_table.csv"
 
 
-def ols_to_table(model: sm.regression.linear_model.RegressionResultsWrapper,
+def ols_to_table(model: "sm.regression.linear_model.RegressionResultsWrapper",
                  digits: int = 6) -> pd.DataFrame:
     """Ładna tabelka OLS do pracy."""
     params = model.params
@@ -43,32 +52,35 @@ def ols_to_table(model: sm.regression.linear_model.RegressionResultsWrapper,
     return table
 
 
-def main():
-    # 1. Wczytanie danych
-    bond_ret = pd.read_csv(BOND_RET_PATH, index_col=0, parse_dates=True)
-    pf = pd.read_csv(BOND_PF_PATH, index_col=0, parse_dates=True)
+def main(signal: str = ""):
+    """signal: znacznik sygnału (`frequency.signal_tag`) — portfel i tabela z tym znacznikiem."""
+    # statsmodels jest ciężki - ładujemy go dopiero przy regresji
+    import statsmodels.api as sm
 
-    # Spójny zakres dat
-    bond_ret = bond_ret.loc["2005-01-01":"2025-01-01"]
-    pf = pf.loc["2005-01-01":"2025-01-01"]
+    out_path = tagged_path(OUT_TABLE_PATH, signal)
 
-    # 2. Wyrównanie dat
-    idx = bond_ret.index.intersection(pf.index)
-    bond_ret = bond_ret.loc[idx].sort_index()
-    pf = pf.loc[idx].sort_index()
+    # 1. Wczytanie danych
+    pf = read_frame(tagged_path(BOND_PF_PATH, signal), *SAMPLE_PERIOD)
+
+    # 2. Wyrównanie dat (raz) — zakres jak w reszcie projektu
+    data = AlignedPanel.from_frames(
+        {"returns": read_frame(BOND_RET_PATH, *SAMPLE_PERIOD)},
+        series={"LongShort": pf["LongShort"]},
+        period=SAMPLE_PERIOD,
+    )
 
     # 3. Bond market = średnia z wszystkich serii 10Y
-    bmk = bond_ret.mean(axis=1)
-    bmk.name = "BOND_MKT_EW"
+    data.add("BOND_MKT_EW", data.frame("returns").mean(axis=1))
 
-    ls = pf["LongShort"]
-    data = pd.concat([ls, bmk], axis=1).dropna()
+    keep = ~np.isnan(data["LongShort"]) & ~np.isnan(data["BOND_MKT_EW"])
+    ls = data.series("LongShort")[keep]
+    bmk = data.series("BOND_MKT_EW")[keep]
 
-    print("Liczba obserwacji (bonds regression):", len(data))
+    print("Liczba obserwacji (bonds regression):", len(ls))
 
     # 4. Regresja OLS: LS = alpha + beta * BOND_MKT
-    Y = data["LongShort"]
-    X = sm.add_constant(data["BOND_MKT_EW"])
+    Y = ls
+    X = sm.add_constant(bmk)
 
     model = sm.OLS(Y, X).fit()
 
@@ -77,8 +89,8 @@ def main():
 
     # 5. Ładna tabelka do pracy
     clean_table = ols_to_table(model)
-    clean_table.to_csv(OUT_TABLE_PATH)
-    print(f"\nZapisano ładną tabelę do: {OUT_TABLE_PATH}")
+    clean_table.to_csv(out_path)
+    print(f"\nZapisano ładną tabelę do: {out_path}")
     print("\n=== CLEAN TABLE (BONDS) ===")
     print(clean_table)
 
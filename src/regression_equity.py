@@ -1,9 +1,18 @@
 # src/regression_equity.py
 
 from pathlib import Path
+from typing import TYPE_CHECKING
+
 import numpy as np
 import pandas as pd
-import statsmodels.api as sm
+
+from src.aligned import AlignedPanel
+from src.asset_classes import SAMPLE_PERIOD
+from src.frequency import tagged_path
+from src.storage import read_frame
+
+if TYPE_CHECKING:
+    import statsmodels.api as sm
 
 # ─── Ścieżki ──────────────────────────────────────────────
 
@@ -15,7 +24,7 @@ EQ_PF_PATH = DATA_DIR / "portfolio_skewness_ls.csv"
 OUT_TABLE_PATH = DATA_DIR / "regression_equity_clean_table.csv"
 
 
-def ols_to_table(model: sm.regression.linear_model.RegressionResultsWrapper,
+def ols_to_table(model: "sm.regression.linear_model.RegressionResultsWrapper",
                  digits: int = 6) -> pd.DataFrame:
     """Ładna tabelka OLS do pracy."""
     params = model.params
@@ -43,32 +52,35 @@ def ols_to_table(model: sm.regression.linear_model.RegressionResultsWrapper,
     return table
 
 
-def main():
-    # 1. Wczytanie danych
-    eq_ret = pd.read_csv(EQ_RET_PATH, index_col=0, parse_dates=True)
-    pf = pd.read_csv(EQ_PF_PATH, index_col=0, parse_dates=True)
+def main(signal: str = ""):
+    """signal: znacznik sygnału (`frequency.signal_tag`) — portfel i tabela z tym znacznikiem."""
+    # statsmodels jest ciężki - ładujemy go dopiero przy regresji
+    import statsmodels.api as sm
 
-    # Zakres jak w reszcie projektu
-    eq_ret = eq_ret.loc["2005-01-01":"2025-01-01"]
-    pf = pf.loc["2005-01-01":"2025-01-01"]
+    out_path = tagged_path(OUT_TABLE_PATH, signal)
 
-    # 2. Wyrównanie dat
-    idx = eq_ret.index.intersection(pf.index)
-    eq_ret = eq_ret.loc[idx].sort_index()
-    pf = pf.loc[idx].sort_index()
+    # 1. Wczytanie danych
+    pf = read_frame(tagged_path(EQ_PF_PATH, signal), *SAMPLE_PERIOD)
+
+    # 2. Wyrównanie dat (raz) — zakres jak w reszcie projektu
+    data = AlignedPanel.from_frames(
+        {"returns": read_frame(EQ_RET_PATH, *SAMPLE_PERIOD)},
+        series={"LongShort": pf["LongShort"]},
+        period=SAMPLE_PERIOD,
+    )
 
     # 3. Rynek = średnia z wszystkich indeksów
-    mkt = eq_ret.mean(axis=1)
-    mkt.name = "MKT_EW"
+    data.add("MKT_EW", data.frame("returns").mean(axis=1))
 
-    ls = pf["LongShort"]
-    data = pd.concat([ls, mkt], axis=1).dropna()
+    keep = ~np.isnan(data["LongShort"]) & ~np.isnan(data["MKT_EW"])
+    ls = data.series("LongShort")[keep]
+    mkt = data.series("MKT_EW")[keep]
 
-    print("Liczba obserwacji (equity regression):", len(data))
+    print("Liczba obserwacji (equity regression):", len(ls))
 
     # 4. Regresja OLS: LS = alpha + beta * MKT
-    Y = data["LongShort"]
-    X = sm.add_constant(data["MKT_EW"])
+    Y = ls
+    X = sm.add_constant(mkt)
 
     model = sm.OLS(Y, X).fit()
 
@@ -77,8 +89,8 @@ def main():
 
     # 5. Ładna tabelka do pracy
     clean_table = ols_to_table(model)
-    clean_table.to_csv(OUT_TABLE_PATH)
-    print(f"\nZapisano ładną tabelę do: {OUT_TABLE_PATH}")
+    clean_table.to_csv(out_path)
+    print(f"\nZapisano ładną tabelę do: {out_path}")
     print("\n=== CLEAN TABLE (EQUITY) ===")
     print(clean_table)
 
@@ -0,0 +1,404 @@
+"""
+Raport statyczny (HTML, opcjonalnie PDF) z wykresami i tabelami.
+
+Dane wczytujemy raz (portfele LS wszystkich klas + stopy zwrotu equity
+dla rynku EW albo gotowy `SkewnessStudy`), wszystkie serie do wykresów
+liczymy wektorowo w procesie głównym, a samo rysowanie idzie równolegle
+na puli procesów:
+
+    - skumulowane zwroty (per klasa i wszystkie LS razem),
+    - obsunięcia kapitału,
+    - kroczący Sharpe (36M),
+    - mapa ciepła średniej kroczącej korelacji 36M między strategiami.
+
+Wykresy rysujemy obiektowo (`matplotlib.figure.Figure`, Agg) — bez
+pyplot, więc notebook nie zmienia backendu. Każdy wykres ma nazwę pliku
+z hashem treści (dane + tytuł + rodzaj), więc niezmienione wykresy nie
+są rysowane ponownie.
+
+    python -m src report --pdf
+"""
+import hashlib
+import html
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src import kernels, panel
+from src.asset_classes import PROJECT_ROOT, get_spec, resolve
+
+REPORT_DIR = PROJECT_ROOT / "outputs" / "report"
+
+# zmiana wyglądu wykresów = nowa wersja (unieważnia cache)
+RENDER_VERSION = "1"
+
+ROLLING_WINDOW = 36
+
+LABELS = {"equity": "Equities", "fx": "FX", "bonds": "Bonds", "commodities": "Commodities"}
+
+
+@dataclass
+class FigureJob:
+    """Jeden wykres: rodzaj, tytuł i gotowe dane (kolumna = linia)."""
+    name: str
+    kind: str
+    title: str
+    data: pd.DataFrame
+    ylabel: str = ""
+    dpi: int = 150
+
+    def content_hash(self) -> str:
+        h = hashlib.sha256()
+        h.update(f"{RENDER_VERSION}|{self.kind}|{self.title}|{self.ylabel}|{self.dpi}".encode())
+        h.update("\x1f".join(map(str, self.data.columns)).encode())
+        h.update("\x1f".join(map(str, self.data.index)).encode())
+        h.update(np.ascontiguousarray(self.data.to_numpy(dtype=float)).tobytes())
+        return h.hexdigest()[:16]
+
+    def filename(self) -> str:
+        return f"{self.name}-{self.content_hash()}.png"
+
+
+# -----------------------------------
+# Dane do wykresów (wektorowo, w procesie głównym)
+# -----------------------------------
+
+def cumulative(rets: pd.DataFrame) -> pd.DataFrame:
+    """(1 + r).cumprod() per kolumna; NaN = brak pozycji (kapitał bez zmian)."""
+    values = rets.to_numpy(dtype=float)
+    cum = np.cumprod(1.0 + np.nan_to_num(values), axis=0)
+    return pd.DataFrame(
+        np.where(np.isnan(values), np.nan, cum), index=rets.index, columns=rets.columns
+    )
+
+
+def drawdown_series(rets: pd.DataFrame) -> pd.DataFrame:
+    """
+    Obsunięcie od szczytu per kolumna — szczyt od pierwszej obserwacji,
+    jak w `kernels.drawdowns` (przed startem serii NaN, bez sztucznego 1.0).
+    """
+    values = rets.to_numpy(dtype=float)
+    cum = np.cumprod(1.0 + np.nan_to_num(values), axis=0)
+    started = np.logical_or.accumulate(~np.isnan(values), axis=0)
+    peak = np.maximum.accumulate(np.where(started, cum, 0.0), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = np.where(started, cum / peak - 1.0, np.nan)
+    return pd.DataFrame(dd, index=rets.index, columns=rets.columns)
+
+
+def rolling_sharpe(
+    rets: pd.DataFrame,
+    window: int = ROLLING_WINDOW,
+    periods_per_year: int = 12,
+) -> pd.DataFrame:
+    """Kroczący Sharpe z sum w oknie (pełne okno bez braków)."""
+    x = rets.to_numpy(dtype=float)
+    valid = ~np.isnan(x)
+    x0 = np.where(valid, x, 0.0)
+    n = kernels.rolling_sum(valid.astype(float), window)
+    s1 = kernels.rolling_sum(x0, window)
+    s2 = kernels.rolling_sum(x0 * x0, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = s1 / n
+        var = (s2 - n * mean ** 2) / (n - 1)
+        sharpe = mean / np.sqrt(var) * np.sqrt(periods_per_year)
+    sharpe = np.where((n == window) & (var > 0), sharpe, np.nan)
+    return pd.DataFrame(sharpe, index=rets.index, columns=rets.columns)
+
+
+def mean_rolling_corr(rets: pd.DataFrame, window: int = ROLLING_WINDOW) -> pd.DataFrame:
+    """
+    Średnia (po czasie) kroczącej korelacji między kolumnami
+    (`kernels.rolling_corr`; okno musi być pełne dla danej pary).
+    """
+    corr = kernels.rolling_corr(rets.to_numpy(dtype=float), window)
+
+    with kernels._warnings_ignored():
+        mean = np.nanmean(corr, axis=0)
+    return pd.DataFrame(mean, index=rets.columns, columns=rets.columns)
+
+
+# -----------------------------------
+# Rysowanie (w procesach z puli)
+# -----------------------------------
+
+def _plot_lines(ax, job: FigureJob) -> None:
+    for col in job.data.columns:
+        s = job.data[col].dropna()
+        ax.plot(s.index, s.to_numpy(), label=col, linewidth=1.2)
+    if job.kind == "drawdown":
+        ax.axhline(0.0, color="black", linewidth=0.6)
+    if job.kind == "sharpe":
+        ax.axhline(0.0, color="black", linewidth=0.6, linestyle="--")
+    ax.set_xlabel("Date")
+    ax.set_ylabel(job.ylabel)
+    ax.legend()
+
+
+def _plot_heatmap(ax, job: FigureJob) -> None:
+    corr = job.data
+    im = ax.imshow(corr.to_numpy(), vmin=-1, vmax=1, cmap="coolwarm", interpolation="nearest")
+    ticks = np.arange(len(corr))
+    ax.set_xticks(ticks)
+    ax.set_yticks(ticks)
+    ax.set_xticklabels(corr.columns, fontsize=10)
+    ax.set_yticklabels(corr.index, fontsize=10)
+    ax.set_xticks(np.arange(-0.5, len(corr), 1), minor=True)
+    ax.set_yticks(np.arange(-0.5, len(corr), 1), minor=True)
+    ax.grid(which="minor", color="black", linestyle="-", linewidth=1, alpha=0.35)
+    ax.tick_params(which="minor", bottom=False, left=False)
+    for i in range(corr.shape[0]):
+        for j in range(corr.shape[1]):
+            ax.text(j, i, f"{corr.iloc[i, j]:.3f}", ha="center", va="center", fontsize=10)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    cbar = ax.figure.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
+    cbar.set_label("Correlation")
+
+
+_PLOTTERS = {
+    "cumulative": _plot_lines,
+    "drawdown": _plot_lines,
+    "sharpe": _plot_lines,
+    "heatmap": _plot_heatmap,
+}
+
+
+def render_figure(job: FigureJob, path: Path) -> Path:
+    """Rysuje wykres do `path` (zapis atomowy: plik tymczasowy + replace)."""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(7.2, 5.6) if job.kind == "heatmap" else (9.0, 4.8))
+    ax = fig.add_subplot()
+    _PLOTTERS[job.kind](ax, job)
+    ax.set_title(job.title)
+    fig.tight_layout()
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    fig.savefig(tmp, dpi=job.dpi, format="png", bbox_inches="tight")
+    os.replace(tmp, path)
+    return path
+
+
+def render_all(
+    jobs: Sequence[FigureJob],
+    fig_dir: Path,
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+) -> Tuple[Dict[str, Path], int]:
+    """
+    Rysuje brakujące wykresy (pula procesów); zwraca ścieżki i liczbę
+    narysowanych. PNG spoza bieżącej listy wykresów (stare hashe) usuwamy.
+    """
+    fig_dir.mkdir(parents=True, exist_ok=True)
+    paths = {job.name: fig_dir / job.filename() for job in jobs}
+    todo = [job for job in jobs if not (use_cache and paths[job.name].exists())]
+
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+    if workers <= 1:
+        for job in todo:
+            render_figure(job, paths[job.name])
+    else:
+        with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as pool:
+            list(pool.map(render_figure, todo, [paths[job.name] for job in todo]))
+
+    current = set(paths.values())
+    for stale in fig_dir.glob("*.png"):
+        if stale not in current:
+            stale.unlink()
+    return paths, len(todo)
+
+
+# -----------------------------------
+# Dane raportu i lista wykresów
+# -----------------------------------
+
+def load_report_inputs(
+    names: Optional[List[str]] = None,
+    study=None,
+) -> Tuple[Dict[str, pd.DataFrame], Optional[pd.Series]]:
+    """Portfele LS i rynek EW dla equity — z plików (raz) albo z policzonego studium."""
+    if study is not None:
+        if study.portfolios is None:
+            study.portfolio()
+        portfolios = dict(study.portfolios)
+        market = (
+            study.returns_panel.to_frame("equity").mean(axis=1) if "equity" in study.names else None
+        )
+        return portfolios, market
+
+    specs = resolve(names)
+    portfolios = {
+        s.name: pd.read_csv(s.portfolio_path, index_col=0, parse_dates=True).sort_index()
+        for s in specs
+    }
+    market = None
+    if "equity" in portfolios:
+        market = panel.read_returns(get_spec("equity")).mean(axis=1)
+    return portfolios, market
+
+
+def build_jobs(
+    portfolios: Dict[str, pd.DataFrame],
+    market: Optional[pd.Series] = None,
+) -> List[FigureJob]:
+    ls = pd.concat(
+        {LABELS.get(name, name): pf["LongShort"] for name, pf in portfolios.items()},
+        axis=1,
+        sort=True,
+    )
+
+    jobs = []
+    for name, pf in portfolios.items():
+        label = LABELS.get(name, name)
+        series = {f"{label} Skewness LS": pf["LongShort"]}
+        title = f"{label} — Skewness Long-Short"
+        if name == "equity" and market is not None:
+            idx = pf.index.intersection(market.index)
+            series = {"Market EW": market.loc[idx], "Skewness LS": pf.loc[idx, "LongShort"]}
+            title = f"{label} — Market EW vs Skewness Long-Short"
+        jobs.append(
+            FigureJob(
+                f"{name}_cum",
+                "cumulative",
+                title,
+                cumulative(pd.DataFrame(series)),
+                ylabel="Cumulative growth (1 + r)",
+            )
+        )
+
+    jobs += [
+        FigureJob(
+            "all_cum", "cumulative", "Skewness Long-Short — all asset classes",
+            cumulative(ls), ylabel="Cumulative growth (1 + r)",
+        ),
+        FigureJob("drawdowns", "drawdown", "Drawdowns — Skewness Long-Short", drawdown_series(ls)),
+        FigureJob(
+            "rolling_sharpe", "sharpe", f"Rolling {ROLLING_WINDOW}-Month Sharpe Ratio",
+            rolling_sharpe(ls), ylabel="Sharpe (annualized)",
+        ),
+    ]
+    if ls.shape[1] > 1:
+        jobs.append(
+            FigureJob(
+                "corr_heatmap", "heatmap",
+                f"Mean {ROLLING_WINDOW}-Month Rolling Correlation — Skewness LS Strategies",
+                mean_rolling_corr(ls), dpi=200,
+            )
+        )
+    return jobs
+
+
+# -----------------------------------
+# HTML / PDF
+# -----------------------------------
+
+def write_html(
+    path: Path,
+    summary: pd.DataFrame,
+    jobs: Sequence[FigureJob],
+    fig_paths: Dict[str, Path],
+) -> Path:
+    figures = "\n".join(
+        f'<figure><img src="{html.escape(fig_paths[j.name].relative_to(path.parent).as_posix())}" '
+        f'alt="{html.escape(j.title)}"><figcaption>{html.escape(j.title)}</figcaption></figure>'
+        for j in jobs
+    )
+    table = summary.to_html(float_format=lambda v: f"{v:.4f}", border=0, classes="summary")
+    path.write_text(
+        f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Cross-Asset Skewness — report</title>
+<style>
+body {{ font-family: sans-serif; max-width: 980px; margin: 2em auto; color: #222; }}
+table.summary {{ border-collapse: collapse; margin-bottom: 2em; }}
+table.summary th, table.summary td {{
+    padding: 4px 10px; text-align: right; border-bottom: 1px solid #ddd;
+}}
+figure {{ margin: 0 0 2em 0; }}
+img {{ max-width: 100%; }}
+figcaption {{ color: #555; font-size: 0.9em; }}
+</style>
+</head>
+<body>
+<h1>Cross-Asset Skewness — Long-Short strategies</h1>
+<h2>Performance</h2>
+{table}
+<h2>Figures</h2>
+{figures}
+</body>
+</html>
+""",
+        encoding="utf-8",
+    )
+    return path
+
+
+def write_pdf(
+    path: Path,
+    summary: pd.DataFrame,
+    jobs: Sequence[FigureJob],
+    fig_paths: Dict[str, Path],
+) -> Path:
+    """PDF: strona z tabelą + po jednej stronie na (już narysowany) wykres."""
+    import matplotlib.image as mpimg
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    with PdfPages(path) as pdf:
+        fig = Figure(figsize=(11.0, 8.5))
+        ax = fig.add_subplot()
+        ax.axis("off")
+        ax.set_title("Cross-Asset Skewness — Long-Short strategies", fontsize=14)
+        cells = [[f"{v:.4f}" for v in row] for row in summary.to_numpy(dtype=float)]
+        tab = ax.table(
+            cellText=cells,
+            rowLabels=list(summary.index),
+            colLabels=list(summary.columns),
+            loc="center",
+        )
+        tab.scale(1.0, 1.6)
+        pdf.savefig(fig)
+
+        for job in jobs:
+            fig = Figure(figsize=(11.0, 8.5))
+            ax = fig.add_subplot()
+            ax.imshow(mpimg.imread(fig_paths[job.name]))
+            ax.axis("off")
+            pdf.savefig(fig)
+    return path
+
+
+def main(
+    names: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    pdf: bool = False,
+    use_cache: bool = True,
+    out_dir: Path = REPORT_DIR,
+    study=None,
+) -> Path:
+    portfolios, market = load_report_inputs(names, study=study)
+    summary = pd.concat(panel.portfolio_stats(portfolios), names=["Asset Class"]).droplevel(1)
+    summary.index = [LABELS.get(n, n) for n in summary.index]
+
+    jobs = build_jobs(portfolios, market)
+    fig_paths, n_drawn = render_all(jobs, out_dir / "figures", workers=workers, use_cache=use_cache)
+    print(f"[report] wykresy: {len(jobs)} (narysowane: {n_drawn}, z cache: {len(jobs) - n_drawn})")
+
+    html_path = write_html(out_dir / "report.html", summary, jobs, fig_paths)
+    print(f"[report] -> {html_path}")
+    if pdf:
+        print(f"[report] -> {write_pdf(out_dir / 'report.pdf', summary, jobs, fig_paths)}")
+    return html_path
+
+
+if __name__ == "__main__":
+    main()
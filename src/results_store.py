@@ -0,0 +1,265 @@
+"""
+Lokalna baza wyników (SQLite) — zamiast nadpisywanych przy każdym
+przebiegu plików analysis_*_summary.csv / portfolio_*_skewness_ls.csv.
+
+Każdy zapis to jeden przebieg (run) dla jednej klasy aktywów:
+
+    runs    — parametry (okno, estymator, kierunek, częstotliwość, ...)
+              i odcisk danych wejściowych (sha256 stóp zwrotu),
+    series  — dzienne/miesięczne zwroty Long, Short, LongShort,
+    stats   — statystyki (Annualized Mean, Sharpe, ...), format długi.
+
+Indeks (asset_class, window, direction, run_id) obsługuje typowe
+zapytania po przeglądzie parametrów bez skanowania całej tabeli.
+Zapis idzie w jednej transakcji BEGIN IMMEDIATE (executemany), baza
+działa w trybie WAL — kilka procesów może zapisywać równolegle, a
+czytelnicy nie blokują piszących.
+
+    store = ResultsStore()
+    store.record_study(SkewnessStudy().stats())
+    store.stats_table(asset_class="fx", window=12)
+"""
+import hashlib
+import json
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.asset_classes import PROJECT_ROOT, get_spec
+
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "results.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at       TEXT    NOT NULL,
+    asset_class      TEXT    NOT NULL,
+    window           INTEGER,
+    estimator        TEXT,
+    direction        TEXT    NOT NULL,
+    freq             TEXT    NOT NULL,
+    min_assets       INTEGER,
+    data_fingerprint TEXT,
+    params           TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_lookup
+    ON runs (asset_class, window, direction, run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_fingerprint
+    ON runs (data_fingerprint);
+
+CREATE TABLE IF NOT EXISTS series (
+    run_id     INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    date       TEXT    NOT NULL,
+    long       REAL,
+    short      REAL,
+    long_short REAL,
+    PRIMARY KEY (run_id, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS stats (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    stat   TEXT    NOT NULL,
+    value  REAL,
+    PRIMARY KEY (run_id, stat)
+) WITHOUT ROWID;
+"""
+
+# kolumny `runs` dostępne jako filtry w zapytaniach
+_RUN_FILTERS = ("asset_class", "window", "estimator", "direction", "freq", "data_fingerprint")
+
+
+def data_fingerprint(frame: pd.DataFrame) -> str:
+    """sha256 wartości, dat i nazw kolumn — ten sam wynik = te same dane wejściowe."""
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(frame.to_numpy(dtype=float)).tobytes())
+    h.update(np.asarray(frame.index.values.astype("datetime64[ns]").astype(np.int64)).tobytes())
+    h.update("\x1f".join(map(str, frame.columns)).encode())
+    return h.hexdigest()
+
+
+@dataclass
+class RunResult:
+    """Wynik jednego przebiegu dla jednej klasy aktywów."""
+    asset_class: str
+    portfolio: pd.DataFrame
+    stats: Dict[str, float]
+    window: Optional[int] = None
+    estimator: Optional[str] = None
+    freq: str = "M"
+    direction: Optional[str] = None
+    min_assets: Optional[int] = None
+    data_fingerprint: Optional[str] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+class ResultsStore:
+    """Połączenie z bazą wyników; schemat tworzony przy pierwszym użyciu."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB_PATH, timeout: float = 60.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # autocommit — transakcje otwieramy jawnie (BEGIN IMMEDIATE)
+        self.conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Cursor]:
+        """Transakcja z blokadą zapisu od początku — bez wyścigu między procesami."""
+        cur = self.conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            yield cur
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+        cur.execute("COMMIT")
+
+    # -----------------------------------
+    # Zapis
+    # -----------------------------------
+
+    def record(self, results: Sequence[RunResult]) -> List[int]:
+        """Zapisuje przebiegi w jednej transakcji; zwraca ich run_id."""
+        created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        run_ids = []
+        with self._write() as cur:
+            for res in results:
+                spec = get_spec(res.asset_class)
+                direction = res.direction or spec.direction
+                min_assets = res.min_assets if res.min_assets is not None else spec.min_assets
+                cur.execute(
+                    "INSERT INTO runs (created_at, asset_class, window, estimator, direction,"
+                    " freq, min_assets, data_fingerprint, params)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        created_at, res.asset_class, res.window, res.estimator, direction,
+                        res.freq, min_assets, res.data_fingerprint,
+                        json.dumps(res.params, sort_keys=True, default=str),
+                    ),
+                )
+                run_id = cur.lastrowid
+                run_ids.append(run_id)
+
+                pf = res.portfolio
+                dates = pf.index.strftime("%Y-%m-%d")
+                cur.executemany(
+                    "INSERT INTO series (run_id, date, long, short, long_short) VALUES (?, ?, ?, ?, ?)",
+                    zip(
+                        [run_id] * len(pf), dates,
+                        *(_nullable(pf[c]) for c in ("Long", "Short", "LongShort")),
+                    ),
+                )
+                cur.executemany(
+                    "INSERT INTO stats (run_id, stat, value) VALUES (?, ?, ?)",
+                    [(run_id, k, _nullable_scalar(v)) for k, v in res.stats.items()],
+                )
+        return run_ids
+
+    def record_study(self, study, **params) -> List[int]:
+        """Zapisuje wszystkie klasy z policzonego `SkewnessStudy` (po .stats())."""
+        if study.summary is None:
+            study.stats()
+        results = [
+            RunResult(
+                asset_class=spec.name,
+                portfolio=study.portfolios[spec.name],
+                stats={k: float(v.iloc[0]) for k, v in study.summary[spec.name].items()},
+                window=study.window,
+                estimator=study.estimator,
+                data_fingerprint=data_fingerprint(study.returns_panel.to_frame(spec.name)),
+                params=params,
+            )
+            for spec in study.specs
+        ]
+        return self.record(results)
+
+    # -----------------------------------
+    # Zapytania
+    # -----------------------------------
+
+    def runs(self, **filters) -> pd.DataFrame:
+        """Przebiegi spełniające filtry (asset_class=, window=, direction=, ...)."""
+        where, args = _where(filters)
+        return pd.read_sql_query(
+            f"SELECT * FROM runs{where} ORDER BY run_id", self.conn, params=args, index_col="run_id"
+        )
+
+    def stats_table(self, **filters) -> pd.DataFrame:
+        """Parametry + statystyki (wiersz = przebieg), jedno zapytanie z JOIN."""
+        where, args = _where(filters, prefix="r.")
+        long = pd.read_sql_query(
+            "SELECT r.run_id, r.asset_class, r.window, r.estimator, r.direction, r.freq,"
+            " s.stat, s.value"
+            f" FROM runs r JOIN stats s ON s.run_id = r.run_id{where}",
+            self.conn,
+            params=args,
+        )
+        keys = ["run_id", "asset_class", "window", "estimator", "direction", "freq"]
+        if long.empty:
+            return pd.DataFrame(columns=keys).set_index("run_id")
+        # unstack zamiast pivot_table — zachowuje przebiegi z NULL w kluczach
+        table = long.set_index(keys + ["stat"])["value"].unstack("stat")
+        table.columns.name = None
+        return table.reset_index(level=keys[1:]).sort_index()
+
+    def series(self, run_id: int) -> pd.DataFrame:
+        """Zwroty portfela jednego przebiegu (jak portfolio_*_skewness_ls.csv)."""
+        df = pd.read_sql_query(
+            "SELECT date, long AS Long, short AS Short, long_short AS LongShort"
+            " FROM series WHERE run_id = ? ORDER BY date",
+            self.conn,
+            params=(run_id,),
+            index_col="date",
+        )
+        df.index = pd.DatetimeIndex(df.index, name="Date")
+        return df
+
+    def delete(self, run_ids: Sequence[int]) -> None:
+        with self._write() as cur:
+            cur.executemany("DELETE FROM runs WHERE run_id = ?", [(int(r),) for r in run_ids])
+
+
+def _nullable(col: pd.Series) -> List[Optional[float]]:
+    values = col.to_numpy(dtype=float)
+    return [None if np.isnan(v) else float(v) for v in values]
+
+
+def _nullable_scalar(value: float) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def _where(filters: Dict[str, Any], prefix: str = ""):
+    unknown = set(filters) - set(_RUN_FILTERS)
+    if unknown:
+        raise ValueError(f"Nieznane filtry: {sorted(unknown)}. Dostępne: {list(_RUN_FILTERS)}")
+    clauses, args = [], []
+    for key, value in filters.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = list(value)
+            clauses.append(f"{prefix}{key} IN ({', '.join('?' * len(value))})")
+            args.extend(value)
+        else:
+            clauses.append(f"{prefix}{key} = ?")
+            args.append(value)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
@@ -0,0 +1,351 @@
+"""
+Lokalny serwis zapytań: stopy zwrotu wszystkich klas wczytane raz
+i trzymane w pamięci, portfele Long–Short liczone na żądanie.
+
+Zamiast ponownie uruchamiać skrypty (i parsować te same CSV) dla
+innego okna, opóźnienia czy kierunku:
+
+    python -m src serve --port 8765
+    curl "http://127.0.0.1:8765/stats?asset_class=bonds&window=18&lag=2&groups=3"
+
+Kostka (C, T, N) stóp zwrotu jest wczytywana przy starcie; sygnały
+skośności dla par (okno, estymator) liczone są raz i trzymane
+w podręcznym LRU (okno 12M liczymy od razu), więc typowe zapytanie to
+jedno sortowanie kostki i statystyki — milisekundy.
+
+Endpointy (GET):
+
+    /stats   — statystyki LS (jak analysis_*_summary.csv), wiersz = klasa,
+    /series  — zwroty Long, Short, LongShort (format długi: klasa, data),
+    /health  — stan serwisu (klasy, czas wczytania, rozmiar cache).
+
+Parametry: asset_class (powtarzalny albo po przecinku; domyślnie
+wszystkie), window (12), lag (1 = sygnał z t-1), groups (2 = połowy,
+3 = tercyle, ...), direction (low/high; domyślnie ze specyfikacji
+klasy), estimator (moment), format (json albo arrow — strumień Arrow
+IPC, jeśli zainstalowany jest pyarrow).
+
+Wątek obserwujący co `watch_interval` sekund sprawdza czas modyfikacji
+i rozmiar plików stóp zwrotu w data/processed/; po zmianie kostka jest
+wczytywana ponownie, a cache sygnałów czyszczony.
+"""
+import io
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from src import estimators, kernels, panel
+from src.asset_classes import resolve
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+WATCH_INTERVAL = 2.0
+SIGNAL_CACHE_SIZE = 16
+
+
+def _file_state(paths: Sequence[Any]) -> Tuple[Tuple[int, int], ...]:
+    """(mtime_ns, rozmiar) plików — zmiana = nieaktualne dane (brak pliku = (0, 0))."""
+    states = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            states.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            states.append((0, 0))
+    return tuple(states)
+
+
+class PanelService:
+    """
+    Kostka stóp zwrotu w pamięci + cache sygnałów. Metody `long_short`
+    i `stats` można wołać bezpośrednio (np. z notebooka), bez HTTP.
+    """
+
+    def __init__(self, names: Optional[List[str]] = None, cache_size: int = SIGNAL_CACHE_SIZE):
+        self.specs = resolve(names)
+        self.cache_size = cache_size
+        self._lock = threading.RLock()
+        self._signals: "OrderedDict[Tuple[int, str], np.ndarray]" = OrderedDict()
+        self.returns_panel: Optional[panel.CrossAssetPanel] = None
+        self.loaded_at: Optional[float] = None
+        self._state: Tuple[Tuple[int, int], ...] = ()
+        self.reload()
+
+    @property
+    def names(self) -> List[str]:
+        return [s.name for s in self.specs]
+
+    @property
+    def input_paths(self) -> List[Any]:
+        return [s.returns_path for s in self.specs]
+
+    def reload(self) -> None:
+        """Wczytuje kostkę od nowa i czyści cache (okno 12M liczone od razu)."""
+        with self._lock:
+            state = _file_state(self.input_paths)
+            self.returns_panel = panel.load_returns_panel(self.names)
+            self._signals.clear()
+            self._state = state
+            self.loaded_at = time.time()
+            self.signal(12, "moment")
+
+    def is_stale(self) -> bool:
+        return _file_state(self.input_paths) != self._state
+
+    def signal(self, window: int, estimator: str = "moment") -> np.ndarray:
+        """Rolling skośność (C, T, N) dla (okno, estymator) — z cache albo liczona raz."""
+        key = (window, estimator)
+        with self._lock:
+            if key in self._signals:
+                self._signals.move_to_end(key)
+                return self._signals[key]
+            values = estimators.rolling_skewness(
+                self.returns_panel.values, window=window, estimator=estimator
+            )
+            self._signals[key] = values
+            while len(self._signals) > self.cache_size:
+                self._signals.popitem(last=False)
+            return values
+
+    def long_short(
+        self,
+        names: Optional[Sequence[str]] = None,
+        window: int = 12,
+        lag: int = 1,
+        groups: int = 2,
+        direction: Optional[str] = None,
+        estimator: str = "moment",
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Portfele Long–Short (jak `panel.skewness_portfolios`) dla wybranych
+        klas: sygnał z t-lag, nogi = skrajne grupy z `groups`, kierunek
+        z argumentu albo ze specyfikacji klasy.
+        """
+        if window < 3:
+            raise ValueError(
+                f"window musi być >= 3 (skośność z co najmniej 3 obserwacji), nie {window!r}."
+            )
+        if groups < 2:
+            raise ValueError(f"groups musi być >= 2, nie {groups!r}.")
+        if lag < 1:
+            raise ValueError(f"lag musi być >= 1 (sygnał znany przed okresem), nie {lag!r}.")
+        if direction not in (None, "low", "high"):
+            raise ValueError(f"Nieznany kierunek: {direction!r} (oczekiwano 'low' albo 'high').")
+        specs = resolve(list(names) if names else self.names)
+
+        with self._lock:
+            rets = self.returns_panel
+            skew = self.signal(window, estimator)
+        idx = [rets.index_of(s.name) for s in specs]
+        for c, spec in zip(idx, specs):
+            # noga to n // groups aktywów — przy groups > n obie nogi są puste
+            n_assets = len(rets.assets[c])
+            if groups > n_assets:
+                raise ValueError(
+                    f"groups={groups} > liczba aktywów klasy {spec.name} ({n_assets})."
+                )
+        signal = kernels.lag(skew[idx], lag)
+        min_assets = np.array([s.min_assets for s in specs])[:, None, None]
+        bottom, top, _ = kernels.long_short_returns(
+            signal, rets.values[idx], min_assets=min_assets, direction="low", groups=groups
+        )
+
+        out = {}
+        for k, (c, spec) in enumerate(zip(idx, specs)):
+            long_ret, short_ret = bottom[k], top[k]
+            if (direction or spec.direction) == "high":
+                long_ret, short_ret = short_ret, long_ret
+            keep = rets.date_mask[c] & ~np.isnan(long_ret)
+            out[spec.name] = pd.DataFrame(
+                {
+                    "Long": long_ret[keep],
+                    "Short": short_ret[keep],
+                    "LongShort": long_ret[keep] - short_ret[keep],
+                },
+                index=pd.DatetimeIndex(rets.dates[keep], name="Date"),
+            )
+        return out
+
+    def stats(self, **query: Any) -> pd.DataFrame:
+        """Statystyki LS (wiersz = klasa) dla parametrów jak w `long_short`."""
+        portfolios = self.long_short(**query)
+        table = pd.concat(panel.portfolio_stats(portfolios), names=["Asset Class"]).droplevel(1)
+        table.insert(0, "Months", [len(pf) for pf in portfolios.values()])
+        return table
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "asset_classes": self.names,
+                "dates": [
+                    str(self.returns_panel.dates[0].date()),
+                    str(self.returns_panel.dates[-1].date()),
+                ],
+                "loaded_at": self.loaded_at,
+                "cached_signals": [list(k) for k in self._signals],
+            }
+
+
+class FileWatcher(threading.Thread):
+    """Sprawdza co `interval` sekund, czy pliki wejściowe się zmieniły; jeśli tak — reload()."""
+
+    def __init__(self, service: PanelService, interval: float = WATCH_INTERVAL):
+        super().__init__(daemon=True, name="skew-file-watcher")
+        self.service = service
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            if self.service.is_stale():
+                try:
+                    self.service.reload()
+                    stamp = time.strftime("%H:%M:%S")
+                    print(f"[serve] dane zmienione — wczytano ponownie ({stamp})")
+                except Exception as exc:
+                    # plik w trakcie zapisu — spróbujemy przy następnym sprawdzeniu
+                    print(f"[serve] nie udało się wczytać danych: {exc}")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+# -----------------------------------
+# Serializacja
+# -----------------------------------
+
+def _json_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Wiersze jako słowniki; NaN -> null, daty -> ISO."""
+    records = []
+    for row in frame.reset_index().to_dict(orient="records"):
+        records.append({
+            k: (None if isinstance(v, float) and math.isnan(v)
+                else v.isoformat()[:10] if isinstance(v, pd.Timestamp)
+                else v.item() if isinstance(v, np.generic)
+                else v)
+            for k, v in row.items()
+        })
+    return records
+
+
+def _arrow_stream(frame: pd.DataFrame) -> bytes:
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame.reset_index(), preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _parse_query(qs: Dict[str, List[str]]) -> Dict[str, Any]:
+    names = [n for value in qs.get("asset_class", []) for n in value.split(",") if n]
+    first = {k: v[-1] for k, v in qs.items()}
+    return {
+        "names": names or None,
+        "window": int(first.get("window", 12)),
+        "lag": int(first.get("lag", 1)),
+        "groups": int(first.get("groups", 2)),
+        "direction": first.get("direction"),
+        "estimator": first.get("estimator", "moment"),
+    }
+
+
+def make_handler(service: PanelService):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            qs = parse_qs(url.query)
+            fmt = qs.get("format", ["json"])[-1]
+            t0 = time.perf_counter()
+            try:
+                if url.path == "/health":
+                    self._send_json(200, service.health())
+                    return
+                if url.path not in ("/stats", "/series"):
+                    self._send_json(404, {"error": f"nieznana ścieżka {url.path}"})
+                    return
+                query = _parse_query(qs)
+                if url.path == "/stats":
+                    frame = service.stats(**query)
+                else:
+                    frame = pd.concat(service.long_short(**query), names=["Asset Class"])
+            except (ValueError, KeyError) as exc:
+                self._send_json(400, {"error": str(exc)})
+                return
+
+            elapsed = (time.perf_counter() - t0) * 1e3
+            if fmt == "arrow":
+                try:
+                    body = _arrow_stream(frame)
+                except ImportError:
+                    self._send_json(406, {"error": "format=arrow wymaga pyarrow"})
+                    return
+                self._send(200, body, "application/vnd.apache.arrow.stream")
+            else:
+                query["names"] = query["names"] or service.names
+                self._send_json(
+                    200,
+                    {
+                        "query": query,
+                        "elapsed_ms": round(elapsed, 3),
+                        "data": _json_records(frame),
+                    },
+                )
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            self._send(status, json.dumps(payload).encode(), "application/json")
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def main(
+    names: Optional[List[str]] = None,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    watch_interval: float = WATCH_INTERVAL,
+) -> None:
+    t0 = time.perf_counter()
+    service = PanelService(names)
+    print(
+        f"[serve] {', '.join(service.names)} wczytane w {time.perf_counter() - t0:.2f}s; "
+        f"http://{host}:{port}/stats?asset_class=...&window=12&lag=1&groups=2"
+    )
+    watcher = None
+    if watch_interval > 0:
+        watcher = FileWatcher(service, watch_interval)
+        watcher.start()
+
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if watcher is not None:
+            watcher.stop()
+            watcher.join()
+
+
+if __name__ == "__main__":
+    main()
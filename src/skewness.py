@@ -2,7 +2,8 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-from scipy.stats import skew
+
+from src import estimators
 
 
 # -----------------------------------
@@ -32,16 +33,13 @@ def load_monthly_returns(path: Path) -> pd.DataFrame:
     return df.sort_index()
 
 
-def compute_rolling_skewness(returns: pd.DataFrame, window: int = 12) -> pd.DataFrame:
-    """Liczy rolling skośność 12M dla każdego indeksu."""
-    def skew_func(x):
-        return skew(x, bias=False, nan_policy="omit")
-
-    skew_df = returns.rolling(window=window, min_periods=window).apply(
-        skew_func,
-        raw=True,
-    )
-    return skew_df
+def compute_rolling_skewness(
+    returns: pd.DataFrame,
+    window: int = 12,
+    estimator: str = "moment",
+) -> pd.DataFrame:
+    """Liczy rolling skośność 12M dla każdego indeksu (estymator: patrz src.estimators)."""
+    return estimators.skewness_frame(returns, window=window, estimator=estimator)
 
 
 def main():
@@ -1,7 +1,10 @@
 from pathlib import Path
 
 import pandas as pd
-from scipy.stats import skew
+
+from src import estimators
+from src.asset_classes import SAMPLE_PERIOD
+from src.storage import read_frame
 
 # -----------------------------------------
 # Ścieżki
@@ -19,10 +22,8 @@ def load_monthly_bonds(min_obs: int = 80) -> pd.DataFrame:
     które mają co najmniej `min_obs` niepustych obserwacji.
     Przycinamy okres do 2005–2025 (spójnie z FX i equity).
     """
-    bonds = pd.read_csv(BOND_RET_PATH, index_col=0, parse_dates=True)
-
-    # okres 2005–2025
-    bonds = bonds.loc["2005-01-01":"2025-01-01"]
+    # okres 2005–2025 czytany już przy odczycie pliku
+    bonds = read_frame(BOND_RET_PATH, *SAMPLE_PERIOD)
 
     # filtracja po liczbie obserwacji
     good_cols = [c for c in bonds.columns if bonds[c].notna().sum() >= min_obs]
@@ -34,17 +35,16 @@ def load_monthly_bonds(min_obs: int = 80) -> pd.DataFrame:
     return bonds
 
 
-def compute_rolling_skewness(returns: pd.DataFrame, window: int = 12) -> pd.DataFrame:
+def compute_rolling_skewness(
+    returns: pd.DataFrame,
+    window: int = 12,
+    estimator: str = "moment",
+) -> pd.DataFrame:
     """
     Oblicza 12-miesięczną skośność (rolling skewness) dla każdej serii.
+    `estimator` wybiera miarę skośności (patrz src.estimators).
     """
-    def skew_func(x):
-        return skew(x, bias=False, nan_policy="omit")
-
-    skew_df = returns.rolling(window=window, min_periods=window).apply(
-        skew_func, raw=True
-    )
-    return skew_df
+    return estimators.skewness_frame(returns, window=window, estimator=estimator)
 
 
 def main():
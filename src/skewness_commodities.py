@@ -1,6 +1,9 @@
 from pathlib import Path
 import pandas as pd
-from scipy.stats import skew
+
+from src import estimators
+from src.asset_classes import SAMPLE_PERIOD
+from src.storage import read_frame
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_PROCESSED = PROJECT_ROOT / "data" / "processed"
@@ -10,8 +13,8 @@ SKEW_PATH = DATA_PROCESSED / "commodities_skewness_12m.csv"
 
 
 def load_monthly_cmdty(min_obs: int = 80) -> pd.DataFrame:
-    rets = pd.read_csv(RET_PATH, index_col=0, parse_dates=True)
-    rets = rets.loc["2005-01-01":"2025-01-01"]
+    # okres 2005–2025 czytany już przy odczycie pliku
+    rets = read_frame(RET_PATH, *SAMPLE_PERIOD)
 
     good_cols = [c for c in rets.columns if rets[c].notna().sum() >= min_obs]
     rets = rets[good_cols].sort_index()
@@ -21,14 +24,12 @@ def load_monthly_cmdty(min_obs: int = 80) -> pd.DataFrame:
     return rets
 
 
-def compute_rolling_skewness(returns: pd.DataFrame, window: int = 12) -> pd.DataFrame:
-    def skew_func(x):
-        return skew(x, bias=False, nan_policy="omit")
-
-    skew_df = returns.rolling(window=window, min_periods=window).apply(
-        skew_func, raw=True
-    )
-    return skew_df
+def compute_rolling_skewness(
+    returns: pd.DataFrame,
+    window: int = 12,
+    estimator: str = "moment",
+) -> pd.DataFrame:
+    return estimators.skewness_frame(returns, window=window, estimator=estimator)
 
 
 def main():
@@ -1,7 +1,8 @@
 from pathlib import Path
 
 import pandas as pd
-from scipy.stats import skew
+
+from src import estimators
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -23,11 +24,12 @@ def load_monthly_fx(min_obs: int = 120) -> pd.DataFrame:
     return fx
 
 
-def compute_rolling_skewness(returns: pd.DataFrame, window: int = 12) -> pd.DataFrame:
-    def skew_func(x):
-        return skew(x, bias=False, nan_policy="omit")
-
-    return returns.rolling(window=window, min_periods=window).apply(skew_func, raw=True)
+def compute_rolling_skewness(
+    returns: pd.DataFrame,
+    window: int = 12,
+    estimator: str = "moment",
+) -> pd.DataFrame:
+    return estimators.skewness_frame(returns, window=window, estimator=estimator)
 
 
 def main():
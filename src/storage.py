@@ -0,0 +1,145 @@
+"""
+Odczyt plików CSV z przedziałem dat i podzbiorem kolumn przepchniętym
+do warstwy I/O.
+
+Pliki w data/ to tablice (data x aktywo) posortowane po dacie. Przy
+pierwszym odczycie pliku zapamiętujemy jego "indeks": daty wierszy
+i pozycje bajtowe początków linii. Kolejne odczyty z `start`/`end`
+czytają tylko zakres bajtów potrzebnych wierszy (seek + read), a
+`columns` ogranicza parsowanie do wybranych kolumn — pamięć i I/O
+rosną z żądanym oknem, nie z rozmiarem archiwum. Indeks jest zapisywany
+obok pliku (.<nazwa>.rowidx.npz), więc kolejne procesy (CLI, pula
+`src.parallel`) nie czytają i nie parsują całego pliku od nowa; jest
+unieważniany, gdy zmieni się rozmiar albo czas modyfikacji pliku.
+
+    read_frame(path, "2005-01-01", "2025-01-01", columns=["DE", "FR"])
+
+daje to samo co
+
+    pd.read_csv(path, index_col=0, parse_dates=True).loc["2005-01-01":"2025-01-01", ["DE", "FR"]]
+
+(obie granice włącznie). Pliki nieposortowane są czytane w całości
+i filtrowane po wczytaniu.
+"""
+import io
+import os
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+PathLike = Union[str, Path]
+
+# ścieżka -> (mtime_ns, rozmiar, daty wierszy, offsety początków linii danych + koniec)
+_INDEX: Dict[str, Tuple[int, int, pd.DatetimeIndex, np.ndarray]] = {}
+
+
+def sidecar_path(path: PathLike) -> Path:
+    path = Path(path)
+    return path.with_name(f".{path.name}.rowidx.npz")
+
+
+def _load_sidecar(path: str, key: Tuple[int, int]) -> Optional[Tuple[pd.DatetimeIndex, np.ndarray]]:
+    try:
+        with np.load(sidecar_path(path)) as data:
+            if tuple(data["key"]) != key:
+                return None
+            return pd.DatetimeIndex(data["dates"].astype("datetime64[ns]")), data["offsets"]
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _save_sidecar(
+    path: str,
+    key: Tuple[int, int],
+    dates: pd.DatetimeIndex,
+    offsets: np.ndarray,
+) -> None:
+    """Zapis atomowy (tymczasowy plik + replace); katalog tylko do odczytu to nie błąd."""
+    target = sidecar_path(path)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                key=np.array(key, dtype=np.int64),
+                dates=dates.values.astype("datetime64[ns]").view(np.int64),
+                offsets=offsets.astype(np.int64),
+            )
+        os.replace(tmp, target)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def row_index(path: PathLike) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+    """
+    Daty wierszy i offsety bajtowe: wiersz i zajmuje bajty
+    [offsets[i], offsets[i + 1]). Liczone raz na wersję pliku
+    (pamięć procesu, potem plik obok CSV).
+    """
+    path = str(path)
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _INDEX.get(path)
+    if cached is not None and cached[:2] == key:
+        return cached[2], cached[3]
+
+    stored = _load_sidecar(path, key)
+    if stored is not None:
+        _INDEX[path] = key + stored
+        return stored
+
+    buf = np.fromfile(path, dtype=np.uint8)
+    starts = np.r_[0, np.flatnonzero(buf == ord("\n")) + 1]
+    if starts[-1] != len(buf):
+        starts = np.r_[starts, len(buf)]
+    offsets = starts[1:]  # bez linii nagłówka
+
+    dates = pd.read_csv(io.BytesIO(buf.tobytes()), usecols=[0], index_col=0, parse_dates=True).index
+    if len(dates) != len(offsets) - 1:
+        # puste linie / pola z cudzysłowem i nową linią — bez offsetów
+        offsets = np.array([], dtype=np.int64)
+
+    dates = pd.DatetimeIndex(dates)
+    _INDEX[path] = key + (dates, offsets)
+    _save_sidecar(path, key, dates, offsets)
+    return dates, offsets
+
+
+def read_frame(
+    path: PathLike,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Ramka (daty x kolumny) z wierszami [start, end] i kolumnami `columns` (w tej kolejności)."""
+    header = pd.read_csv(path, index_col=0, nrows=0).columns
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = [0] + [i + 1 for i, c in enumerate(header) if c in wanted]
+
+    source: Union[PathLike, io.BytesIO] = path
+    sliced = False
+    if start is not None or end is not None:
+        dates, offsets = row_index(path)
+        if len(offsets) and dates.is_monotonic_increasing:
+            lo = 0 if start is None else dates.searchsorted(pd.Timestamp(start), side="left")
+            hi = len(dates) if end is None else dates.searchsorted(pd.Timestamp(end), side="right")
+            with open(path, "rb") as f:
+                head = f.read(offsets[0])
+                f.seek(offsets[lo])
+                body = f.read(offsets[hi] - offsets[lo]) if hi > lo else b""
+            source = io.BytesIO(head + body)
+            sliced = True
+
+    df = pd.read_csv(source, index_col=0, parse_dates=True, usecols=usecols)
+    if df.empty:
+        df.index = pd.DatetimeIndex(df.index, name=df.index.name)
+    if not sliced and (start is not None or end is not None):
+        df = df.sort_index().loc[start:end]
+    if columns is not None:
+        # reindex, nie df[...]: pandas gubi kolumny z usecols przy pliku bez wierszy
+        df = df.reindex(columns=[c for c in columns if c in header])
+    return df
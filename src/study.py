@@ -0,0 +1,163 @@
+"""
+API w Pythonie do całego pipeline'u, bez plików pośrednich:
+
+    from src.study import SkewnessStudy
+
+    study = SkewnessStudy("fx").returns().skewness(window=12).portfolio().stats()
+    study.summary["fx"]
+    study.portfolios["fx"]
+
+Etapy przekazują sobie kostki (C, T, N) z `src.panel` w pamięci — sygnał
+leży na tych samych osiach co stopy zwrotu, więc nie ma ponownego
+wczytywania CSV, parsowania dat ani przecinania kolumn i dat między
+etapami. Zapis jest opcjonalny: persist=True zapisuje wynik każdego
+etapu do tych samych plików co skrypty / CLI (sygnał inny niż 12M
+moment — ze znacznikiem `frequency.signal_tag` w nazwie), a `save()`
+zapisuje to, co już policzono.
+
+Pominięty etap jest liczony z parametrami domyślnymi, np.
+`SkewnessStudy().stats()` wczyta stopy zwrotu, policzy skośność 12M
+i portfele.
+"""
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+
+from src import attribution, panel
+from src.asset_classes import resolve
+from src.frequency import signal_tag
+from src.panel import CrossAssetPanel
+
+
+class SkewnessStudy:
+    """
+    asset_classes: nazwa klasy, lista nazw albo None (wszystkie z rejestru).
+    persist:       zapisywać wynik każdego etapu do data/processed/.
+    workers:       liczba procesów dla sortowań i statystyk (1 = w tym procesie).
+    """
+
+    def __init__(
+        self,
+        asset_classes: Union[str, Sequence[str], None] = None,
+        persist: bool = False,
+        workers: int = 1,
+    ):
+        if isinstance(asset_classes, str):
+            asset_classes = [asset_classes]
+        self.specs = resolve(list(asset_classes) if asset_classes else None)
+        self.persist = persist
+        self.workers = workers
+
+        self.returns_panel: Optional[CrossAssetPanel] = None
+        self.skew_panel: Optional[CrossAssetPanel] = None
+        self.portfolios: Optional[Dict[str, pd.DataFrame]] = None
+        self.contributions: Optional[Dict[str, pd.DataFrame]] = None
+        self.summary: Optional[Dict[str, pd.DataFrame]] = None
+        self.window: Optional[int] = None
+        self.estimator: Optional[str] = None
+
+    @property
+    def names(self) -> List[str]:
+        return [s.name for s in self.specs]
+
+    @property
+    def tag(self) -> str:
+        """Znacznik plików wynikowych ("" dla domyślnego sygnału 12M moment)."""
+        return signal_tag(self.window or 12, self.estimator or "moment")
+
+    def __repr__(self) -> str:
+        done = [
+            stage
+            for stage, value in [
+                ("returns", self.returns_panel),
+                ("skewness", self.skew_panel),
+                ("portfolio", self.portfolios),
+                ("stats", self.summary),
+            ]
+            if value is not None
+        ]
+        return f"SkewnessStudy({self.names}, done={done})"
+
+    # -----------------------------------
+    # Etapy (każdy zwraca self)
+    # -----------------------------------
+
+    def returns(self, frames: Optional[Mapping[str, pd.DataFrame]] = None) -> "SkewnessStudy":
+        """
+        Stopy zwrotu z data/processed/ albo z podanych ramek {klasa: DataFrame}
+        (np. już wczytanych w notebooku). Filtr okresu i min_obs jak w skryptach.
+        """
+        if frames is None:
+            self.returns_panel = panel.load_returns_panel(self.names)
+        else:
+            self.returns_panel = panel.stack_frames(
+                self.names, [panel.clean_returns(frames[s.name], s) for s in self.specs]
+            )
+        self.skew_panel = self.portfolios = self.contributions = self.summary = None
+        return self
+
+    def skewness(self, window: int = 12, estimator: str = "moment") -> "SkewnessStudy":
+        if self.returns_panel is None:
+            self.returns()
+        self.skew_panel = panel.rolling_skewness(
+            self.returns_panel, window=window, estimator=estimator
+        )
+        self.window, self.estimator = window, estimator
+        self.portfolios = self.contributions = self.summary = None
+        if self.persist:
+            self._save_skewness()
+        return self
+
+    def portfolio(self) -> "SkewnessStudy":
+        if self.skew_panel is None:
+            self.skewness()
+        self.contributions = {}
+        self.portfolios = panel.skewness_portfolios(
+            self.returns_panel, self.skew_panel, self.specs, workers=self.workers,
+            contributions=self.contributions,
+        )
+        self.summary = None
+        if self.persist:
+            panel.save_portfolios(self.portfolios, self.specs, tag=self.tag)
+            attribution.save_attribution(self.contributions, self.specs, tag=self.tag)
+        return self
+
+    def stats(self) -> "SkewnessStudy":
+        if self.portfolios is None:
+            self.portfolio()
+        self.summary = panel.portfolio_stats(self.portfolios, workers=self.workers)
+        if self.persist:
+            panel.save_summaries(self.summary, self.specs, tag=self.tag)
+        return self
+
+    # -----------------------------------
+    # Wyniki
+    # -----------------------------------
+
+    def skewness_frame(self, name: str) -> pd.DataFrame:
+        """Sygnał jednej klasy jako DataFrame (jak w pliku *_skewness_12m.csv)."""
+        return self.skew_panel.to_frame(name)
+
+    def attribution_table(self, name: str) -> pd.DataFrame:
+        """Skumulowany wkład aktywów klasy do LongShort (patrz `src.attribution`)."""
+        return attribution.cumulative_attribution(self.contributions[name])
+
+    def summary_table(self) -> pd.DataFrame:
+        """Statystyki wszystkich klas w jednej tabeli (wiersz = klasa)."""
+        return pd.concat(self.summary, names=["Asset Class"]).droplevel(1)
+
+    def save(self) -> "SkewnessStudy":
+        """Zapisuje wszystko, co już policzono, do plików z rejestru."""
+        if self.skew_panel is not None:
+            self._save_skewness()
+        if self.portfolios is not None:
+            panel.save_portfolios(self.portfolios, self.specs, tag=self.tag)
+            attribution.save_attribution(self.contributions, self.specs, tag=self.tag)
+        if self.summary is not None:
+            panel.save_summaries(self.summary, self.specs, tag=self.tag)
+        return self
+
+    def _save_skewness(self) -> None:
+        panel.save_skewness(
+            self.skew_panel, self.specs, label=f"{self.window}M ({self.estimator}) ", tag=self.tag
+        )
@@ -0,0 +1,167 @@
+"""
+Statystyki portfeli LS w podokresach oraz w oknach rozszerzających
+i kroczących — bez ponownego cięcia danych i uruchamiania analysis_*.py.
+
+Każdy przedział to para pozycji [start, stop) na osi dat portfela;
+`kernels.interval_stats` liczy średnią, odchylenie, Sharpe i t-stat dla
+wszystkich przedziałów naraz z sum skumulowanych (O(1) na przedział):
+
+    subperiods — lista (etykieta, początek, koniec), domyślnie pełna próba,
+                 przed/od 2008 i przed/od 2020 oraz każdy rok kalendarzowy,
+    expanding  — od początku próby do każdej daty,
+    rolling    — ostatnie `window` okresów do każdej daty.
+
+Wyniki: data/processed/analysis_<klasa>_subperiods.csv (wiersz = podokres),
+analysis_<klasa>_expanding.csv i analysis_<klasa>_rolling_<window>.csv
+(wiersz = data końca okna).
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src import kernels
+from src.asset_classes import DATA_PROCESSED_DIR, AssetClassSpec, resolve
+from src.frequency import freq_path, periods_per_year
+
+# (etykieta, początek, koniec) — granice włącznie, None = brzeg próby
+Subperiod = Tuple[str, Optional[str], Optional[str]]
+
+DEFAULT_BREAKS = ("2008-01-01", "2020-01-01")
+ROLLING_WINDOW = 36
+
+
+def split_periods(breaks: Sequence[str] = DEFAULT_BREAKS) -> List[Subperiod]:
+    """Pełna próba oraz "przed" / "od" każdej daty podziału."""
+    periods: List[Subperiod] = [("full", None, None)]
+    for b in breaks:
+        b = pd.Timestamp(b)
+        periods.append((f"pre-{b:%Y-%m}", None, str((b - pd.Timedelta(days=1)).date())))
+        periods.append((f"{b:%Y-%m}-", str(b.date()), None))
+    return periods
+
+
+def calendar_years(dates: pd.DatetimeIndex) -> List[Subperiod]:
+    """Jeden podokres na każdy rok obecny w `dates`."""
+    return [(str(y), f"{y}-01-01", f"{y}-12-31") for y in sorted(set(dates.year))]
+
+
+def period_bounds(
+    dates: pd.DatetimeIndex, periods: Sequence[Subperiod]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Pozycje [start, stop) podokresów na posortowanej osi dat."""
+    starts = np.array([
+        0 if start is None else dates.searchsorted(pd.Timestamp(start), side="left")
+        for _, start, _ in periods
+    ])
+    stops = np.array([
+        len(dates) if end is None else dates.searchsorted(pd.Timestamp(end), side="right")
+        for _, _, end in periods
+    ])
+    return starts, np.maximum(stops, starts)
+
+
+def _stack(portfolios: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """LongShort wszystkich klas na wspólnej osi dat (NaN poza kalendarzem klasy)."""
+    return pd.concat(
+        [pf["LongShort"].rename(name) for name, pf in portfolios.items()], axis=1, sort=True
+    )
+
+
+def _frames(
+    stats: Dict[str, np.ndarray], names: Sequence[str], index: pd.Index
+) -> Dict[str, pd.DataFrame]:
+    return {
+        name: pd.DataFrame({k: v[c] for k, v in stats.items()}, index=index)
+        for c, name in enumerate(names)
+    }
+
+
+def subperiod_stats(
+    portfolios: Dict[str, pd.DataFrame],
+    periods: Optional[Sequence[Subperiod]] = None,
+    freq: str = "M",
+) -> Dict[str, pd.DataFrame]:
+    """Statystyki LS w podokresach (wiersz = podokres); domyślnie podziały 2008/2020 + lata."""
+    ls = _stack(portfolios)
+    if periods is None:
+        periods = split_periods() + calendar_years(ls.index)
+    starts, stops = period_bounds(ls.index, periods)
+    stats = kernels.interval_stats(ls.to_numpy().T, starts, stops, periods_per_year(freq))
+    return _frames(stats, list(portfolios), pd.Index([p[0] for p in periods], name="Period"))
+
+
+def expanding_stats(portfolios: Dict[str, pd.DataFrame], freq: str = "M") -> Dict[str, pd.DataFrame]:
+    """Statystyki od początku próby do każdej daty (wiersz = data końca)."""
+    ls = _stack(portfolios)
+    stops = np.arange(1, len(ls) + 1)
+    stats = kernels.interval_stats(
+        ls.to_numpy().T, np.zeros_like(stops), stops, periods_per_year(freq)
+    )
+    frames = _frames(stats, list(portfolios), ls.index)
+    return {name: frames[name].loc[pf.index] for name, pf in portfolios.items()}
+
+
+def rolling_stats(
+    portfolios: Dict[str, pd.DataFrame],
+    window: int = ROLLING_WINDOW,
+    freq: str = "M",
+) -> Dict[str, pd.DataFrame]:
+    """
+    Statystyki w kroczącym oknie `window` obserwacji portfela (wiersz =
+    data końca okna; NaN, dopóki okno nie jest pełne).
+    """
+    out = {}
+    for name, pf in portfolios.items():
+        ls = pf["LongShort"].to_numpy(dtype=float)
+        stops = np.arange(1, len(ls) + 1)
+        starts = np.maximum(stops - window, 0)
+        stats = kernels.interval_stats(ls, starts, stops, periods_per_year(freq))
+        frame = pd.DataFrame(stats, index=pf.index)
+        frame.loc[frame["Observations"] < window, :] = np.nan
+        out[name] = frame
+    return out
+
+
+def output_paths(
+    spec: AssetClassSpec, window: int = ROLLING_WINDOW, freq: str = "M"
+) -> Tuple[Path, ...]:
+    return tuple(
+        freq_path(DATA_PROCESSED_DIR / f"analysis_{spec.name}_{suffix}.csv", freq)
+        for suffix in ("subperiods", "expanding", f"rolling_{window}")
+    )
+
+
+def main(
+    names: Optional[List[str]] = None,
+    window: int = ROLLING_WINDOW,
+    freq: str = "M",
+    breaks: Sequence[str] = DEFAULT_BREAKS,
+) -> None:
+    specs = resolve(names)
+    portfolios = {
+        s.name: pd.read_csv(freq_path(s.portfolio_path, freq), index_col=0, parse_dates=True)
+        for s in specs
+    }
+
+    periods = split_periods(breaks)
+    sub = subperiod_stats(
+        portfolios, periods=periods + calendar_years(_stack(portfolios).index), freq=freq
+    )
+    expanding = expanding_stats(portfolios, freq=freq)
+    rolling = rolling_stats(portfolios, window=window, freq=freq)
+
+    for spec in specs:
+        sub_path, exp_path, roll_path = output_paths(spec, window=window, freq=freq)
+        sub_path.parent.mkdir(parents=True, exist_ok=True)
+        sub[spec.name].to_csv(sub_path)
+        expanding[spec.name].to_csv(exp_path)
+        rolling[spec.name].to_csv(roll_path)
+        print(f"[{spec.name}] podokresy -> {sub_path}")
+        print(f"[{spec.name}] okna rozszerzające / kroczące {window} -> {exp_path}, {roll_path}")
+        print(sub[spec.name].head(len(periods)).round(3))
+
+
+if __name__ == "__main__":
+    main()
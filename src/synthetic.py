@@ -0,0 +1,240 @@
+"""
+Syntetyczne panele stóp zwrotu o zadanej skośności — do testów skali
+i poprawności pipeline'u bez pobierania danych.
+
+Panel (okresy x aktywa) dowolnej wielkości, zapisywany strumieniowo
+blokami wierszy w formatach projektu:
+
+    freq="M" — miesięczne stopy zwrotu (jak data/processed/*_monthly_returns.csv),
+    freq="D" — dzienne ceny (jak data/raw/*_daily_prices.csv, wejście
+               `compute_monthly_returns` / trybu highfreq / realized).
+
+Rozkłady (każde aktywo z własnym parametrem skośności):
+
+    "jump"   — dyfuzja + skoki Bernoulliego o losowym znaku i wielkości,
+    "skewt"  — skośny t Fernándeza–Steela (df, gamma), standaryzowany,
+    "normal" — bez skośności (kontrola).
+
+Braki: losowe pojedyncze obserwacje (`missing`), rozłożone w czasie
+debiuty (`listing`) i część aktywów wycofywana przed końcem (`delisting`).
+Pamięć zależy tylko od `chunk_rows` x liczba aktywów — panel 10k aktywów
+x 5000 dni nie musi mieścić się w pamięci naraz.
+
+    spec = SyntheticSpec(n_assets=10_000, n_periods=240)
+    write_panel(spec, "data/synthetic/synthetic_monthly_returns.csv")
+    SkewnessStudy("equity").returns({"equity": synthetic_frame(spec)})
+
+Ten sam `seed` i `chunk_rows` dają te same dane.
+"""
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.asset_classes import PROJECT_ROOT
+from src.frequency import periods_per_year
+
+SYNTHETIC_DIR = PROJECT_ROOT / "data" / "synthetic"
+DISTRIBUTIONS = ("jump", "skewt", "normal")
+
+
+@dataclass
+class SyntheticSpec:
+    """
+    n_assets, n_periods: rozmiar panelu,
+    freq:          "M" (stopy zwrotu) albo "D" (ceny, dni robocze),
+    distribution:  "jump", "skewt" albo "normal",
+    annual_vol, annual_mean: poziom zmienności i dryfu (annualizowane),
+    jump_prob:     prawdopodobieństwo skoku w okresie ("jump"),
+    jump_size:     zakres |średniej skoku| w odchyleniach standardowych,
+    df, gamma:     stopnie swobody i zakres parametru asymetrii ("skewt";
+                   gamma < 1 -> skośność ujemna, > 1 -> dodatnia),
+    missing:       udział losowych braków,
+    listing:       część próby, w której debiutują aktywa (0 = wszystkie od początku),
+    delisting:     udział aktywów wycofanych przed końcem próby,
+    chunk_rows:    wierszy w bloku (None = tak, by blok miał ~64 MB).
+    """
+    n_assets: int = 1000
+    n_periods: int = 240
+    freq: str = "M"
+    start: str = "2005-01-01"
+    distribution: str = "jump"
+    annual_vol: float = 0.16
+    annual_mean: float = 0.06
+    jump_prob: float = 0.05
+    jump_size: Tuple[float, float] = (1.0, 4.0)
+    df: float = 5.0
+    gamma: Tuple[float, float] = (0.7, 1.4)
+    missing: float = 0.01
+    listing: float = 0.5
+    delisting: float = 0.1
+    seed: int = 0
+    chunk_rows: Optional[int] = None
+    assets: pd.Index = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.freq not in ("M", "D"):
+            raise ValueError(f"freq 'M' albo 'D', nie {self.freq!r}.")
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Nieznany rozkład: {self.distribution!r}. Dostępne: {DISTRIBUTIONS}")
+        width = len(str(self.n_assets))
+        self.assets = pd.Index([f"A{j:0{width}d}" for j in range(self.n_assets)])
+        if self.chunk_rows is None:
+            self.chunk_rows = max(1, (64 * 2 ** 20) // (8 * 8 * max(1, self.n_assets)))
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        if self.freq == "M":
+            months = pd.date_range(self.start, periods=self.n_periods, freq="MS")
+            return months + pd.offsets.MonthEnd(0)
+        return pd.bdate_range(self.start, periods=self.n_periods)
+
+
+@dataclass
+class _AssetParams:
+    listed: np.ndarray      # (N,) pierwszy wiersz z obserwacją
+    delisted: np.ndarray    # (N,) pierwszy wiersz po wycofaniu
+    shape: np.ndarray       # (N,) średnia skoku (w sigmach) albo gamma
+
+
+def _asset_params(spec: SyntheticSpec, rng: np.random.Generator) -> _AssetParams:
+    n, t = spec.n_assets, spec.n_periods
+    listed = rng.integers(0, max(1, int(spec.listing * t)), size=n)
+    delisted = np.full(n, t)
+    gone = rng.random(n) < spec.delisting
+    delisted[gone] = rng.integers(np.minimum(listed[gone] + 1, t), t + 1)
+
+    if spec.distribution == "jump":
+        sign = np.where(rng.random(n) < 0.5, -1.0, 1.0)
+        shape = sign * rng.uniform(*spec.jump_size, size=n)
+    elif spec.distribution == "skewt":
+        shape = np.exp(rng.uniform(np.log(spec.gamma[0]), np.log(spec.gamma[1]), size=n))
+    else:
+        shape = np.zeros(n)
+    return _AssetParams(listed, delisted, shape)
+
+
+def _skewt_moments(df: float, gamma: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Średnia i odchylenie skośnego t Fernándeza–Steela."""
+    m1 = 2.0 * math.sqrt(df) * math.exp(math.lgamma((df + 1) / 2) - math.lgamma(df / 2))
+    m1 /= math.sqrt(math.pi) * (df - 1)
+    m2 = df / (df - 2)
+    mean = m1 * (gamma - 1.0 / gamma)
+    second = m2 * (gamma ** 3 + gamma ** -3) / (gamma + 1.0 / gamma)
+    return mean, np.sqrt(second - mean ** 2)
+
+
+def _draw(
+    spec: SyntheticSpec, params: _AssetParams, rng: np.random.Generator, n_rows: int
+) -> np.ndarray:
+    """Stopy zwrotu (n_rows, N) bez braków, o zadanej zmienności i dryfie."""
+    ppy = periods_per_year(spec.freq)
+    vol = spec.annual_vol / math.sqrt(ppy)
+    mu = spec.annual_mean / ppy
+    shape = (n_rows, spec.n_assets)
+
+    if spec.distribution == "jump":
+        p = spec.jump_prob
+        jump_mean = params.shape * vol
+        jump_std = 0.5 * vol
+        jump_var = p * (jump_mean ** 2 + jump_std ** 2) - (p * jump_mean) ** 2
+        diff_vol = np.sqrt(np.maximum(vol ** 2 - jump_var, 0.25 * vol ** 2))
+        jumps = (rng.random(shape) < p) * (jump_mean + jump_std * rng.standard_normal(shape))
+        x = diff_vol * rng.standard_normal(shape) + jumps - p * jump_mean
+    elif spec.distribution == "skewt":
+        gamma = params.shape
+        t = np.abs(rng.standard_t(spec.df, size=shape))
+        up = rng.random(shape) < gamma ** 2 / (1.0 + gamma ** 2)
+        y = np.where(up, t * gamma, -t / gamma)
+        mean, std = _skewt_moments(spec.df, gamma)
+        x = vol * (y - mean) / std
+    else:
+        x = vol * rng.standard_normal(shape)
+    return mu + x
+
+
+def iter_chunks(spec: SyntheticSpec) -> Iterator[pd.DataFrame]:
+    """
+    Kolejne bloki panelu (wiersze = daty): stopy zwrotu (M) albo ceny (D),
+    z NaN przed debiutem, po wycofaniu i w losowych brakach.
+    """
+    rng = np.random.default_rng(spec.seed)
+    params = _asset_params(spec, rng)
+    dates = spec.dates
+    price = np.full(spec.n_assets, 100.0)
+
+    for start in range(0, spec.n_periods, spec.chunk_rows):
+        stop = min(start + spec.chunk_rows, spec.n_periods)
+        rets = _draw(spec, params, rng, stop - start)
+
+        rows = np.arange(start, stop)[:, None]
+        alive = (rows >= params.listed) & (rows < params.delisted)
+        observed = alive & (rng.random(rets.shape) >= spec.missing)
+
+        if spec.freq == "D":
+            # ceny idą dalej także w dniach bez notowania (brak = tylko zapis)
+            levels = price * np.cumprod(1.0 + np.maximum(rets, -0.95), axis=0)
+            price = levels[-1]
+            values = np.where(observed, levels, np.nan)
+        else:
+            values = np.where(observed, rets, np.nan)
+
+        yield pd.DataFrame(
+            values, index=pd.DatetimeIndex(dates[start:stop], name="Date"), columns=spec.assets
+        )
+
+
+def synthetic_frame(spec: SyntheticSpec) -> pd.DataFrame:
+    """Cały panel w pamięci (dla małych rozmiarów / SkewnessStudy.returns(frames))."""
+    return pd.concat(list(iter_chunks(spec)))
+
+
+def write_panel(spec: SyntheticSpec, path: Union[str, Path]) -> Path:
+    """Zapisuje panel blokami (nagłówek raz, potem dopisywanie)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="") as f:
+        for i, chunk in enumerate(iter_chunks(spec)):
+            chunk.to_csv(f, header=(i == 0), float_format="%.10g")
+    return path
+
+
+def default_path(spec: SyntheticSpec) -> Path:
+    name = "synthetic_monthly_returns.csv" if spec.freq == "M" else "synthetic_daily_prices.csv"
+    return SYNTHETIC_DIR / name
+
+
+def main(
+    n_assets: int = 1000,
+    n_periods: int = 240,
+    freq: str = "M",
+    distribution: str = "jump",
+    missing: float = 0.01,
+    seed: int = 0,
+    out: Optional[Union[str, Path]] = None,
+) -> None:
+    spec = SyntheticSpec(
+        n_assets=n_assets,
+        n_periods=n_periods,
+        freq=freq,
+        distribution=distribution,
+        missing=missing,
+        seed=seed,
+    )
+    out_path = Path(out) if out is not None else default_path(spec)
+
+    t0 = time.perf_counter()
+    write_panel(spec, out_path)
+    size_mb = out_path.stat().st_size / 2 ** 20
+    print(
+        f"[synthetic] {n_periods} x {n_assets} ({freq}, {distribution}) -> {out_path} "
+        f"({size_mb:.1f} MB, bloki po {spec.chunk_rows} wierszy, {time.perf_counter() - t0:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
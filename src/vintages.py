@@ -0,0 +1,347 @@
+"""
+Lokalne archiwum wersji (vintages) rentowności z FRED — do backtestów
+point-in-time zamiast ostatniej, zrewidowanej wersji serii.
+
+Każde pobranie (snapshot panelu data x kraj) zapisujemy jako różnicę
+względem stanu archiwum sprzed tej wersji: tylko komórki nowe albo
+zmienione (rewizje). Tabela `deltas` (seria, data, wersja, wartość) ma
+klucz (series, date, vintage), więc stan "na dzień" to dla każdej
+komórki ostatni wpis z wersją <= as_of — jedno zapytanie z ROW_NUMBER.
+
+    store = VintageStore()
+    store.record(yields, vintage="2024-06-03")   # np. z data_download_bonds_fred
+    store.asof("2015-01-31")                      # panel taki, jak był znany wtedy
+    for vintage, panel in store.iter_asof(month_ends): ...
+
+`iter_asof` czyta wszystkie potrzebne delty raz i nakłada je kolejno na
+jedną tablicę stanu — 240 miesięcy x 16 krajów to przejście po deltach,
+nie 240 pełnych kopii na dysku ani w pamięci. `first_release_returns`
+daje miesięczne -Δy tak, jak były znane w chwili pierwszej publikacji.
+
+Historię wersji sprzed założenia archiwum można wczytać z ALFRED
+(`seed_from_alfred`, fredapi `get_series_all_releases`). Brak wartości
+w nowym snapshocie (np. węższe okno pobrania) nie jest zapisywany jako
+usunięcie.
+"""
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.asset_classes import BOND_TICKERS, DATA_PROCESSED_DIR, PROJECT_ROOT, SAMPLE_PERIOD
+
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "vintages.sqlite"
+PIT_RETURNS_PATH = DATA_PROCESSED_DIR / "bond_monthly_returns_pit.csv"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    vintage    TEXT PRIMARY KEY,
+    fetched_at TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    n_deltas   INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS deltas (
+    series  TEXT NOT NULL,
+    date    TEXT NOT NULL,
+    vintage TEXT NOT NULL,
+    value   REAL,
+    PRIMARY KEY (series, date, vintage)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_deltas_vintage ON deltas (vintage);
+"""
+
+# różnice poniżej progu (zapis float z CSV / API) nie są rewizją
+_TOLERANCE = 1e-12
+
+
+def _day(value) -> str:
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def _series_order(names) -> list:
+    """Kolejność krajów jak w BOND_TICKERS, pozostałe serie alfabetycznie na końcu."""
+    rank = {c: i for i, c in enumerate(BOND_TICKERS)}
+    return sorted(set(names), key=lambda c: (rank.get(c, len(rank)), c))
+
+
+class VintageStore:
+    """Połączenie z archiwum wersji; schemat tworzony przy pierwszym użyciu."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB_PATH, timeout: float = 60.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "VintageStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Cursor]:
+        cur = self.conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            yield cur
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+        cur.execute("COMMIT")
+
+    # -----------------------------------
+    # Zapis
+    # -----------------------------------
+
+    def record(self, snapshot: pd.DataFrame, vintage=None, source: str = "fred") -> int:
+        """
+        Zapisuje snapshot (daty x serie) jako delty względem stanu na `vintage`
+        (domyślnie dziś). Zwraca liczbę zapisanych komórek.
+        """
+        vintage = _day(vintage if vintage is not None else datetime.now(timezone.utc).date())
+        prev = self.asof(vintage, series=list(snapshot.columns))
+        prev = prev.reindex(index=snapshot.index, columns=snapshot.columns)
+
+        new = snapshot.to_numpy(dtype=float)
+        old = prev.to_numpy(dtype=float)
+        changed = ~np.isnan(new) & (np.isnan(old) | (np.abs(new - old) > _TOLERANCE))
+        rows, cols = np.nonzero(changed)
+        dates = snapshot.index.strftime("%Y-%m-%d")
+        records = [
+            (str(snapshot.columns[j]), dates[i], vintage, float(new[i, j]))
+            for i, j in zip(rows, cols)
+        ]
+        self._insert(records, vintage, source)
+        return len(records)
+
+    def record_releases(self, releases: pd.DataFrame, source: str = "alfred") -> int:
+        """
+        Gotowe rewizje w formacie długim (series, date, vintage, value) —
+        np. z ALFRED, gdzie każdy wiersz to już zmiana wartości.
+        """
+        if releases.empty:
+            return 0
+        frame = releases.dropna(subset=["value"]).copy()
+        frame["date"] = pd.to_datetime(frame["date"]).dt.strftime("%Y-%m-%d")
+        frame["vintage"] = pd.to_datetime(frame["vintage"]).dt.strftime("%Y-%m-%d")
+        frame = frame.sort_values(["series", "date", "vintage"])
+        # te same wartości w kolejnych wersjach to nie rewizje
+        same = (
+            frame[["series", "date"]].eq(frame[["series", "date"]].shift()).all(axis=1)
+            & (frame["value"] - frame["value"].shift()).abs().le(_TOLERANCE)
+        )
+        frame = frame[~same]
+        records = list(
+            frame[["series", "date", "vintage", "value"]].itertuples(index=False, name=None)
+        )
+        with self._write() as cur:
+            cur.executemany(
+                "INSERT OR REPLACE INTO deltas (series, date, vintage, value) VALUES (?, ?, ?, ?)",
+                records,
+            )
+            fetched_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            counts = frame.groupby("vintage").size()
+            cur.executemany(
+                "INSERT INTO snapshots (vintage, fetched_at, source, n_deltas) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (vintage) DO UPDATE SET n_deltas = n_deltas + excluded.n_deltas",
+                [(v, fetched_at, source, int(n)) for v, n in counts.items()],
+            )
+        return len(records)
+
+    def _insert(
+        self, records: Sequence[Tuple[str, str, str, float]], vintage: str, source: str
+    ) -> None:
+        fetched_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self._write() as cur:
+            cur.executemany(
+                "INSERT OR REPLACE INTO deltas (series, date, vintage, value) VALUES (?, ?, ?, ?)",
+                records,
+            )
+            cur.execute(
+                "INSERT INTO snapshots (vintage, fetched_at, source, n_deltas) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (vintage) DO UPDATE SET n_deltas = n_deltas + excluded.n_deltas,"
+                " fetched_at = excluded.fetched_at",
+                (vintage, fetched_at, source, len(records)),
+            )
+
+    # -----------------------------------
+    # Odczyt
+    # -----------------------------------
+
+    def vintages(self) -> pd.DataFrame:
+        df = pd.read_sql_query(
+            "SELECT * FROM snapshots ORDER BY vintage", self.conn, index_col="vintage"
+        )
+        df.index = pd.DatetimeIndex(df.index, name="vintage")
+        return df
+
+    def asof(self, vintage, series: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Panel (daty x serie) taki, jaki był znany w dniu `vintage`."""
+        where, args = "vintage <= ?", [_day(vintage)]
+        if series is not None:
+            where += f" AND series IN ({', '.join('?' * len(series))})"
+            args += list(series)
+        long = pd.read_sql_query(
+            "SELECT series, date, value FROM ("
+            " SELECT series, date, value,"
+            " ROW_NUMBER() OVER (PARTITION BY series, date ORDER BY vintage DESC) AS rn"
+            f" FROM deltas WHERE {where}"
+            ") WHERE rn = 1",
+            self.conn,
+            params=args,
+        )
+        panel = long.pivot(index="date", columns="series", values="value")
+        panel.index = pd.DatetimeIndex(panel.index, name="Date")
+        panel.columns.name = None
+        columns = list(series) if series is not None else _series_order(panel.columns)
+        return panel.reindex(columns=columns).sort_index()
+
+    def _all_deltas(self, until) -> pd.DataFrame:
+        long = pd.read_sql_query(
+            "SELECT series, date, vintage, value FROM deltas WHERE vintage <= ? ORDER BY vintage",
+            self.conn,
+            params=(_day(until),),
+        )
+        long["date"] = pd.to_datetime(long["date"])
+        long["vintage"] = pd.to_datetime(long["vintage"])
+        return long
+
+    def iter_asof(self, vintages: Sequence) -> Iterator[Tuple[pd.Timestamp, pd.DataFrame]]:
+        """
+        Kolejne panele "na dzień" dla rosnących dat `vintages`: delty czytane
+        raz i nakładane po kolei na jedną tablicę stanu (kopia tylko przy yield).
+        """
+        vintages = pd.DatetimeIndex(vintages).sort_values()
+        if not len(vintages):
+            return
+        long = self._all_deltas(vintages[-1])
+        dates = pd.DatetimeIndex(np.sort(long["date"].unique()), name="Date")
+        series = _series_order(long["series"].unique())
+        rows = dates.get_indexer(long["date"])
+        cols = pd.Index(series).get_indexer(long["series"])
+        values = long["value"].to_numpy(dtype=float)
+        stops = np.searchsorted(long["vintage"].to_numpy(), vintages.to_numpy(), side="right")
+
+        state = np.full((len(dates), len(series)), np.nan)
+        done = 0
+        for vintage, stop in zip(vintages, stops):
+            state[rows[done:stop], cols[done:stop]] = values[done:stop]
+            done = stop
+            known = ~np.isnan(state).all(axis=1)
+            yield vintage, pd.DataFrame(state[known], index=dates[known], columns=series)
+
+    def first_release_returns(
+        self, start: str = SAMPLE_PERIOD[0], end: str = SAMPLE_PERIOD[1]
+    ) -> pd.DataFrame:
+        """
+        Miesięczne -Δy (jak bond_monthly_returns.csv) liczone w wersji, w której
+        obserwacja ukazała się po raz pierwszy — oba końce zmiany z tej samej wersji.
+        """
+        long = self._all_deltas(pd.Timestamp.max.normalize())
+        long["date"] = long["date"] + pd.offsets.MonthEnd(0)
+        dates = pd.DatetimeIndex(np.sort(long["date"].unique()), name="Date")
+        series = _series_order(long["series"].unique())
+        rows = dates.get_indexer(long["date"])
+        cols = pd.Index(series).get_indexer(long["series"])
+        values = long["value"].to_numpy(dtype=float)
+        # granice bloków jednej wersji (delty są posortowane po vintage)
+        vint = long["vintage"].to_numpy().astype(np.int64)
+        bounds = np.r_[0, np.flatnonzero(np.diff(vint)) + 1, len(long)]
+
+        state = np.full((len(dates), len(series)), np.nan)
+        out = np.full(state.shape, np.nan)
+        released = np.zeros(state.shape, dtype=bool)
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            state[rows[lo:hi], cols[lo:hi]] = values[lo:hi]
+            # zmiana liczy się, gdy w tej wersji znamy obie obserwacje
+            change = -(state[1:] - state[:-1])
+            first = ~released[1:] & ~np.isnan(change)
+            out[1:] = np.where(first, change, out[1:])
+            released[1:] |= first
+        rets = pd.DataFrame(out, index=dates, columns=series).dropna(how="all")
+        return rets.loc[start:end]
+
+
+def seed_from_alfred(
+    store: VintageStore,
+    fred,
+    tickers: Mapping[str, str] = BOND_TICKERS,
+    start: str = SAMPLE_PERIOD[0],
+    end: str = SAMPLE_PERIOD[1],
+) -> int:
+    """Historia wersji z ALFRED (fredapi `get_series_all_releases`), w ułamkach jak w pobieraniu."""
+    frames = []
+    for country, code in tickers.items():
+        try:
+            rel = fred.get_series_all_releases(code)
+        except Exception as e:
+            print(f"✖ ALFRED {country}: {e}")
+            continue
+        first = pd.Timestamp(start) - pd.DateOffset(months=1)
+        rel = rel[(rel["date"] >= first) & (rel["date"] <= pd.Timestamp(end))]
+        frames.append(
+            pd.DataFrame({
+                "series": country,
+                "date": rel["date"],
+                "vintage": rel["realtime_start"],
+                "value": pd.to_numeric(rel["value"], errors="coerce") / 100.0,
+            })
+        )
+        print(f"✔ ALFRED: {country} ({len(rel)} wierszy)")
+    if not frames:
+        return 0
+    return store.record_releases(pd.concat(frames, ignore_index=True))
+
+
+def main(
+    seed_alfred: bool = False,
+    asof: Optional[str] = None,
+    db_path: Union[str, Path] = DEFAULT_DB_PATH,
+) -> None:
+    with VintageStore(db_path) as store:
+        if seed_alfred:
+            import os
+
+            from fredapi import Fred
+
+            api_key = os.getenv("FRED_API_KEY")
+            if api_key is None:
+                raise ValueError("Brak zmiennej środowiskowej FRED_API_KEY")
+            n = seed_from_alfred(store, Fred(api_key=api_key))
+            print(f"[vintages] ALFRED: {n} delt")
+
+        snaps = store.vintages()
+        if snaps.empty:
+            print(f"[vintages] archiwum {store.path} jest puste (pobierz dane albo --seed-alfred)")
+            return
+        n_deltas = int(snaps["n_deltas"].sum())
+        print(
+            f"[vintages] {len(snaps)} wersji ({snaps.index[0]:%Y-%m-%d} – {snaps.index[-1]:%Y-%m-%d}), "
+            f"{n_deltas} zapisanych komórek"
+        )
+
+        if asof is not None:
+            panel = store.asof(asof)
+            out_path = DATA_PROCESSED_DIR / f"bond_yields_asof_{_day(asof)}.csv"
+            panel.to_csv(out_path)
+            print(f"[vintages] stan na {_day(asof)} -> {out_path} {panel.shape}")
+
+        rets = store.first_release_returns()
+        PIT_RETURNS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        rets.to_csv(PIT_RETURNS_PATH)
+        print(f"[vintages] zwroty z pierwszych publikacji -> {PIT_RETURNS_PATH} {rets.shape}")
+
+
+if __name__ == "__main__":
+    main()